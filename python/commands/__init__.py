@@ -1,13 +1,20 @@
 """
 KiCAD command implementations package
+
+The board-side command classes are imported on first access, so that using
+one submodule (e.g. the schematic managers) does not load all of them.
 """
 
-from .project import ProjectCommands
-from .board import BoardCommands
-from .component import ComponentCommands
-from .routing import RoutingCommands
-from .design_rules import DesignRuleCommands
-from .export import ExportCommands
+import importlib
+
+_LAZY_EXPORTS = {
+    'ProjectCommands': '.project',
+    'BoardCommands': '.board',
+    'ComponentCommands': '.component',
+    'RoutingCommands': '.routing',
+    'DesignRuleCommands': '.design_rules',
+    'ExportCommands': '.export',
+}
 
 __all__ = [
     'ProjectCommands',
@@ -17,3 +24,12 @@ __all__ = [
     'DesignRuleCommands',
     'ExportCommands'
 ]
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
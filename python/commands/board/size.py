@@ -6,6 +6,8 @@ import pcbnew
 import logging
 from typing import Dict, Any, Optional
 
+from .outline import BoardOutlineCommands
+
 logger = logging.getLogger('kicad_interface')
 
 class BoardSizeCommands:
@@ -38,7 +40,6 @@ class BoardSizeCommands:
 
             # Create board outline using BoardOutlineCommands
             # This properly creates edge cuts on Edge.Cuts layer
-            from commands.board.outline import BoardOutlineCommands
             outline_commands = BoardOutlineCommands(self.board)
 
             # Create rectangular outline centered at origin
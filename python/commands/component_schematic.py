@@ -1,8 +1,342 @@
 from skip import Schematic
 # Symbol class might not be directly importable in the current version
 import os
+import re
+import logging
+import copy
+import functools
+import hashlib
 import uuid
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import sexpdata
+from typing import Dict, Tuple, Optional
+
+logger = logging.getLogger('kicad_interface')
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only speeds up auto-placement on large schematics
+    np = None
+
+# Parsed .kicad_sym files keyed by path: (mtime, {symbol name: symbol S-expression})
+_LIB_CACHE: Dict[str, Tuple[float, Dict[str, list]]] = {}
+# Symbol definitions already extracted from a cached library, keyed by lib_id: (mtime, definition)
+_SYMBOL_CACHE: Dict[str, Tuple[float, list]] = {}
+# Pickled library name indexes, one file per library, in the per-user cache
+# directory (the one kicad_interface keeps paths.json in)
+_INDEX_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.kicad-mcp', 'cache', 'symbol-index')
+# Bump when the parser or the index layout changes, so older pickles are ignored
+_INDEX_FORMAT = 1
+
+# Worker processes for parsing several uncached symbol libraries at once
+# (0: parse them in this process as they are needed). Opt-in: where
+# processes are spawned rather than forked (Windows, macOS) every worker
+# re-imports the server's main module, pcbnew included.
+try:
+    PARSE_WORKERS = max(0, int(os.environ.get("KICAD_MCP_PARSE_WORKERS", "0")))
+except ValueError:
+    logger.warning("Ignoring invalid KICAD_MCP_PARSE_WORKERS: %s", os.environ.get("KICAD_MCP_PARSE_WORKERS"))
+    PARSE_WORKERS = 0
+
+# Tokens of a .kicad_sym file: brackets, quoted strings (with escapes) and barewords
+_TOKEN_RE = re.compile(r'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+', re.S)
+_STR_ESCAPE_RE = re.compile(r'\\.', re.S)
+_UUID_RE = re.compile(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
+
+# Interned heads for tree walks: a type check plus Symbol equality is much
+# cheaper than hasattr(x, 'value') and x.value() == '...' on every node
+_Symbol = sexpdata.Symbol
+_SYM_SYMBOL = _Symbol('symbol')
+_SYM_LIB_SYMBOLS = _Symbol('lib_symbols')
+_SYM_SHEET_INSTANCES = _Symbol('sheet_instances')
+_SYM_INSTANCES = _Symbol('instances')
+_SYM_PATH = _Symbol('path')
+_SYM_PIN = _Symbol('pin')
+_SYM_AT = _Symbol('at')
+_SYM_NUMBER = _Symbol('number')
+
+# Auto-placement searches a square window of this many grid cells per side
+_GRID_SEARCH_SPAN = 20
+# Use the NumPy occupancy grid from this many placed symbols on
+_NUMPY_GRID_MIN_SYMBOLS = 256
+
+# Unit offsets for relative placement, scaled by the requested distance
+_DIRECTION_OFFSETS: Dict[str, Tuple[int, int]] = {
+    'right': (1, 0),
+    'left': (-1, 0),
+    'below': (0, 1),
+    'above': (0, -1),
+    'below-right': (1, 1),
+    'below-left': (-1, 1),
+    'above-right': (1, -1),
+    'above-left': (-1, -1),
+}
+
+
+
+def _unescape(match):
+    return sexpdata.String.unquote(match.group(0))
+
+
+def _fast_parse_kicad_sym(text: str):
+    """Parse a .kicad_sym file into the same structure sexpdata.loads produces
+
+    Tokenizes with a single precompiled regex and builds lists with an explicit
+    stack instead of sexpdata's character-level recursive parser. Barewords are
+    converted like sexpdata does (t, nil, int, float, else Symbol) and memoized,
+    since library files repeat the same heads and numbers many thousands of times.
+    """
+    atoms = {}
+    stack = [[]]
+    current = stack[0]
+    for match in _TOKEN_RE.finditer(text):
+        token = match.group()
+        first = token[0]
+        if first == '(':
+            new = []
+            current.append(new)
+            stack.append(new)
+            current = new
+        elif first == ')':
+            if len(stack) == 1:
+                raise ValueError(f"Unexpected ')' at offset {match.start()}")
+            stack.pop()
+            current = stack[-1]
+        elif first == '"':
+            body = token[1:-1]
+            if '\\' in body:
+                body = _STR_ESCAPE_RE.sub(_unescape, body)
+            current.append(body)
+        else:
+            value = atoms.get(token)
+            if value is None:
+                if token == 't':
+                    value = True
+                elif token == 'nil':
+                    current.append([])
+                    continue
+                else:
+                    try:
+                        value = int(token)
+                    except ValueError:
+                        try:
+                            value = float(token)
+                        except ValueError:
+                            value = sexpdata.Symbol(token)
+                atoms[token] = value
+            current.append(value)
+
+    if len(stack) != 1:
+        raise ValueError("Unbalanced parentheses in symbol library")
+    result = stack[0]
+    return result[0] if len(result) == 1 else result
+
+
+# Characters str.splitlines() breaks on; sexpdata's pretty printer indents after
+# each of them, even when they occur inside an atom
+_LINE_BREAK_RE = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+_INLINE_ATOMS = (str, int, float, type(None))
+# Same escapes as sexpdata.String.quote, applied in a single C-level pass
+_ESC_TABLE = str.maketrans({
+    '\\': '\\\\', '"': '\\"', '\b': '\\b', '\f': '\\f',
+    '\n': '\\n', '\r': '\\r', '\t': '\\t',
+})
+
+
+def _escape(text: str) -> str:
+    return '"' + text.translate(_ESC_TABLE) + '"'
+
+
+def _atom_to_sexpr(atom, symbol_text: dict) -> str:
+    """Render a single atom exactly like sexpdata.tosexp does"""
+    atom_type = type(atom)
+    if atom_type is _Symbol:
+        text = symbol_text.get(atom)
+        if text is None:
+            text = symbol_text[atom] = _Symbol.quote(atom)
+        return text
+    if atom_type is str or atom_type is sexpdata.String:
+        return _escape(atom)
+    if atom_type is bool:
+        return 't' if atom else '()'
+    if atom_type is int or atom_type is float:
+        return str(atom)
+    return sexpdata.tosexp(atom, pretty_print=True, indent_as='\t')
+
+
+def _breaks_line(node) -> bool:
+    """Whether sexpdata would pretty-print this list over several lines"""
+    for child in node:
+        if isinstance(child, (list, tuple)):
+            return True
+        if not isinstance(child, _INLINE_ATOMS) and sexpdata.tosexp.dispatch(type(child)) in sexpdata.DONT_BREAK_OVERLOADS:
+            return True
+    return False
+
+
+def _stream_dump(fh, node, indent_as: str = '\t'):
+    """Write node to fh, byte-identical to sexpdata.dumps(node, pretty_print=True, indent_as=indent_as)
+
+    Lists containing other lists are broken onto one line per child, indented
+    one level deeper; lists of atoms stay on one line. The tree is walked with
+    an explicit stack and written piecewise, so the whole document never
+    exists as a single string.
+    """
+    write = fh.write
+    symbol_text = {}
+    indents = ['']
+
+    def atom_text(atom, indent):
+        text = _atom_to_sexpr(atom, symbol_text)
+        if indent and _LINE_BREAK_RE.search(text):
+            text = _LINE_BREAK_RE.sub(lambda m: m.group() + indent, text)
+        return text
+
+    def inline_text(items, indent):
+        return '(' + ' '.join(atom_text(child, indent) for child in items) + ')'
+
+    if not isinstance(node, (list, tuple)):
+        write(atom_text(node, ''))
+        return
+    if not _breaks_line(node):
+        write(inline_text(node, ''))
+        return
+
+    write('(')
+    stack = [(iter(node), 0)]
+    while stack:
+        children, depth = stack[-1]
+        child = next(children, stack)
+        if child is stack:
+            # List exhausted: close it on its own line
+            stack.pop()
+            write('\n' + indents[depth] + ')')
+            continue
+
+        child_depth = depth + 1
+        if child_depth == len(indents):
+            indents.append(indents[-1] + indent_as)
+        indent = indents[child_depth]
+        write('\n' + indent)
+
+        if isinstance(child, (list, tuple)):
+            if _breaks_line(child):
+                write('(')
+                stack.append((iter(child), child_depth))
+            else:
+                write(inline_text(child, indent))
+        else:
+            write(atom_text(child, indent))
+
+
+def _find_path_uuid(node: list) -> Optional[str]:
+    """Return the UUID of the first (path "/<uuid>" ...) inside node, or None
+
+    Walks the parsed lists directly (iteratively, at any depth) rather than
+    stringifying the subtree to search it.
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if (len(current) > 1 and type(current[0]) is _Symbol and current[0] == _SYM_PATH
+                and isinstance(current[1], str) and current[1].startswith('/')):
+            match = _UUID_RE.match(current[1], 1)
+            if match:
+                return match.group(1)
+        # Push children in reverse so they are visited in document order
+        stack.extend(child for child in reversed(current) if isinstance(child, list))
+    return None
+
+
+def _requires_tree(func):
+    """Check once at entry that the schematic argument carries a parsed S-expression tree"""
+    @functools.wraps(func)
+    def wrapper(schematic, *args, **kwargs):
+        if not isinstance(getattr(schematic, 'tree', None), list):
+            raise TypeError(f"{func.__name__}: schematic has no S-expression tree")
+        return func(schematic, *args, **kwargs)
+    return wrapper
+
+
+def _parse_kicad_sym_file(lib_file: str) -> Dict[str, list]:
+    """Parse a .kicad_sym file and index its symbols by name
+
+    Top-level so it can run in a worker process (see prewarm_libraries).
+    """
+    with open(lib_file, 'r', encoding='utf-8') as f:
+        lib_content = f.read()
+
+    lib_sexpr = _fast_parse_kicad_sym(lib_content)
+
+    # Library structure: (kicad_symbol_lib ... (symbol "SymbolName" ...) ...)
+    name_index = {}
+    if isinstance(lib_sexpr, list):
+        for item in lib_sexpr:
+            if isinstance(item, list) and len(item) > 1:
+                if type(item[0]) is _Symbol and item[0] == _SYM_SYMBOL:
+                    name_index[item[1]] = item
+    return name_index
+
+
+def _index_cache_path(lib_file: str) -> str:
+    """Cache file for a library's name index, keyed by a hash of its absolute path"""
+    digest = hashlib.sha256(os.path.abspath(lib_file).encode('utf-8')).hexdigest()
+    return os.path.join(_INDEX_CACHE_DIR, f"{digest}.pkl")
+
+
+def _read_library_index(lib_file: str, lib_stat: os.stat_result) -> Optional[Dict[str, list]]:
+    """Load the pickled name index of a library if it matches the library's path, mtime and size
+
+    An unreadable cache file (truncated, or pickled against classes that have
+    since moved) counts as a miss and is deleted.
+    """
+    cache_path = _index_cache_path(lib_file)
+    try:
+        with open(cache_path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Discarding unreadable symbol index cache %s: %s", cache_path, e)
+        try:
+            os.unlink(cache_path)
+        except OSError:
+            pass
+        return None
+
+    if (not isinstance(payload, dict)
+            or payload.get('format') != _INDEX_FORMAT
+            or payload.get('path') != os.path.abspath(lib_file)
+            or payload.get('mtime') != lib_stat.st_mtime
+            or payload.get('size') != lib_stat.st_size):
+        return None
+    return payload.get('index')
+
+
+def _write_library_index(lib_file: str, lib_stat: os.stat_result, name_index: Dict[str, list]):
+    """Persist the name index of a library in the per-user cache, best effort
+
+    The write goes to a temp file that replaces the cache file, so concurrent
+    servers never see a partial index; the last one to finish wins.
+    """
+    cache_path = _index_cache_path(lib_file)
+    payload = {'format': _INDEX_FORMAT, 'path': os.path.abspath(lib_file),
+               'mtime': lib_stat.st_mtime, 'size': lib_stat.st_size, 'index': name_index}
+    try:
+        os.makedirs(_INDEX_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_INDEX_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(payload, f, protocol=5)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning("Could not write symbol index cache for %s: %s", lib_file, e)
+
 
 class ComponentManager:
     """Manage components in a schematic"""
@@ -10,6 +344,80 @@ class ComponentManager:
     # KiCAD symbol library paths
     KICAD_SYMBOL_LIB_PATH = "/Applications/KiCad/KiCad.app/Contents/SharedSupport/symbols"
 
+    @staticmethod
+    def _load_library(lib_file: str, mtime: float):
+        """Return the symbol-name index of a .kicad_sym file
+
+        The library is parsed once and indexed by symbol name; the index is
+        cached per file and reused until the file's mtime changes, so lookups
+        after the first are a single dict access. The index is also pickled
+        in the per-user cache so later processes skip the parse entirely.
+        """
+        cached = _LIB_CACHE.get(lib_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        lib_stat = os.stat(lib_file)
+        name_index = _read_library_index(lib_file, lib_stat)
+        if name_index is not None:
+            _LIB_CACHE[lib_file] = (mtime, name_index)
+            return name_index
+
+        name_index = _parse_kicad_sym_file(lib_file)
+        _LIB_CACHE[lib_file] = (mtime, name_index)
+        _write_library_index(lib_file, lib_stat, name_index)
+        return name_index
+
+    @staticmethod
+    def prewarm_libraries(lib_ids):
+        """Parse the libraries behind lib_ids in parallel and load them into the cache
+
+        Only with KICAD_MCP_PARSE_WORKERS set. Libraries already cached in
+        memory or with a valid on-disk index are skipped. When more than one
+        library needs parsing, the parses run in a process pool, one library
+        per worker; if the pool cannot be used the libraries are simply left
+        to be loaded on demand.
+        """
+        if not PARSE_WORKERS:
+            return
+
+        pending = {}
+        for lib_id in lib_ids:
+            if not lib_id or ':' not in lib_id:
+                continue
+            library_name = lib_id.split(':', 1)[0]
+            lib_file = os.path.join(ComponentManager.KICAD_SYMBOL_LIB_PATH, f"{library_name}.kicad_sym")
+            if lib_file in pending or not os.path.exists(lib_file):
+                continue
+
+            lib_stat = os.stat(lib_file)
+            cached = _LIB_CACHE.get(lib_file)
+            if cached is not None and cached[0] == lib_stat.st_mtime:
+                continue
+            name_index = _read_library_index(lib_file, lib_stat)
+            if name_index is not None:
+                _LIB_CACHE[lib_file] = (lib_stat.st_mtime, name_index)
+                continue
+            pending[lib_file] = lib_stat
+
+        if len(pending) < 2:
+            # Nothing to gain from worker processes; load lazily as before
+            return
+
+        lib_files = list(pending)
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(lib_files), PARSE_WORKERS)) as executor:
+                name_indexes = list(executor.map(_parse_kicad_sym_file, lib_files))
+        except Exception as e:
+            logger.warning("Parallel library parsing failed, loading on demand instead: %s", e)
+            return
+
+        for lib_file, name_index in zip(lib_files, name_indexes):
+            lib_stat = pending[lib_file]
+            _LIB_CACHE[lib_file] = (lib_stat.st_mtime, name_index)
+            _write_library_index(lib_file, lib_stat, name_index)
+        logger.debug("Prewarmed %s symbol libraries", len(lib_files))
+
     @staticmethod
     def _load_symbol_from_library(lib_id: str):
         """Load symbol definition from KiCAD library
@@ -20,136 +428,249 @@ class ComponentManager:
         Returns:
             S-expression list for the symbol definition, or None if not found
         """
-        try:
-            # Parse lib_id
-            if ':' not in lib_id:
-                print(f"Invalid lib_id format: {lib_id}")
-                return None
+        # Parse lib_id
+        if ':' not in lib_id:
+            logger.warning("Invalid lib_id format: %s", lib_id)
+            return None
+
+        library_name, symbol_name = lib_id.split(':', 1)
+        return ComponentManager._load_symbols_from_library(library_name, [symbol_name]).get(lib_id)
+
+    @staticmethod
+    def _load_symbols_from_library(library_name: str, symbol_names):
+        """Load several symbol definitions from one KiCAD library
+
+        The library file is located, stat'ed and loaded once for the whole set.
 
-            library_name, symbol_name = lib_id.split(':', 1)
+        Args:
+            library_name: Library nickname (e.g., "Device")
+            symbol_names: Symbol names within that library (e.g., ["R", "C"])
+
+        Returns:
+            dict mapping lib_id to its S-expression definition, or None if not found
+        """
+        symbol_defs = {f"{library_name}:{name}": None for name in symbol_names}
+        try:
             lib_file = os.path.join(ComponentManager.KICAD_SYMBOL_LIB_PATH, f"{library_name}.kicad_sym")
 
             if not os.path.exists(lib_file):
-                print(f"Library file not found: {lib_file}")
-                return None
+                logger.warning("Library file not found: %s", lib_file)
+                return symbol_defs
+
+            mtime = os.path.getmtime(lib_file)
+            name_index = None
+            for symbol_name in symbol_names:
+                lib_id = f"{library_name}:{symbol_name}"
+
+                # Reuse a previous lookup while the library file is unchanged
+                cached = _SYMBOL_CACHE.get(lib_id)
+                if cached is not None and cached[0] == mtime:
+                    symbol_defs[lib_id] = copy.deepcopy(cached[1])
+                    continue
 
-            # Read and parse library file
-            with open(lib_file, 'r', encoding='utf-8') as f:
-                lib_content = f.read()
+                if name_index is None:
+                    name_index = ComponentManager._load_library(lib_file, mtime)
+                item = name_index.get(symbol_name)
+                if item is None:
+                    logger.warning("Symbol %s not found in library %s", symbol_name, library_name)
+                    continue
 
-            # Parse S-expression
-            lib_sexpr = sexpdata.loads(lib_content)
+                # Need to prepend it with the lib_id for the schematic
+                symbol_def = [sexpdata.Symbol('symbol'), lib_id] + item[2:]
+                _SYMBOL_CACHE[lib_id] = (mtime, symbol_def)
+                logger.debug("Loaded symbol definition for %s", lib_id)
+                # Hand out a copy so edits in one schematic never leak into the cache
+                symbol_defs[lib_id] = copy.deepcopy(symbol_def)
 
-            # Find the symbol definition
-            # Library structure: (kicad_symbol_lib ... (symbol "SymbolName" ...) ...)
-            if not isinstance(lib_sexpr, list):
-                return None
+        except Exception as e:
+            logger.exception("Error loading symbol from library: %s", e)
+        return symbol_defs
 
-            for item in lib_sexpr:
-                if isinstance(item, list) and len(item) > 0:
-                    if hasattr(item[0], 'value') and item[0].value() == 'symbol':
-                        # Check if this is the symbol we're looking for
-                        if len(item) > 1 and item[1] == symbol_name:
-                            # Found it! Return the symbol definition
-                            # Need to prepend it with the lib_id for the schematic
-                            symbol_def = [sexpdata.Symbol('symbol'), lib_id] + item[2:]
-                            print(f"Loaded symbol definition for {lib_id}")
-                            return symbol_def
-
-            print(f"Symbol {symbol_name} not found in library {library_name}")
-            return None
+    @staticmethod
+    def _get_lib_symbols(schematic: Schematic):
+        """Return the schematic's lib_symbols node and the set of lib_ids it defines
 
-        except Exception as e:
-            print(f"Error loading symbol from library: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        Both are cached on the schematic object, so only the first lookup scans
+        the tree; the cached node is re-validated by identity in case the tree
+        was edited in between.
+
+        Returns:
+            (lib_symbols_list, present_lib_ids) or None if there is no lib_symbols section
+        """
+        tree = schematic.tree
+        index = getattr(schematic, '_lib_symbols_index', None)
+        node = getattr(schematic, '_lib_symbols_ref', None)
+        if node is not None and index is not None and index < len(tree) and tree[index] is node:
+            return node, schematic._lib_symbols_present
+
+        for i, item in enumerate(tree):
+            if isinstance(item, list) and len(item) > 0:
+                if type(item[0]) is _Symbol and item[0] == _SYM_LIB_SYMBOLS:
+                    present = set()
+                    for child in item[1:]:  # Skip 'lib_symbols' symbol itself
+                        if isinstance(child, list) and len(child) > 1:
+                            if type(child[0]) is _Symbol and child[0] == _SYM_SYMBOL:
+                                present.add(child[1])
+                    schematic._lib_symbols_index = i
+                    schematic._lib_symbols_ref = item
+                    schematic._lib_symbols_present = present
+                    return item, present
+
+        return None
 
     @staticmethod
-    def _ensure_symbol_in_lib_symbols(schematic: Schematic, lib_id: str):
-        """Ensure symbol definition exists in lib_symbols section
+    def _find_sheet_instances_index(schematic: Schematic):
+        """Return the tree index new top-level items go in front of (sheet_instances)
+
+        The index is cached on the schematic and checked against the tree before
+        use, so callers that insert in front of it only need to bump it instead
+        of rescanning. Falls back to the end of the tree if there is no
+        sheet_instances section.
+        """
+        tree = schematic.tree
+        index = getattr(schematic, '_sheet_instances_index', None)
+        if index is not None and index < len(tree):
+            item = tree[index]
+            if isinstance(item, list) and len(item) > 0 and type(item[0]) is _Symbol and item[0] == _SYM_SHEET_INSTANCES:
+                return index
+
+        # sheet_instances follows lib_symbols, so start looking from there
+        start = getattr(schematic, '_lib_symbols_index', None) or 0
+        if start >= len(tree):
+            start = 0
+        for i in range(start, len(tree)):
+            item = tree[i]
+            if isinstance(item, list) and len(item) > 0:
+                if type(item[0]) is _Symbol and item[0] == _SYM_SHEET_INSTANCES:
+                    schematic._sheet_instances_index = i
+                    return i
+
+        schematic._sheet_instances_index = None
+        return len(tree)
+
+    @staticmethod
+    def _ensure_symbol_in_lib_symbols_prefetched(schematic: Schematic, lib_id: str, symbol_def):
+        """Ensure lib_id is in lib_symbols, using an already loaded definition
 
         Args:
             schematic: Schematic object
             lib_id: Library ID (e.g., "Device:C")
+            symbol_def: Definition from _load_symbols_from_library, or None if it could not be loaded
 
         Returns:
-            bool: True if symbol definition exists or was added, False on error
+            bool: True if symbol definition exists or was added, False otherwise
         """
-        try:
-            # Check if lib_symbols section exists and if symbol is already there
-            lib_symbols_index = None
-            lib_symbols_list = None
+        lib_symbols = ComponentManager._get_lib_symbols(schematic)
+        if lib_symbols is None:
+            logger.warning("lib_symbols section not found in schematic")
+            return False
+        lib_symbols_list, present = lib_symbols
 
-            for i, item in enumerate(schematic.tree):
-                if isinstance(item, list) and len(item) > 0:
-                    if hasattr(item[0], 'value') and item[0].value() == 'lib_symbols':
-                        lib_symbols_index = i
-                        lib_symbols_list = item
-                        break
+        # Check if symbol already exists
+        if lib_id in present:
+            logger.debug("Symbol %s already in lib_symbols", lib_id)
+            return True
 
-            if lib_symbols_list is None:
-                print("lib_symbols section not found in schematic")
-                return False
+        if symbol_def is None:
+            return False
 
-            # Check if symbol already exists
-            for item in lib_symbols_list[1:]:  # Skip 'lib_symbols' symbol itself
-                if isinstance(item, list) and len(item) > 1:
-                    if hasattr(item[0], 'value') and item[0].value() == 'symbol':
-                        if item[1] == lib_id:
-                            print(f"Symbol {lib_id} already in lib_symbols")
-                            return True
-
-            # Symbol not found, load from library
-            symbol_def = ComponentManager._load_symbol_from_library(lib_id)
-            if symbol_def is None:
-                return False
+        # Add to lib_symbols section
+        lib_symbols_list.append(symbol_def)
+        present.add(lib_id)
+        logger.debug("Added %s to lib_symbols section", lib_id)
+        return True
 
-            # Add to lib_symbols section
-            lib_symbols_list.append(symbol_def)
-            print(f"Added {lib_id} to lib_symbols section")
-            return True
+    @staticmethod
+    def _prefetch_lib_symbols(schematic: Schematic, lib_ids):
+        """Ensure every lib_id of a batch is in lib_symbols, reading each library once
 
+        Missing symbols are grouped by library and loaded together; definitions
+        are still appended in the order the lib_ids first appear.
+        """
+        lib_symbols = ComponentManager._get_lib_symbols(schematic)
+        present = lib_symbols[1] if lib_symbols is not None else set()
+
+        unique_ids = list(dict.fromkeys(lib_ids))
+        by_library = {}
+        for lib_id in unique_ids:
+            if lib_id and ':' in lib_id and lib_id not in present:
+                library_name, symbol_name = lib_id.split(':', 1)
+                by_library.setdefault(library_name, []).append(symbol_name)
+
+        symbol_defs = {}
+        if lib_symbols is not None:
+            if len(by_library) > 1:
+                ComponentManager.prewarm_libraries(
+                    [f"{library_name}:{symbol_names[0]}" for library_name, symbol_names in by_library.items()]
+                )
+            for library_name, symbol_names in by_library.items():
+                symbol_defs.update(ComponentManager._load_symbols_from_library(library_name, symbol_names))
+
+        for lib_id in unique_ids:
+            if lib_id in symbol_defs:
+                ensured = ComponentManager._ensure_symbol_in_lib_symbols_prefetched(schematic, lib_id, symbol_defs[lib_id])
+            else:
+                ensured = ComponentManager._ensure_symbol_in_lib_symbols(schematic, lib_id)
+            if not ensured:
+                logger.warning("Could not add %s to lib_symbols, but continuing...", lib_id)
+
+    @staticmethod
+    @_requires_tree
+    def _ensure_symbol_in_lib_symbols(schematic: Schematic, lib_id: str):
+        """Ensure symbol definition exists in lib_symbols section
+
+        Args:
+            schematic: Schematic object
+            lib_id: Library ID (e.g., "Device:C")
+
+        Returns:
+            bool: True if symbol definition exists or was added, False on error
+        """
+        try:
+            lib_symbols = ComponentManager._get_lib_symbols(schematic)
+            symbol_def = None
+            if lib_symbols is not None and lib_id not in lib_symbols[1]:
+                # Symbol not found, load from library
+                symbol_def = ComponentManager._load_symbol_from_library(lib_id)
+            return ComponentManager._ensure_symbol_in_lib_symbols_prefetched(schematic, lib_id, symbol_def)
         except Exception as e:
-            print(f"Error ensuring symbol in lib_symbols: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error ensuring symbol in lib_symbols: %s", e)
             return False
 
     @staticmethod
+    @_requires_tree
     def _get_project_uuid(schematic: Schematic):
-        """Extract project UUID from schematic"""
+        """Extract project UUID from schematic
+
+        Taken from the (instances (project ... (path "/<uuid>" ...))) block of the
+        first placed symbol. The result is memoized on the schematic, so only
+        the first component add pays for the lookup.
+        """
+        project_uuid = getattr(schematic, '_project_uuid', None)
+        if project_uuid:
+            return project_uuid
+
+        project_uuid = None
         try:
-            # Look for project UUID in existing instances
-            if hasattr(schematic, 'symbol') and len(schematic.symbol) > 0:
-                first_symbol = schematic.symbol[0]
-                if hasattr(first_symbol, 'instances'):
-                    # Parse instances to get project path UUID
-                    instances_str = str(first_symbol.instances)
-                    # Extract UUID from path
-                    import re
-                    match = re.search(r'/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', instances_str)
-                    if match:
-                        return match.group(1)
-            # Fallback: parse from tree directly
-            if hasattr(schematic, 'tree') and isinstance(schematic.tree, list):
-                for item in schematic.tree:
-                    if isinstance(item, list) and len(item) > 0:
-                        if hasattr(item[0], 'value') and item[0].value() == 'symbol':
-                            # Search for instances in symbol
-                            for subitem in item:
-                                if isinstance(subitem, list) and len(subitem) > 0:
-                                    if hasattr(subitem[0], 'value') and subitem[0].value() == 'instances':
-                                        # Found instances, extract UUID
-                                        instances_str = str(subitem)
-                                        import re
-                                        match = re.search(r'/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', instances_str)
-                                        if match:
-                                            return match.group(1)
+            for item in schematic.tree:
+                if isinstance(item, list) and len(item) > 0:
+                    if type(item[0]) is _Symbol and item[0] == _SYM_SYMBOL:
+                        # Search for instances in symbol
+                        for subitem in item:
+                            if isinstance(subitem, list) and len(subitem) > 0:
+                                if type(subitem[0]) is _Symbol and subitem[0] == _SYM_INSTANCES:
+                                    project_uuid = _find_path_uuid(subitem)
+                                    break
+                        if project_uuid:
+                            break
         except Exception as e:
-            print(f"Warning: Could not extract project UUID: {e}")
-        # Return a new UUID if we can't find one
-        return str(uuid.uuid4())
+            logger.warning("Could not extract project UUID: %s", e)
+
+        # Use a new UUID if we can't find one
+        if not project_uuid:
+            project_uuid = str(uuid.uuid4())
+        schematic._project_uuid = project_uuid
+        return project_uuid
 
     @staticmethod
     def _create_property_sexpr(name: str, value: str, at_x: float, at_y: float, at_rot: int = 0,
@@ -177,6 +698,7 @@ class ComponentManager:
         return property_expr
 
     @staticmethod
+    @_requires_tree
     def _get_library_symbol_info(schematic: Schematic, lib_id: str):
         """Get symbol information including pins and orientation from library symbol definition
 
@@ -189,78 +711,43 @@ class ComponentManager:
         """
         try:
             # Try to find the library symbol definition in the schematic tree
-            if hasattr(schematic, 'tree') and isinstance(schematic.tree, list):
-                for item in schematic.tree:
-                    if isinstance(item, list) and len(item) > 0:
-                        if hasattr(item[0], 'value') and item[0].value() == 'lib_symbols':
-                            # Found lib_symbols section
-                            for lib_symbol in item[1:]:
-                                if isinstance(lib_symbol, list) and len(lib_symbol) > 1:
-                                    if hasattr(lib_symbol[0], 'value') and lib_symbol[0].value() == 'symbol':
-                                        # Check if this is the symbol we're looking for
-                                        if lib_id in [str(x) for x in lib_symbol[1:] if isinstance(x, str)]:
-                                            # Found the library symbol
-                                            pins = []
-                                            pin_positions = {}
-
-                                            # Recursively search for pin definitions
-                                            def extract_pin_info(node, depth=0):
-                                                if depth > 10:
-                                                    return
-                                                if isinstance(node, list):
-                                                    for subnode in node:
-                                                        if isinstance(subnode, list) and len(subnode) > 1:
-                                                            if hasattr(subnode[0], 'value') and subnode[0].value() == 'pin':
-                                                                # Found a pin
-                                                                # Format: (pin type style (at x y angle) ...)
-                                                                pin_number = None
-                                                                pin_x, pin_y, pin_angle = 0, 0, 0
-
-                                                                for pin_item in subnode:
-                                                                    # Find (at x y angle)
-                                                                    if isinstance(pin_item, list) and len(pin_item) >= 3:
-                                                                        if hasattr(pin_item[0], 'value') and pin_item[0].value() == 'at':
-                                                                            pin_x = float(pin_item[1]) if len(pin_item) > 1 else 0
-                                                                            pin_y = float(pin_item[2]) if len(pin_item) > 2 else 0
-                                                                            pin_angle = int(pin_item[3]) if len(pin_item) > 3 else 0
-                                                                    # Find (number "N")
-                                                                    if isinstance(pin_item, list) and len(pin_item) >= 2:
-                                                                        if hasattr(pin_item[0], 'value') and pin_item[0].value() == 'number':
-                                                                            pin_number = str(pin_item[1]).strip('"')
-
-                                                                if pin_number:
-                                                                    pins.append(pin_number)
-                                                                    pin_positions[pin_number] = (pin_x, pin_y, pin_angle)
-
-                                                        extract_pin_info(subnode, depth + 1)
-
-                                            extract_pin_info(lib_symbol)
-
-                                            # Determine orientation hint based on pin positions
-                                            orientation_hint = "unknown"
-                                            default_rotation = 0
-
-                                            if len(pin_positions) >= 2:
-                                                # Analyze pin layout
-                                                y_positions = [pos[1] for pos in pin_positions.values()]
-                                                x_positions = [pos[0] for pos in pin_positions.values()]
-
-                                                y_range = max(y_positions) - min(y_positions)
-                                                x_range = max(x_positions) - min(x_positions)
-
-                                                if y_range > x_range:
-                                                    orientation_hint = "vertical"
-                                                    default_rotation = 0
-                                                else:
-                                                    orientation_hint = "horizontal"
-                                                    default_rotation = 90
-
-                                            return {
-                                                'pins': pins,
-                                                'pin_positions': pin_positions,
-                                                'default_rotation': default_rotation,
-                                                'orientation_hint': orientation_hint
-                                            }
+            for item in schematic.tree:
+                if isinstance(item, list) and len(item) > 0:
+                    if type(item[0]) is _Symbol and item[0] == _SYM_LIB_SYMBOLS:
+                        # Found lib_symbols section
+                        for lib_symbol in item[1:]:
+                            if isinstance(lib_symbol, list) and len(lib_symbol) > 1:
+                                if type(lib_symbol[0]) is _Symbol and lib_symbol[0] == _SYM_SYMBOL:
+                                    # Check if this is the symbol we're looking for
+                                    if lib_id in [str(x) for x in lib_symbol[1:] if isinstance(x, str)]:
+                                        # Found the library symbol
+                                        pins, pin_positions = ComponentManager._extract_pin_info(lib_symbol)
+
+                                        # Determine orientation hint based on pin positions
+                                        orientation_hint = "unknown"
+                                        default_rotation = 0
+
+                                        if len(pin_positions) >= 2:
+                                            # Analyze pin layout
+                                            y_positions = [pos[1] for pos in pin_positions.values()]
+                                            x_positions = [pos[0] for pos in pin_positions.values()]
+
+                                            y_range = max(y_positions) - min(y_positions)
+                                            x_range = max(x_positions) - min(x_positions)
+
+                                            if y_range > x_range:
+                                                orientation_hint = "vertical"
+                                                default_rotation = 0
+                                            else:
+                                                orientation_hint = "horizontal"
+                                                default_rotation = 90
+
+                                        return {
+                                            'pins': pins,
+                                            'pin_positions': pin_positions,
+                                            'default_rotation': default_rotation,
+                                            'orientation_hint': orientation_hint
+                                        }
 
             # If we couldn't find symbol info
             return {
@@ -270,9 +757,7 @@ class ComponentManager:
                 'orientation_hint': 'unknown'
             }
         except Exception as e:
-            print(f"Warning: Could not extract symbol info: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Could not extract symbol info: %s", e)
             return {
                 'pins': [],
                 'pin_positions': {},
@@ -281,6 +766,57 @@ class ComponentManager:
             }
 
     @staticmethod
+    def _extract_pin_info(lib_symbol: list):
+        """Collect pin numbers and (x, y, angle) positions from a library symbol
+
+        Walks the definition with an explicit stack, in document order. Pins
+        live directly in the symbol or in its unit sub-symbols
+        (symbol "Name_0_1" ...), so only those are descended into and graphics
+        primitives are skipped.
+
+        Returns:
+            (pins, pin_positions)
+        """
+        pins = []
+        pin_positions = {}
+
+        stack = [iter(lib_symbol[2:])]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
+            if not isinstance(node, list) or len(node) < 2 or type(node[0]) is not _Symbol:
+                continue
+
+            head = node[0]
+            if head == _SYM_SYMBOL:
+                stack.append(iter(node[2:]))
+            elif head == _SYM_PIN:
+                # Format: (pin type style (at x y angle) ... (number "N" ...))
+                pin_number = None
+                pin_x, pin_y, pin_angle = 0, 0, 0
+
+                for pin_item in node:
+                    if isinstance(pin_item, list) and len(pin_item) >= 2 and type(pin_item[0]) is _Symbol:
+                        key = pin_item[0]
+                        # Find (at x y angle)
+                        if key == _SYM_AT and len(pin_item) >= 3:
+                            pin_x = float(pin_item[1])
+                            pin_y = float(pin_item[2])
+                            pin_angle = int(pin_item[3]) if len(pin_item) > 3 else 0
+                        # Find (number "N")
+                        elif key == _SYM_NUMBER:
+                            pin_number = str(pin_item[1]).strip('"')
+
+                if pin_number:
+                    pins.append(pin_number)
+                    pin_positions[pin_number] = (pin_x, pin_y, pin_angle)
+
+        return pins, pin_positions
+
+    @staticmethod
+    @_requires_tree
     def _get_library_symbol_pins(schematic: Schematic, lib_id: str):
         """Get pin information from library symbol definition (backward compatibility)"""
         info = ComponentManager._get_library_symbol_info(schematic, lib_id)
@@ -416,33 +952,101 @@ class ComponentManager:
                 if key not in ['Reference', 'Value', 'Footprint', 'Datasheet']:
                     symbol.property.append(key, value)
 
-            print(f"Added component {symbol.reference} ({symbol.name}) to schematic.")
+            reference = component_def.get('reference', 'R?')
+            ref_snapshot = getattr(schematic, '_ref_snapshot', None)
+            if ref_snapshot is not None:
+                ref_snapshot[id(symbol)] = (symbol, reference)
+            ref_index = getattr(schematic, '_ref_index', None)
+            if ref_index is not None:
+                ref_index.setdefault(reference, symbol)
+            schematic._search_cache = None
+
+            logger.debug("Added component %s (%s) to schematic.", symbol.reference, symbol.name)
             return symbol
         except Exception as e:
-            print(f"Error adding component: {e}")
+            logger.error("Error adding component: %s", e)
+            return None
+
+    @staticmethod
+    def _read_ref(symbol):
+        """Read a symbol's Reference through kicad-skip, or None if it has none"""
+        try:
+            return symbol.property.Reference.value if hasattr(symbol.property, 'Reference') else None
+        except Exception:
             return None
 
+    @staticmethod
+    def _snapshot_refs(schematic: Schematic):
+        """Return {id(symbol): (symbol, Reference)} for every symbol, read through kicad-skip once
+
+        Property access in kicad-skip walks the S-expression on every call, so
+        the references are captured in a single pass and cached on the
+        schematic. Each entry holds its symbol so the id can't be reused by
+        another object while the entry exists. add/remove/update_component keep
+        the snapshot in step; it is rebuilt if the number of symbols no longer
+        matches.
+        """
+        refs = getattr(schematic, '_ref_snapshot', None)
+        if refs is not None and len(refs) == len(schematic.symbol):
+            return refs
+
+        refs = {id(symbol): (symbol, ComponentManager._read_ref(symbol)) for symbol in schematic.symbol}
+        schematic._ref_snapshot = refs
+        return refs
+
+    @staticmethod
+    def _build_ref_index(schematic: Schematic):
+        """Index the schematic's symbols by Reference, keeping the first of any duplicates"""
+        refs = ComponentManager._snapshot_refs(schematic)
+        ref_index = {}
+        for symbol in schematic.symbol:
+            entry = refs.get(id(symbol))
+            if entry is not None and entry[0] is symbol and entry[1] is not None:
+                ref_index.setdefault(entry[1], symbol)
+        schematic._ref_index = ref_index
+        return ref_index
+
+    @staticmethod
+    def _find_symbol_by_ref(schematic: Schematic, component_ref: str):
+        """Look up a symbol by reference designator through schematic._ref_index
+
+        The index is built on first use and kept up to date by add/remove/update.
+        Every hit is checked against the symbol's live Reference property; if it
+        no longer matches, the snapshot is discarded and the index rebuilt from
+        the properties themselves.
+        """
+        ref_index = getattr(schematic, '_ref_index', None)
+        symbol = ref_index.get(component_ref) if ref_index is not None else None
+        if symbol is None:
+            symbol = ComponentManager._build_ref_index(schematic).get(component_ref)
+        if symbol is None or ComponentManager._read_ref(symbol) == component_ref:
+            return symbol
+
+        logger.debug("Reference index is stale for %s, rebuilding", component_ref)
+        schematic._ref_snapshot = None
+        return ComponentManager._build_ref_index(schematic).get(component_ref)
+
     @staticmethod
     def remove_component(schematic: Schematic, component_ref: str):
         """Remove a component from the schematic by reference designator"""
         try:
             # kicad-skip doesn't have a direct remove_symbol method by reference.
             # We need to find the symbol and then remove it from the symbols list.
-            symbol_to_remove = None
-            for symbol in schematic.symbol:
-                if symbol.reference == component_ref:
-                    symbol_to_remove = symbol
-                    break
+            symbol_to_remove = ComponentManager._find_symbol_by_ref(schematic, component_ref)
 
             if symbol_to_remove:
                 schematic.symbol.remove(symbol_to_remove)
-                print(f"Removed component {component_ref} from schematic.")
+                schematic._ref_index.pop(component_ref, None)
+                schematic._ref_snapshot.pop(id(symbol_to_remove), None)
+                schematic._search_cache = None
+                schematic._sheet_instances_index = None
+                logger.debug("Removed component %s from schematic.", component_ref)
                 return True
             else:
-                print(f"Component with reference {component_ref} not found.")
+                logger.warning("Component with reference %s not found.", component_ref)
                 return False
         except Exception as e:
-            print(f"Error removing component {component_ref}: {e}")
+            logger.error("Error removing component %s: %s", component_ref, e)
             return False
 
 
@@ -450,15 +1054,7 @@ class ComponentManager:
     def update_component(schematic: Schematic, component_ref: str, new_properties: dict):
         """Update component properties by reference designator"""
         try:
-            symbol_to_update = None
-            for symbol in schematic.symbol:
-                try:
-                    ref = symbol.property.Reference.value if hasattr(symbol.property, 'Reference') else None
-                    if ref == component_ref:
-                        symbol_to_update = symbol
-                        break
-                except:
-                    continue
+            symbol_to_update = ComponentManager._find_symbol_by_ref(schematic, component_ref)
 
             if symbol_to_update:
                 for key, value in new_properties.items():
@@ -469,31 +1065,63 @@ class ComponentManager:
                             prop.value = value
                         else:
                             # Property doesn't exist - skip for now
-                            print(f"Warning: Property {key} not found on {component_ref}")
+                            logger.warning("Property %s not found on %s", key, component_ref)
                     except Exception as e:
-                        print(f"Error updating property {key}: {e}")
-                print(f"Updated properties for component {component_ref}.")
+                        logger.error("Error updating property %s: %s", key, e)
+                if 'Reference' in new_properties:
+                    # Re-key the snapshot and index under the new designator
+                    schematic._ref_snapshot[id(symbol_to_update)] = (
+                        symbol_to_update, ComponentManager._read_ref(symbol_to_update)
+                    )
+                    schematic._ref_index = None
+                schematic._search_cache = None
+                logger.debug("Updated properties for component %s.", component_ref)
                 return True
             else:
-                print(f"Component with reference {component_ref} not found.")
+                logger.warning("Component with reference %s not found.", component_ref)
                 return False
         except Exception as e:
-            print(f"Error updating component {component_ref}: {e}")
+            logger.error("Error updating component %s: %s", component_ref, e)
             return False
 
     @staticmethod
     def get_component(schematic: Schematic, component_ref: str):
         """Get a component by reference designator"""
+        symbol = ComponentManager._find_symbol_by_ref(schematic, component_ref)
+        if symbol is not None:
+            logger.debug("Found component with reference %s.", component_ref)
+            return symbol
+        logger.warning("Component with reference %s not found.", component_ref)
+        return None
+
+    @staticmethod
+    def _get_search_cache(schematic: Schematic):
+        """Return (reference, lib_id, value, symbol) per symbol, lowercased, for searching
+
+        Reading properties through kicad-skip walks the S-expression each time,
+        so the lowercased fields are cached on the schematic and rebuilt when
+        components are added, removed or updated. The cache is stored with the
+        symbol count it was built from, since symbols whose fields can't be
+        read are left out of it.
+        """
+        symbol_count = len(schematic.symbol)
+        cached = getattr(schematic, '_search_cache', None)
+        if cached is not None and cached[0] == symbol_count:
+            return cached[1]
+
+        refs = ComponentManager._snapshot_refs(schematic)
+        search_cache = []
         for symbol in schematic.symbol:
             try:
-                ref = symbol.property.Reference.value if hasattr(symbol.property, 'Reference') else None
-                if ref == component_ref:
-                    print(f"Found component with reference {component_ref}.")
-                    return symbol
-            except:
+                entry = refs.get(id(symbol))
+                ref = entry[1] if entry is not None else None
+                value = symbol.property.Value.value if hasattr(symbol.property, 'Value') else ''
+                name = symbol.lib_id.value if hasattr(symbol, 'lib_id') else ''
+            except Exception:
                 continue
-        print(f"Component with reference {component_ref} not found.")
-        return None
+            search_cache.append((str(ref or '').lower(), str(name or '').lower(), str(value or '').lower(), symbol))
+        schematic._search_cache = (symbol_count, search_cache)
+        return search_cache
 
     @staticmethod
     def search_components(schematic: Schematic, query: str):
@@ -501,21 +1129,20 @@ class ComponentManager:
         # This is a basic search, could be expanded to use regex or more complex logic
         matching_components = []
         query_lower = query.lower()
-        for symbol in schematic.symbol:
-            if query_lower in symbol.reference.lower() or \
-               query_lower in symbol.name.lower() or \
-               (hasattr(symbol.property, 'Value') and query_lower in symbol.property.Value.value.lower()):
+        for ref_lc, name_lc, value_lc, symbol in ComponentManager._get_search_cache(schematic):
+            if query_lower in ref_lc or query_lower in name_lc or query_lower in value_lc:
                 matching_components.append(symbol)
-        print(f"Found {len(matching_components)} components matching query '{query}'.")
+        logger.debug("Found %s components matching query '%s'.", len(matching_components), query)
         return matching_components
 
     @staticmethod
     def get_all_components(schematic: Schematic):
         """Get all components in schematic"""
-        print(f"Retrieving all {len(schematic.symbol)} components.")
+        logger.debug("Retrieving all %s components.", len(schematic.symbol))
         return list(schematic.symbol)
 
     @staticmethod
+    @_requires_tree
     def save_schematic_with_tree(schematic: Schematic, file_path: str):
         """Save schematic by writing tree directly to file (bypass kicad-skip write)"""
         try:
@@ -526,22 +1153,19 @@ class ComponentManager:
             # Build the complete S-expression: (kicad_sch <all elements except tree[0]>)
             kicad_sch_expr = [sexpdata.Symbol('kicad_sch')] + schematic.tree[1:]
 
-            # Convert to S-expression string with pretty printing
-            sexpr_str = sexpdata.dumps(kicad_sch_expr, pretty_print=True, indent_as='\t')
-
-            # Write to file
+            # Stream the pretty-printed S-expression straight to the file
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(sexpr_str)
+                _stream_dump(f, kicad_sch_expr, '\t')
 
-            print(f"Saved schematic with tree to: {file_path}")
+            schematic._sheet_instances_index = None
+            logger.debug("Saved schematic with tree to: %s", file_path)
             return True
         except Exception as e:
-            print(f"Error saving schematic with tree: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error saving schematic with tree: %s", e)
             return False
 
     @staticmethod
+    @_requires_tree
     def add_component_sexpr(schematic: Schematic, lib_id: str, reference: str, value: str,
                            x: float, y: float, rotation: int = 0, footprint: str = "",
                            datasheet: str = "", auto_rotate: bool = False,
@@ -555,94 +1179,240 @@ class ComponentManager:
         try:
             # Step 1: Ensure symbol definition is in lib_symbols
             if not ComponentManager._ensure_symbol_in_lib_symbols(schematic, lib_id):
-                print(f"Warning: Could not add {lib_id} to lib_symbols, but continuing...")
-
-            # Step 1.5: Auto-determine rotation if requested
-            final_rotation = rotation
-            if auto_rotate or desired_orientation:
-                symbol_info = ComponentManager._get_library_symbol_info(schematic, lib_id)
-
-                if desired_orientation:
-                    # User specified desired orientation
-                    if desired_orientation == "vertical" and symbol_info['orientation_hint'] == "horizontal":
-                        final_rotation = 90
-                    elif desired_orientation == "horizontal" and symbol_info['orientation_hint'] == "vertical":
-                        final_rotation = 90
-                    else:
-                        final_rotation = 0
-                    print(f"Using rotation={final_rotation}° for {desired_orientation} orientation (symbol default: {symbol_info['orientation_hint']})")
-                elif auto_rotate:
-                    # Use symbol's default orientation
-                    final_rotation = symbol_info['default_rotation']
-                    print(f"Auto-rotation: {lib_id} is {symbol_info['orientation_hint']} by default, using rotation={final_rotation}°")
-                    print(f"  Pin positions: {symbol_info['pin_positions']}")
+                logger.warning("Could not add %s to lib_symbols, but continuing...", lib_id)
 
             # Step 2: Create symbol instance S-expression
-            symbol_expr = ComponentManager.create_symbol_sexpr(
-                schematic, lib_id, reference, value, x, y, final_rotation,
-                footprint=footprint, datasheet=datasheet
+            symbol_expr, final_rotation = ComponentManager._build_symbol_expr(
+                schematic, lib_id, reference, value, x, y, rotation,
+                footprint=footprint, datasheet=datasheet,
+                auto_rotate=auto_rotate, desired_orientation=desired_orientation
             )
 
-            # Step 3: Find position to insert (before sheet_instances)
-            if hasattr(schematic, 'tree') and isinstance(schematic.tree, list):
-                insert_pos = len(schematic.tree)
-                for i, item in enumerate(schematic.tree):
-                    if isinstance(item, list) and len(item) > 0:
-                        if hasattr(item[0], 'value') and item[0].value() == 'sheet_instances':
-                            insert_pos = i
-                            break
-
-                schematic.tree.insert(insert_pos, symbol_expr)
-                print(f"Added component {reference} ({lib_id}) at ({x}, {y}) rotation={final_rotation}° to tree at position {insert_pos}")
-                return True
-            else:
-                print("Error: Schematic tree not accessible")
-                return False
+            # Step 3: Insert before sheet_instances
+            insert_pos = ComponentManager._splice_symbol_exprs(schematic, [symbol_expr])
+            logger.debug("Added component %s (%s) at (%s, %s) rotation=%s° to tree at position %s", reference, lib_id, x, y, final_rotation, insert_pos)
+            return True
         except Exception as e:
-            print(f"Error adding component {reference}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error adding component %s: %s", reference, e)
             return False
 
     @staticmethod
-    def get_next_grid_position(schematic: Schematic, grid_x: int = 0, grid_y: int = 0, grid_size: float = 50.8):
-        """Calculate next available grid position (Method 2 helper)"""
-        # Get occupied positions
-        occupied = set()
+    def _build_symbol_expr(schematic: Schematic, lib_id: str, reference: str, value: str,
+                           x: float, y: float, rotation: int = 0, footprint: str = "",
+                           datasheet: str = "", auto_rotate: bool = False,
+                           desired_orientation: str = None):
+        """Create a symbol instance S-expression, resolving auto rotation
+
+        Returns:
+            (symbol_expr, final_rotation)
+        """
+        final_rotation = rotation
+        if auto_rotate or desired_orientation:
+            symbol_info = ComponentManager._get_library_symbol_info(schematic, lib_id)
+
+            if desired_orientation:
+                # User specified desired orientation
+                if desired_orientation == "vertical" and symbol_info['orientation_hint'] == "horizontal":
+                    final_rotation = 90
+                elif desired_orientation == "horizontal" and symbol_info['orientation_hint'] == "vertical":
+                    final_rotation = 90
+                else:
+                    final_rotation = 0
+                logger.debug("Using rotation=%s° for %s orientation (symbol default: %s)", final_rotation, desired_orientation, symbol_info['orientation_hint'])
+            elif auto_rotate:
+                # Use symbol's default orientation
+                final_rotation = symbol_info['default_rotation']
+                logger.debug("Auto-rotation: %s is %s by default, using rotation=%s°", lib_id, symbol_info['orientation_hint'], final_rotation)
+                logger.debug("  Pin positions: %s", symbol_info['pin_positions'])
+
+        symbol_expr = ComponentManager.create_symbol_sexpr(
+            schematic, lib_id, reference, value, x, y, final_rotation,
+            footprint=footprint, datasheet=datasheet
+        )
+        return symbol_expr, final_rotation
+
+    @staticmethod
+    def _build_symbol_exprs(schematic: Schematic, components: list, start_x: float,
+                            start_y: float, spacing: float, columns: int):
+        """Create symbol instance S-expressions for a grid of components
+
+        The lib_symbols definitions for the whole batch are resolved up front,
+        one library at a time. Components that fail to build are reported and
+        skipped; they keep their grid slot.
+
+        Returns:
+            list of (reference, symbol_expr)
+        """
+        ComponentManager._prefetch_lib_symbols(schematic, [comp.get('lib_id') for comp in components])
+
+        exprs = []
+        for i, comp in enumerate(components):
+            lib_id = comp.get('lib_id')
+            reference = comp.get('reference')
+            try:
+                # Calculate position in grid
+                col = i % columns
+                row = i // columns
+                x = start_x + col * spacing
+                y = start_y + row * spacing
+
+                symbol_expr, _ = ComponentManager._build_symbol_expr(
+                    schematic, lib_id, reference, comp.get('value'), x, y, 0,
+                    comp.get('footprint', ''), comp.get('datasheet', '')
+                )
+                exprs.append((reference, symbol_expr))
+            except Exception as e:
+                logger.error("Error adding component %s: %s", reference, e)
+        return exprs
+
+    @staticmethod
+    def _splice_symbol_exprs(schematic: Schematic, symbol_exprs: list):
+        """Insert symbol S-expressions in front of sheet_instances in one splice
+
+        Returns:
+            int: tree index the first expression was inserted at
+        """
+        insert_pos = ComponentManager._find_sheet_instances_index(schematic)
+        schematic.tree[insert_pos:insert_pos] = symbol_exprs
+        if schematic._sheet_instances_index is not None:
+            schematic._sheet_instances_index = insert_pos + len(symbol_exprs)
+        return insert_pos
+
+    @staticmethod
+    def _symbol_positions(schematic: Schematic):
+        """Return the (x, y) position of every placed symbol"""
+        positions = []
         for symbol in schematic.symbol:
             try:
-                sx, sy = symbol.at[0], symbol.at[1]
-                grid_sx = round(sx / grid_size)
-                grid_sy = round(sy / grid_size)
-                occupied.add((grid_sx, grid_sy))
+                positions.append((symbol.at[0], symbol.at[1]))
             except:
                 continue
+        return positions
 
-        # Find next available position starting from grid_x, grid_y
-        for row in range(grid_y, grid_y + 20):
-            for col in range(grid_x, grid_x + 20):
+    @staticmethod
+    def _free_grid_cells(positions: list, count: int, grid_x: int, grid_y: int, grid_size: float):
+        """Return up to `count` free cells of the search window in row-major order"""
+        occupied = set()
+        for sx, sy in positions:
+            occupied.add((round(sx / grid_size), round(sy / grid_size)))
+
+        free = []
+        for row in range(grid_y, grid_y + _GRID_SEARCH_SPAN):
+            for col in range(grid_x, grid_x + _GRID_SEARCH_SPAN):
+                if len(free) == count:
+                    return free
                 if (col, row) not in occupied:
-                    return (col * grid_size, row * grid_size)
+                    free.append((col, row))
+        return free
+
+    @staticmethod
+    def _free_grid_cells_numpy(positions: list, count: int, grid_x: int, grid_y: int, grid_size: float):
+        """NumPy version of _free_grid_cells: mark an occupancy bitmap, take the first free cells"""
+        cells = np.rint(np.asarray(positions, dtype=float) / grid_size).astype(np.int64)
+        cols = cells[:, 0] - grid_x
+        rows = cells[:, 1] - grid_y
+        inside = (cols >= 0) & (cols < _GRID_SEARCH_SPAN) & (rows >= 0) & (rows < _GRID_SEARCH_SPAN)
+
+        grid = np.zeros((_GRID_SEARCH_SPAN, _GRID_SEARCH_SPAN), dtype=bool)
+        grid[rows[inside], cols[inside]] = True
+        free = np.flatnonzero(~grid.ravel())[:count]
+        return [(grid_x + int(i) % _GRID_SEARCH_SPAN, grid_y + int(i) // _GRID_SEARCH_SPAN) for i in free]
+
+    @staticmethod
+    def get_next_grid_positions(schematic: Schematic, count: int, grid_x: int = 0, grid_y: int = 0,
+                                grid_size: float = 50.8):
+        """Calculate the next `count` free grid positions (Method 2 helper)
+
+        Occupied cells are collected once; every cell handed out is marked as
+        taken, so components placed in the same batch never share a position.
+        With NumPy installed and many symbols placed, occupancy is computed as
+        a bitmap instead of a Python set.
+        """
+        positions = ComponentManager._symbol_positions(schematic)
+        if np is not None and len(positions) >= _NUMPY_GRID_MIN_SYMBOLS:
+            free = ComponentManager._free_grid_cells_numpy(positions, count, grid_x, grid_y, grid_size)
+        else:
+            free = ComponentManager._free_grid_cells(positions, count, grid_x, grid_y, grid_size)
+
+        # Find next available positions starting from grid_x, grid_y
+        result = [(col * grid_size, row * grid_size) for col, row in free]
 
         # Fallback to original position if all occupied (unlikely)
-        return (grid_x * grid_size, grid_y * grid_size)
+        while len(result) < count:
+            result.append((grid_x * grid_size, grid_y * grid_size))
+        return result
+
+    @staticmethod
+    def get_next_grid_position(schematic: Schematic, grid_x: int = 0, grid_y: int = 0, grid_size: float = 50.8):
+        """Calculate next available grid position (Method 2 helper)"""
+        return ComponentManager.get_next_grid_positions(schematic, 1, grid_x, grid_y, grid_size)[0]
 
     @staticmethod
     def add_component_auto(schematic: Schematic, lib_id: str, reference: str, value: str,
                           grid_x: int = 0, grid_y: int = 0, grid_size: float = 50.8,
                           rotation: int = 0, footprint: str = "", datasheet: str = ""):
-        """Add a component with automatic grid-based positioning (Method 2)"""
+        """Add a component with automatic grid-based positioning (Method 2)
+
+        Returns:
+            (x, y) where the component was placed, or None if it wasn't added
+        """
         try:
             # Calculate position
             x, y = ComponentManager.get_next_grid_position(schematic, grid_x, grid_y, grid_size)
 
             # Add component at calculated position
-            return ComponentManager.add_component_sexpr(
+            if ComponentManager.add_component_sexpr(
                 schematic, lib_id, reference, value, x, y, rotation, footprint, datasheet
+            ):
+                return (x, y)
+            return None
+        except Exception as e:
+            logger.error("Error adding component %s with auto positioning: %s", reference, e)
+            return None
+
+    @staticmethod
+    @_requires_tree
+    def add_components_auto(schematic: Schematic, components: list, grid_x: int = 0, grid_y: int = 0,
+                            grid_size: float = 50.8):
+        """Add several components at successive free grid positions (Method 2, batched)
+
+        Args:
+            components: List of dicts with keys: lib_id, reference, value, rotation (optional),
+                        footprint (optional), datasheet (optional)
+
+        Returns:
+            List of (reference, x, y) for each component that was placed
+        """
+        try:
+            positions = ComponentManager.get_next_grid_positions(
+                schematic, len(components), grid_x, grid_y, grid_size
             )
+
+            ComponentManager._prefetch_lib_symbols(schematic, [comp.get('lib_id') for comp in components])
+
+            exprs = []
+            placed = []
+            for comp, (x, y) in zip(components, positions):
+                lib_id = comp.get('lib_id')
+                reference = comp.get('reference')
+                try:
+                    symbol_expr, _ = ComponentManager._build_symbol_expr(
+                        schematic, lib_id, reference, comp.get('value'), x, y, comp.get('rotation', 0),
+                        comp.get('footprint', ''), comp.get('datasheet', '')
+                    )
+                    exprs.append(symbol_expr)
+                    placed.append((reference, x, y))
+                    logger.debug("Placing component %s (%s) at (%s, %s)", reference, lib_id, x, y)
+                except Exception as e:
+                    logger.error("Error adding component %s with auto positioning: %s", reference, e)
+
+            if exprs:
+                ComponentManager._splice_symbol_exprs(schematic, exprs)
+            logger.debug("Added %s/%s components with auto positioning", len(exprs), len(components))
+            return placed
         except Exception as e:
-            print(f"Error adding component {reference} with auto positioning: {e}")
-            return False
+            logger.error("Error adding components with auto positioning: %s", e)
+            return []
 
     @staticmethod
     def calculate_relative_position(schematic: Schematic, anchor_ref: str,
@@ -651,7 +1421,7 @@ class ComponentManager:
         # Find anchor component
         anchor_symbol = ComponentManager.get_component(schematic, anchor_ref)
         if not anchor_symbol:
-            print(f"Anchor component {anchor_ref} not found")
+            logger.warning("Anchor component %s not found", anchor_ref)
             return None
 
         # Get anchor position
@@ -659,46 +1429,42 @@ class ComponentManager:
             anchor_x = anchor_symbol.at[0]
             anchor_y = anchor_symbol.at[1]
         except:
-            print(f"Could not get position of anchor component {anchor_ref}")
+            logger.warning("Could not get position of anchor component %s", anchor_ref)
             return None
 
-        # Calculate offset based on direction
-        offsets = {
-            'right': (distance, 0),
-            'left': (-distance, 0),
-            'below': (0, distance),
-            'above': (0, -distance),
-            'below-right': (distance, distance),
-            'below-left': (-distance, distance),
-            'above-right': (distance, -distance),
-            'above-left': (-distance, -distance)
-        }
-
-        dx, dy = offsets.get(direction, (distance, 0))
-        return (anchor_x + dx, anchor_y + dy)
+        # Calculate offset based on direction (unknown directions place to the right)
+        ux, uy = _DIRECTION_OFFSETS.get(direction, (1, 0))
+        return (anchor_x + ux * distance, anchor_y + uy * distance)
 
     @staticmethod
     def add_component_relative(schematic: Schematic, lib_id: str, reference: str, value: str,
                               anchor_ref: str, direction: str = "right", distance: float = 25.4,
                               rotation: int = 0, footprint: str = "", datasheet: str = ""):
-        """Add a component relative to another component (Method 3)"""
+        """Add a component relative to another component (Method 3)
+
+        Returns:
+            (x, y) where the component was placed, or None if it wasn't added
+        """
         try:
             # Calculate position
             position = ComponentManager.calculate_relative_position(schematic, anchor_ref, direction, distance)
             if position is None:
-                return False
+                return None
 
             x, y = position
 
             # Add component at calculated position
-            return ComponentManager.add_component_sexpr(
+            if ComponentManager.add_component_sexpr(
                 schematic, lib_id, reference, value, x, y, rotation, footprint, datasheet
-            )
+            ):
+                return position
+            return None
         except Exception as e:
-            print(f"Error adding component {reference} relative to {anchor_ref}: {e}")
-            return False
+            logger.error("Error adding component %s relative to %s: %s", reference, anchor_ref, e)
+            return None
 
     @staticmethod
+    @_requires_tree
     def add_component_group(schematic: Schematic, components: list, start_x: float = 100,
                           start_y: float = 100, spacing: float = 25.4, columns: int = 5):
         """Add multiple components in a group layout (Method 4)
@@ -711,32 +1477,18 @@ class ComponentManager:
             columns: Number of columns before wrapping to next row
         """
         try:
-            added_count = 0
-            for i, comp in enumerate(components):
-                # Calculate position in grid
-                col = i % columns
-                row = i // columns
-                x = start_x + col * spacing
-                y = start_y + row * spacing
-
-                # Add component
-                success = ComponentManager.add_component_sexpr(
-                    schematic,
-                    comp.get('lib_id'),
-                    comp.get('reference'),
-                    comp.get('value'),
-                    x, y, 0,
-                    comp.get('footprint', ''),
-                    comp.get('datasheet', '')
-                )
-
-                if success:
-                    added_count += 1
+            exprs = ComponentManager._build_symbol_exprs(
+                schematic, components, start_x, start_y, spacing, columns
+            )
+            if exprs:
+                insert_pos = ComponentManager._splice_symbol_exprs(schematic, [expr for _, expr in exprs])
+                logger.debug("Added components %s to tree at position %s", [ref for ref, _ in exprs], insert_pos)
 
-            print(f"Added {added_count}/{len(components)} components in group")
+            added_count = len(exprs)
+            logger.debug("Added %s/%s components in group", added_count, len(components))
             return added_count == len(components)
         except Exception as e:
-            print(f"Error adding component group: {e}")
+            logger.error("Error adding component group: %s", e)
             return False
 
 if __name__ == '__main__':
@@ -1,69 +1,318 @@
 from skip import Schematic
 # Wire and Net classes might not be directly importable in the current version
 import os
+import logging
+import functools
 import sexpdata
-import uuid
+from typing import Optional, Tuple
+
+from commands.component_schematic import ComponentManager
+
+logger = logging.getLogger('kicad_interface')
+
+_Symbol = sexpdata.Symbol
+# One shared Symbol per name. sexpdata Symbols carry a __dict__ and compare
+# by exact class, so instead of a slotted subclass every node reuses these.
+_SYMBOLS = {}
+
+
+def _sym(name: str) -> _Symbol:
+    """Return the interned Symbol for name"""
+    symbol = _SYMBOLS.get(name)
+    if symbol is None:
+        symbol = _SYMBOLS[name] = _Symbol(name)
+    return symbol
+
+
+_SYM_WIRE = _sym('wire')
+_SYM_PTS = _sym('pts')
+_SYM_XY = _sym('xy')
+_SYM_STROKE = _sym('stroke')
+_SYM_WIDTH = _sym('width')
+_SYM_TYPE = _sym('type')
+_SYM_DEFAULT = _sym('default')
+_SYM_UUID = _sym('uuid')
+_SYM_AT = _sym('at')
+_SYM_FIELDS_AUTOPLACED = _sym('fields_autoplaced')
+_SYM_YES = _sym('yes')
+_SYM_EFFECTS = _sym('effects')
+_SYM_FONT = _sym('font')
+_SYM_SIZE = _sym('size')
+_SYM_JUSTIFY = _sym('justify')
+_SYM_LEFT = _sym('left')
+_SYM_BOTTOM = _sym('bottom')
+_LABEL_SYMBOLS = {
+    'label': _sym('label'),
+    'global_label': _sym('global_label'),
+    'hierarchical_label': _sym('hierarchical_label'),
+}
+# Top-level node kinds tracked by the per-schematic kind index
+_INDEXED_KINDS = {_SYM_WIRE: 'wire'}
+_INDEXED_KINDS.update((symbol, kind) for kind, symbol in _LABEL_SYMBOLS.items())
+
+# Voltage divider wiring relative to (position_x, position_y): VCC at -20,
+# R_upper at 0, R_lower at +20, GND at +40, output tap at (+15, +10).
+# Resistor pins sit 5 units above/below the resistor centre.
+_VDIV_SYMBOLS = ((0, -20), (0, 0), (0, 20), (0, 40))  # VCC, R_upper, R_lower, GND
+_VDIV_WIRES = (
+    ("Wire VCC→R_upper", 0, -20, 0, -5),
+    ("Wire R_upper→R_lower", 0, 5, 0, 15),
+    ("Wire R_lower→GND", 0, 25, 0, 40),
+    ("Output tap wire", 0, 5, 15, 10),
+)
+_VDIV_LABELS = (
+    ("VCC label", "VCC", 5, -20),
+    ("VOUT label", "VOUT", 20, 10),
+    ("GND label", "GND", 5, 40),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _calc_r_lower(v_in: float, v_out: float, r_upper: float) -> float:
+    """Lower divider resistor for the given voltages and upper resistor
+
+    V_out = V_in * R_lower / (R_upper + R_lower)
+    R_lower = (V_out * R_upper) / (V_in - V_out)
+    """
+    return (v_out * r_upper) / (v_in - v_out)
+
+
+@functools.lru_cache(maxsize=256)
+def _vdiv_refs(px_i: int, py_i: int) -> Tuple[str, str, str, str]:
+    """References for the VCC, R_upper, R_lower and GND symbols of a divider at (px_i, py_i)"""
+    pos_key = f"{px_i}_{py_i}"
+    return (f"#PWR_VCC_{pos_key}", f"R_upper_{pos_key}", f"R_lower_{pos_key}", f"#PWR_GND_{pos_key}")
+
+
+def _vdiv_geometry(pos_x: float, pos_y: float):
+    """Absolute layout of a voltage divider placed at (pos_x, pos_y)
+
+    Returns:
+        (symbols, wires, labels): symbol (x, y) points in VCC, R_upper,
+        R_lower, GND order; ((x1, y1), (x2, y2)) wire segments; and
+        (text, x, y) labels, the latter two in _VDIV_WIRES/_VDIV_LABELS order
+    """
+    symbols = tuple((pos_x + dx, pos_y + dy) for dx, dy in _VDIV_SYMBOLS)
+    wires = tuple(((pos_x + dx1, pos_y + dy1), (pos_x + dx2, pos_y + dy2))
+                  for _, dx1, dy1, dx2, dy2 in _VDIV_WIRES)
+    labels = tuple((text, pos_x + dx, pos_y + dy) for _, text, dx, dy in _VDIV_LABELS)
+    return symbols, wires, labels
+
+
+class _UuidPool:
+    """Hands out random (version 4) UUID strings from a buffered os.urandom block
+
+    One urandom call covers 256 UUIDs instead of one syscall plus a UUID
+    object per wire/label.
+    """
+
+    __slots__ = ('buf', 'pos')
+
+    _REFILL_SIZE = 4096
+
+    def __init__(self):
+        self.buf = b''
+        self.pos = 0
+
+    def reset(self):
+        self.buf = b''
+        self.pos = 0
+
+    def next(self) -> str:
+        pos = self.pos
+        if pos + 16 > len(self.buf):
+            self.buf = os.urandom(self._REFILL_SIZE)
+            pos = 0
+        self.pos = pos + 16
+        b = bytearray(self.buf[pos:pos + 16])
+        # RFC 4122 section 4.4: version 4, variant 10xx
+        b[6] = (b[6] & 0x0F) | 0x40
+        b[8] = (b[8] & 0x3F) | 0x80
+        h = b.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+_uuid_pool = _UuidPool()
+if hasattr(os, 'register_at_fork'):
+    # A forked child must not hand out the same buffered bytes as its parent
+    os.register_at_fork(after_in_child=_uuid_pool.reset)
+
+
+# Shared with ComponentManager: both insert in front of sheet_instances and
+# keep the same schematic._sheet_instances_index cache
+_get_sheet_instances_idx = ComponentManager._find_sheet_instances_index
+
+
+def _tree_state(schematic: Schematic) -> Tuple[int, int]:
+    """(generation, length) of the schematic tree, which the kind index is keyed on"""
+    return getattr(schematic, '_tree_generation', 0), len(schematic.tree)
+
+
+def _tree_changed(schematic: Schematic):
+    """Record that wires or labels were added, removed or edited in place
+
+    Anything that changes them other than ConnectionManager's inserts must
+    call this, or the kind index and endpoint grid go on returning old nodes.
+    """
+    schematic._tree_generation = getattr(schematic, '_tree_generation', 0) + 1
+
+
+def _get_kind_index(schematic: Schematic) -> dict:
+    """Return {kind: [nodes]} for the wires and labels in the schematic tree
+
+    Cached on the schematic together with the tree generation and length it
+    was built for. Inserts made through ConnectionManager keep it current;
+    after _tree_changed, or any change to the tree length, it is rebuilt
+    with one scan on next use.
+    """
+    tree = schematic.tree
+    index = getattr(schematic, '_kind_index', None)
+    if index is not None and schematic._kind_index_state == _tree_state(schematic):
+        return index
+
+    index = {kind: [] for kind in _INDEXED_KINDS.values()}
+    for item in tree:
+        if isinstance(item, list) and len(item) > 0 and type(item[0]) is _Symbol:
+            kind = _INDEXED_KINDS.get(item[0])
+            if kind is not None:
+                index[kind].append(item)
+
+    schematic._kind_index = index
+    schematic._kind_index_state = _tree_state(schematic)
+    return index
+
+
+def _index_new_nodes(schematic: Schematic, exprs: list, old_state: Tuple[int, int]):
+    """Add freshly inserted nodes to the kind index, if one is cached and was current
+
+    old_state is the _tree_state from before the insert; the generation is
+    bumped here.
+    """
+    _tree_changed(schematic)
+    index = getattr(schematic, '_kind_index', None)
+    if index is None:
+        return
+    if schematic._kind_index_state != old_state:
+        schematic._kind_index = None
+        return
+    grid = getattr(schematic, '_endpoint_grid', None)
+    if grid is not None and schematic._endpoint_grid_index is not index:
+        grid = None
+    for expr in exprs:
+        if isinstance(expr, list) and len(expr) > 0 and type(expr[0]) is _Symbol:
+            kind = _INDEXED_KINDS.get(expr[0])
+            if kind is not None:
+                index[kind].append(expr)
+                if grid is not None and kind == 'wire':
+                    _grid_add_wire(grid, expr)
+    schematic._kind_index_state = _tree_state(schematic)
+
+
+def _find_child(node: list, head: _Symbol) -> Optional[list]:
+    """Return the first child list of node starting with head"""
+    for child in node:
+        if isinstance(child, list) and len(child) > 0 and type(child[0]) is _Symbol and child[0] == head:
+            return child
+    return None
+
+
+def _node_uuid(node: list) -> Optional[str]:
+    uuid_item = _find_child(node, _SYM_UUID)
+    return str(uuid_item[1]) if uuid_item is not None and len(uuid_item) > 1 else None
+
+
+def _wire_endpoints(wire: list) -> Optional[Tuple[Tuple[float, float], Tuple[float, float]]]:
+    pts = _find_child(wire, _SYM_PTS)
+    if pts is None:
+        return None
+    xys = [(p[1], p[2]) for p in pts[1:] if isinstance(p, list) and len(p) > 2]
+    if len(xys) < 2:
+        return None
+    return xys[0], xys[-1]
+
+
+def _point_key(x: float, y: float) -> Tuple[int, int]:
+    """Quantize a point to 0.01 units so float noise doesn't split a connection"""
+    return (round(x * 100), round(y * 100))
+
+
+def _grid_add_wire(grid: dict, wire: list):
+    endpoints = _wire_endpoints(wire)
+    if endpoints is None:
+        return
+    start, end = endpoints
+    entry = (wire, endpoints)
+    start_key = _point_key(*start)
+    grid.setdefault(start_key, []).append(entry)
+    end_key = _point_key(*end)
+    if end_key != start_key:
+        grid.setdefault(end_key, []).append(entry)
+
+
+def _get_endpoint_grid(schematic: Schematic) -> dict:
+    """Return {quantized point: [(wire, (start, end)), ...]} for wire endpoints
+
+    Built from the kind index and rebuilt whenever that is; otherwise kept
+    current by _index_new_nodes as wires are added.
+    """
+    index = _get_kind_index(schematic)
+    grid = getattr(schematic, '_endpoint_grid', None)
+    if grid is not None and schematic._endpoint_grid_index is index:
+        return grid
+
+    grid = {}
+    for wire in index['wire']:
+        _grid_add_wire(grid, wire)
+    schematic._endpoint_grid = grid
+    schematic._endpoint_grid_index = index
+    return grid
+
 
 class ConnectionManager:
     """Manage connections between components"""
 
     @staticmethod
-    def add_wire(schematic: Schematic, start_point: list, end_point: list, properties: dict = None):
+    def add_wire(schematic: Schematic, start_point: Tuple[float, float], end_point: Tuple[float, float],
+                 properties: dict = None, insert: bool = True):
         """Add a wire between two points using S-expression
 
         Args:
             schematic: Schematic object
-            start_point: [x, y] coordinates for start point
-            end_point: [x, y] coordinates for end point
+            start_point: (x, y) coordinates for start point
+            end_point: (x, y) coordinates for end point
             properties: Optional properties dict (stroke, uuid, etc.)
+            insert: If False, only build the expression; the caller splices
+                it in later with _splice
 
         Returns:
-            Wire S-expression if successful, None otherwise
+            Wire S-expression
         """
-        try:
-            # Create wire S-expression
-            # Format: (wire (pts (xy x1 y1) (xy x2 y2)) (stroke (width 0) (type default)) (uuid "..."))
-            wire_uuid = str(uuid.uuid4())
-
-            wire_expr = [
-                sexpdata.Symbol('wire'),
-                [
-                    sexpdata.Symbol('pts'),
-                    [sexpdata.Symbol('xy'), start_point[0], start_point[1]],
-                    [sexpdata.Symbol('xy'), end_point[0], end_point[1]]
-                ],
-                [
-                    sexpdata.Symbol('stroke'),
-                    [sexpdata.Symbol('width'), 0],
-                    [sexpdata.Symbol('type'), sexpdata.Symbol('default')]
-                ],
-                [sexpdata.Symbol('uuid'), wire_uuid]
-            ]
-
-            # Find position to insert (before sheet_instances)
-            if hasattr(schematic, 'tree') and isinstance(schematic.tree, list):
-                insert_pos = len(schematic.tree)
-                for i, item in enumerate(schematic.tree):
-                    if isinstance(item, list) and len(item) > 0:
-                        if hasattr(item[0], 'value') and item[0].value() == 'sheet_instances':
-                            insert_pos = i
-                            break
-
-                schematic.tree.insert(insert_pos, wire_expr)
-                print(f"Added wire from {start_point} to {end_point} (UUID: {wire_uuid})")
-                return wire_expr
-            else:
-                print("Error: Schematic tree not accessible")
-                return None
-
-        except Exception as e:
-            print(f"Error adding wire: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+        # Create wire S-expression
+        # Format: (wire (pts (xy x1 y1) (xy x2 y2)) (stroke (width 0) (type default)) (uuid "..."))
+        wire_uuid = _uuid_pool.next()
+        start_x, start_y = start_point
+        end_x, end_y = end_point
+
+        wire_expr = [
+            _SYM_WIRE,
+            [
+                _SYM_PTS,
+                [_SYM_XY, start_x, start_y],
+                [_SYM_XY, end_x, end_y]
+            ],
+            [_SYM_STROKE, [_SYM_WIDTH, 0], [_SYM_TYPE, _SYM_DEFAULT]],
+            [_SYM_UUID, wire_uuid]
+        ]
+        if not insert:
+            return wire_expr
+
+        ConnectionManager._insert_node(schematic, wire_expr)
+        logger.debug("Added wire from %s to %s (UUID: %s)", start_point, end_point, wire_uuid)
+        return wire_expr
 
     @staticmethod
-    def add_label(schematic: Schematic, text: str, x: float, y: float, label_type: str = "label"):
+    def add_label(schematic: Schematic, text: str, x: float, y: float, label_type: str = "label",
+                  insert: bool = True):
         """Add a label/net label to the schematic
 
         Args:
@@ -72,54 +321,63 @@ class ConnectionManager:
             x: X coordinate
             y: Y coordinate
             label_type: Type of label ("label", "global_label", "hierarchical_label")
+            insert: If False, only build the expression; the caller splices
+                it in later with _splice
 
         Returns:
-            Label S-expression if successful, None otherwise
+            Label S-expression
         """
-        try:
-            label_uuid = str(uuid.uuid4())
-
-            # Create label S-expression
-            # Format: (label "text" (at x y rotation) (effects ...) (uuid "..."))
-            label_expr = [
-                sexpdata.Symbol(label_type),
-                text,
-                [sexpdata.Symbol('at'), x, y, 0],
-                [
-                    sexpdata.Symbol('fields_autoplaced'), sexpdata.Symbol('yes')
-                ],
-                [
-                    sexpdata.Symbol('effects'),
-                    [
-                        sexpdata.Symbol('font'),
-                        [sexpdata.Symbol('size'), 1.27, 1.27]
-                    ],
-                    [sexpdata.Symbol('justify'), sexpdata.Symbol('left'), sexpdata.Symbol('bottom')]
-                ],
-                [sexpdata.Symbol('uuid'), label_uuid]
-            ]
-
-            # Find position to insert (before sheet_instances)
-            if hasattr(schematic, 'tree') and isinstance(schematic.tree, list):
-                insert_pos = len(schematic.tree)
-                for i, item in enumerate(schematic.tree):
-                    if isinstance(item, list) and len(item) > 0:
-                        if hasattr(item[0], 'value') and item[0].value() == 'sheet_instances':
-                            insert_pos = i
-                            break
-
-                schematic.tree.insert(insert_pos, label_expr)
-                print(f"Added {label_type} '{text}' at ({x}, {y})")
-                return label_expr
-            else:
-                print("Error: Schematic tree not accessible")
-                return None
+        label_uuid = _uuid_pool.next()
+
+        # Create label S-expression
+        # Format: (label "text" (at x y rotation) (effects ...) (uuid "..."))
+        label_expr = [
+            _sym(label_type),
+            text,
+            [_SYM_AT, x, y, 0],
+            [_SYM_FIELDS_AUTOPLACED, _SYM_YES],
+            [_SYM_EFFECTS, [_SYM_FONT, [_SYM_SIZE, 1.27, 1.27]], [_SYM_JUSTIFY, _SYM_LEFT, _SYM_BOTTOM]],
+            [_SYM_UUID, label_uuid]
+        ]
+        if not insert:
+            return label_expr
+
+        ConnectionManager._insert_node(schematic, label_expr)
+        logger.debug("Added %s '%s' at (%s, %s)", label_type, text, x, y)
+        return label_expr
 
-        except Exception as e:
-            print(f"Error adding label: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+    @staticmethod
+    def _insert_node(schematic: Schematic, expr: list) -> Optional[int]:
+        """Insert one top-level expression before sheet_instances
+
+        Returns:
+            Index the expression was inserted at
+        """
+        old_state = _tree_state(schematic)
+        insert_pos = _get_sheet_instances_idx(schematic)
+        schematic.tree.insert(insert_pos, expr)
+        if schematic._sheet_instances_index is not None:
+            schematic._sheet_instances_index = insert_pos + 1
+        _index_new_nodes(schematic, (expr,), old_state)
+        return insert_pos
+
+    @staticmethod
+    def _splice(schematic: Schematic, exprs: list) -> int:
+        """Insert several top-level expressions before sheet_instances in one go
+
+        Resolves the insertion index once and does a single slice assignment
+        instead of one scan and one list.insert per expression.
+
+        Returns:
+            Index of the first inserted expression
+        """
+        old_state = _tree_state(schematic)
+        insert_pos = _get_sheet_instances_idx(schematic)
+        schematic.tree[insert_pos:insert_pos] = exprs
+        if schematic._sheet_instances_index is not None:
+            schematic._sheet_instances_index = insert_pos + len(exprs)
+        _index_new_nodes(schematic, exprs, old_state)
+        return insert_pos
 
     @staticmethod
     def add_connection(schematic: Schematic, source_ref: str, source_pin: str, target_ref: str, target_pin: str):
@@ -139,7 +397,8 @@ class ConnectionManager:
         # A common approach is to add wires between graphical points and then
         # add net labels to define the net name.
 
-        print(f"Attempted to add connection between {source_ref}/{source_pin} and {target_ref}/{target_pin}. This requires advanced implementation.")
+        logger.warning("Attempted to add connection between %s/%s and %s/%s. This requires advanced implementation.",
+                       source_ref, source_pin, target_ref, target_pin)
         return False # Indicate not fully implemented yet
 
     @staticmethod
@@ -150,19 +409,70 @@ class ConnectionManager:
         # This method would need to identify the relevant graphical elements
         # based on a connection identifier (which we would need to define).
         # This is also an advanced implementation task.
-        print(f"Attempted to remove connection with ID {connection_id}. This requires advanced implementation.")
+        logger.warning("Attempted to remove connection with ID %s. This requires advanced implementation.", connection_id)
         return False # Indicate not fully implemented yet
 
     @staticmethod
     def get_net_connections(schematic: Schematic, net_name: str):
-        """Get all connections in a named net"""
-        # kicad-skip represents nets implicitly through connected wires and net labels.
-        # To get connections for a net, we would need to iterate through wires
-        # and net labels to build a list of connected pins/points.
-        # This requires traversing the schematic's graphical elements and understanding
-        # how they form nets. This is an advanced implementation task.
-        print(f"Attempted to get connections for net '{net_name}'. This requires advanced implementation.")
-        return [] # Return empty list for now
+        """Get the labels and wires that make up a named net
+
+        Starts from every label (of any kind) named net_name and follows wires
+        that share an endpoint, transitively. Wires touching another wire
+        mid-segment (T-junctions) are not followed.
+
+        Returns:
+            List of dicts, labels first, then wires in discovery order
+        """
+        if not isinstance(getattr(schematic, 'tree', None), list):
+            raise TypeError("get_net_connections: schematic has no S-expression tree")
+
+        index = _get_kind_index(schematic)
+        connections = []
+        frontier = []
+        for kind in ('label', 'global_label', 'hierarchical_label'):
+            for label in index[kind]:
+                if len(label) < 3 or label[1] != net_name:
+                    continue
+                at = _find_child(label, _SYM_AT)
+                if at is None or len(at) < 3:
+                    continue
+                connections.append({
+                    "type": kind,
+                    "text": net_name,
+                    "position": [at[1], at[2]],
+                    "uuid": _node_uuid(label)
+                })
+                frontier.append(_point_key(at[1], at[2]))
+
+        grid = _get_endpoint_grid(schematic)
+        seen_points = set(frontier)
+        seen_wires = set()
+        while frontier:
+            key = frontier.pop()
+            for wire, (start, end) in grid.get(key, ()):
+                if id(wire) in seen_wires:
+                    continue
+                seen_wires.add(id(wire))
+                connections.append({
+                    "type": "wire",
+                    "start": list(start),
+                    "end": list(end),
+                    "uuid": _node_uuid(wire)
+                })
+                for point in (start, end):
+                    point_key = _point_key(*point)
+                    if point_key not in seen_points:
+                        seen_points.add(point_key)
+                        frontier.append(point_key)
+
+        return connections
+
+    @staticmethod
+    def wires_at(schematic: Schematic, x: float, y: float) -> list:
+        """Return the wires with an endpoint at (x, y), to within 0.01 units"""
+        if not isinstance(getattr(schematic, 'tree', None), list):
+            raise TypeError("wires_at: schematic has no S-expression tree")
+        return [wire for wire, _ in _get_endpoint_grid(schematic).get(_point_key(x, y), ())]
 
     @staticmethod
     def create_voltage_divider_circuit(schematic, params):
@@ -177,13 +487,12 @@ class ConnectionManager:
                 - position_y: float (center Y position, e.g., 80)
                 - r_upper: Optional[float] (upper resistor value in kΩ, default: 10)
                 - r_lower: Optional[float] (lower resistor value in kΩ, calculated if not provided)
+                - verbose: Optional[bool] (include per-step "results", default: True)
 
         Returns:
             dict: Result with success status and details
         """
         try:
-            from component_schematic import ComponentManager
-
             # Extract parameters
             v_in = params.get('input_voltage', 5)
             v_out = params.get('output_voltage', 3)
@@ -192,77 +501,52 @@ class ConnectionManager:
             r_upper = params.get('r_upper', 10)  # kΩ
 
             # Calculate lower resistor value
-            # V_out = V_in * R_lower / (R_upper + R_lower)
-            # R_lower = (V_out * R_upper) / (V_in - V_out)
             r_lower = params.get('r_lower')
             if r_lower is None:
-                r_lower = (v_out * r_upper) / (v_in - v_out)
+                r_lower = _calc_r_lower(v_in, v_out, r_upper)
 
-            # Component positions
-            vcc_x, vcc_y = pos_x, pos_y - 20
-            r4_x, r4_y = pos_x, pos_y
-            r5_x, r5_y = pos_x, pos_y + 20
-            gnd_x, gnd_y = pos_x, pos_y + 40
-            output_x, output_y = pos_x + 15, pos_y + 10
+            # Component, wire and label positions
+            symbols, wires, labels = _vdiv_geometry(pos_x, pos_y)
+            (vcc_x, vcc_y), (r4_x, r4_y), (r5_x, r5_y), (gnd_x, gnd_y) = symbols
+            vcc_ref, r4_ref, r5_ref, gnd_ref = _vdiv_refs(int(pos_x), int(pos_y))
 
-            results = []
+            # Bit i of status is set once symbol step i (see step_names below) succeeded
+            status = 0
 
             # Add VCC power symbol
-            success_vcc = ComponentManager.add_component_sexpr(
-                schematic, "power:+5V", f"#PWR_VCC_{int(pos_x)}_{int(pos_y)}",
+            status |= bool(ComponentManager.add_component_sexpr(
+                schematic, "power:+5V", vcc_ref,
                 f"+{v_in}V", vcc_x, vcc_y, 0, "", ""
-            )
-            results.append(("VCC power symbol", success_vcc))
+            ))
 
             # Add upper resistor (R4)
-            success_r4 = ComponentManager.add_component_sexpr(
-                schematic, "Device:R", f"R_upper_{int(pos_x)}_{int(pos_y)}",
+            status |= bool(ComponentManager.add_component_sexpr(
+                schematic, "Device:R", r4_ref,
                 f"{r_upper}k", r4_x, r4_y, 90, "Resistor_SMD:R_0603_1608Metric", ""
-            )
-            results.append((f"Upper resistor ({r_upper}k)", success_r4))
+            )) << 1
 
             # Add lower resistor (R5)
-            success_r5 = ComponentManager.add_component_sexpr(
-                schematic, "Device:R", f"R_lower_{int(pos_x)}_{int(pos_y)}",
+            status |= bool(ComponentManager.add_component_sexpr(
+                schematic, "Device:R", r5_ref,
                 f"{r_lower:.1f}k", r5_x, r5_y, 90, "Resistor_SMD:R_0603_1608Metric", ""
-            )
-            results.append((f"Lower resistor ({r_lower:.1f}k)", success_r5))
+            )) << 2
 
             # Add GND power symbol
-            success_gnd = ComponentManager.add_component_sexpr(
-                schematic, "power:GND", f"#PWR_GND_{int(pos_x)}_{int(pos_y)}",
+            status |= bool(ComponentManager.add_component_sexpr(
+                schematic, "power:GND", gnd_ref,
                 "GND", gnd_x, gnd_y, 0, "", ""
-            )
-            results.append(("GND power symbol", success_gnd))
-
-            # Add wires
-            wire1 = ConnectionManager.add_wire(schematic, [vcc_x, vcc_y], [r4_x, r4_y - 5])
-            results.append(("Wire VCC→R_upper", wire1 is not None))
-
-            wire2 = ConnectionManager.add_wire(schematic, [r4_x, r4_y + 5], [r5_x, r5_y - 5])
-            results.append(("Wire R_upper→R_lower", wire2 is not None))
-
-            wire3 = ConnectionManager.add_wire(schematic, [r5_x, r5_y + 5], [gnd_x, gnd_y])
-            results.append(("Wire R_lower→GND", wire3 is not None))
-
-            wire4 = ConnectionManager.add_wire(schematic, [r4_x, r4_y + 5], [output_x, output_y])
-            results.append(("Output tap wire", wire4 is not None))
-
-            # Add labels
-            label1 = ConnectionManager.add_label(schematic, "VCC", vcc_x + 5, vcc_y, "label")
-            results.append(("VCC label", label1 is not None))
-
-            label2 = ConnectionManager.add_label(schematic, "VOUT", output_x + 5, output_y, "label")
-            results.append(("VOUT label", label2 is not None))
-
-            label3 = ConnectionManager.add_label(schematic, "GND", gnd_x + 5, gnd_y, "label")
-            results.append(("GND label", label3 is not None))
-
-            # Check all succeeded
-            all_success = all(success for _, success in results)
-
-            return {
-                "success": all_success,
+            )) << 3
+
+            # Build wires and labels, then splice them into the tree at once.
+            # These raise on failure rather than returning a status, so a
+            # wire or label that can't be added ends up in the except below.
+            nodes = [ConnectionManager.add_wire(schematic, start, end, insert=False) for start, end in wires]
+            nodes.extend(ConnectionManager.add_label(schematic, text, x, y, "label", insert=False)
+                         for text, x, y in labels)
+            ConnectionManager._splice(schematic, nodes)
+
+            result = {
+                "success": status == 0b1111,
                 "circuit_type": "voltage_divider",
                 "details": {
                     "input_voltage": v_in,
@@ -271,14 +555,20 @@ class ConnectionManager:
                     "r_upper": r_upper,
                     "r_lower": round(r_lower, 1),
                     "position": {"x": pos_x, "y": pos_y}
-                },
-                "results": [{"component": name, "success": success} for name, success in results]
+                }
             }
+            if params.get('verbose', True):
+                step_names = ["VCC power symbol", f"Upper resistor ({r_upper}k)",
+                              f"Lower resistor ({r_lower:.1f}k)", "GND power symbol"]
+                results = [{"component": name, "success": bool(status >> i & 1)}
+                           for i, name in enumerate(step_names)]
+                results.extend({"component": entry[0], "success": node is not None}
+                               for entry, node in zip(_VDIV_WIRES + _VDIV_LABELS, nodes))
+                result["results"] = results
+            return result
 
         except Exception as e:
-            print(f"Error creating voltage divider circuit: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error creating voltage divider circuit: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -296,8 +586,11 @@ if __name__ == '__main__':
     wire1 = ConnectionManager.add_wire(test_sch, [100, 100], [200, 100])
     wire2 = ConnectionManager.add_wire(test_sch, [200, 100], [200, 200])
 
-    # Note: add_connection, remove_connection, get_net_connections are placeholders
-    # and require more complex implementation based on kicad-skip's structure.
+    # Note: add_connection and remove_connection are placeholders and require
+    # more complex implementation based on kicad-skip's structure.
+
+    # Labels and wires reachable from a net label
+    net = ConnectionManager.get_net_connections(test_sch, "Net_01")
 
     # Example of how you might add a net label (requires finding a point on a wire)
     # from skip import Label
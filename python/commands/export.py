@@ -96,14 +96,15 @@ class ExportCommands:
                     ]
 
                     try:
-                        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+                        result = subprocess.run(cmd, stdout=subprocess.DEVNULL,
+                                                stderr=subprocess.PIPE, timeout=60)
                         if result.returncode == 0:
                             # Get list of generated drill files
                             for file in os.listdir(output_dir):
                                 if file.endswith((".drl", ".cnc")):
                                     drill_files.append(file)
                         else:
-                            logger.warning(f"Drill file generation failed: {result.stderr}")
+                            logger.warning(f"Drill file generation failed: {result.stderr.decode('utf-8', errors='replace')}")
                     except Exception as drill_error:
                         logger.warning(f"Could not generate drill files: {str(drill_error)}")
                 else:
@@ -405,17 +406,18 @@ class ExportCommands:
 
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 timeout=300  # 5 minute timeout for 3D export
             )
 
             if result.returncode != 0:
-                logger.error(f"3D export command failed: {result.stderr}")
+                stderr = result.stderr.decode('utf-8', errors='replace')
+                logger.error(f"3D export command failed: {stderr}")
                 return {
                     "success": False,
                     "message": "3D export command failed",
-                    "errorDetails": result.stderr
+                    "errorDetails": stderr
                 }
 
             return {
@@ -4,6 +4,17 @@ import os
 class SchematicManager:
     """Core schematic operations using kicad-skip"""
 
+    @staticmethod
+    def _require_tree(sch):
+        """Check that a freshly created/loaded schematic carries its S-expression tree
+
+        The tree-editing helpers (ComponentManager, ConnectionManager) rely on
+        schematics coming from here having one and don't re-check per insert.
+        """
+        if not isinstance(getattr(sch, 'tree', None), list):
+            raise TypeError("Schematic has no S-expression tree")
+        return sch
+
     @staticmethod
     def create_schematic(name, metadata=None):
         """Create a new empty schematic"""
@@ -18,7 +29,7 @@ class SchematicManager:
             f.write("(kicad_sch (version 20230121) (generator \"KiCAD-MCP-Server\"))\n")
         
         # Now load it
-        sch = Schematic(temp_path)
+        sch = SchematicManager._require_tree(Schematic(temp_path))
         sch.version = "20230121"  # Set appropriate version
         sch.generator = "KiCAD-MCP-Server"
         
@@ -43,7 +54,7 @@ class SchematicManager:
             print(f"Error: Schematic file not found at {file_path}")
             return None
         try:
-            sch = Schematic(file_path)
+            sch = SchematicManager._require_tree(Schematic(file_path))
             print(f"Loaded schematic from: {file_path}")
             return sch
         except Exception as e:
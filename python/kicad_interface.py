@@ -5,22 +5,51 @@ KiCAD Python Interface Script for Model Context Protocol
 This script handles communication between the MCP TypeScript server
 and KiCAD's Python API (pcbnew). It receives commands via stdin as
 JSON and returns responses via stdout also as JSON.
+
+Besides single messages, the legacy format accepts a batch: a JSON array
+of command objects, executed in order, answered with one array of results
+in the same order::
+
+    [{"command": "add_schematic_wire", "params": {...}},
+     {"command": "add_schematic_label", "params": {...}}]
+
+A failing command does not stop the batch; its slot holds the usual
+{"success": false, ...} result. Commands that switch the active board
+(create_project, open_project) take effect for the rest of the batch.
 """
 
 import sys
+import atexit
+import bisect
+import io
 import json
+import threading
 import traceback
 import logging
+import mmap
 import os
-from typing import Dict, Any, Optional
+import re
+import reprlib
+import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, wraps
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, Any
 
 # Import tool schemas and resource definitions
 from schemas.tool_schemas import TOOL_SCHEMAS
 from resources.resource_definitions import RESOURCE_DEFINITIONS, handle_resource_read
 
+# Per-user state (logs, caches) lives under ~/.kicad-mcp
+KICAD_MCP_DIR = os.path.join(os.path.expanduser('~'), '.kicad-mcp')
+
 # Configure logging
-log_dir = os.path.join(os.path.expanduser('~'), '.kicad-mcp', 'logs')
-os.makedirs(log_dir, exist_ok=True)
+log_dir = os.path.join(KICAD_MCP_DIR, 'logs')
+if not os.path.isdir(log_dir):
+    os.makedirs(log_dir, exist_ok=True)
 log_file = os.path.join(log_dir, 'kicad_interface.log')
 
 logging.basicConfig(
@@ -33,41 +62,304 @@ logging.basicConfig(
 )
 logger = logging.getLogger('kicad_interface')
 
+# KICAD_MCP_DEBUG=1: include tracebacks when handlers log errors they
+# return to the client. Formatting one walks every frame and reads source
+# lines, which adds up when a client keeps sending bad calls.
+_DEBUG = os.environ.get('KICAD_MCP_DEBUG') == '1'
+
+# JSON encoding/decoding: orjson when installed, stdlib json otherwise (e.g. on
+# KiCAD's bundled Python). Output stays plain ASCII either way: the TypeScript
+# side decodes stdout chunk by chunk, which would split multi-byte characters.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    # NumPy scalars/arrays (e.g. from auto-placement) serialize natively
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def _json_bytes(obj) -> bytes:
+        """Serialize obj to ASCII JSON bytes"""
+        try:
+            data = orjson.dumps(obj, option=_ORJSON_OPTIONS)
+            if data.isascii():
+                return data
+        except TypeError:
+            # orjson is stricter than json (e.g. integers beyond 64 bits)
+            pass
+        return json.dumps(obj).encode('ascii')
+else:
+    _json_loads = json.loads
+
+    def _json_bytes(obj) -> bytes:
+        """Serialize obj to ASCII JSON bytes"""
+        return json.dumps(obj).encode('ascii')
+
+
+def _json_dumps(obj) -> str:
+    """Serialize obj to an ASCII JSON string"""
+    return _json_bytes(obj).decode('ascii')
+
+
+# Bounded repr for logging request/response payloads, which can be large
+_REPR = reprlib.Repr()
+_REPR.maxstring = 200
+_REPR.maxother = 200
+_REPR.maxlist = 20
+_REPR.maxdict = 20
+_REPR.maxlevel = 3
+
+
+class _SafeRepr:
+    """Log argument that renders obj truncated, and only if the record is emitted"""
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self):
+        return _REPR.repr(self.obj)
+
+
+# Message framing on stdin/stdout. Two forms are accepted, per message:
+#   * one JSON document per line (what the TypeScript server sends today)
+#   * LSP-style: "Content-Length: N\r\n", optional further headers, a blank
+#     line, then exactly N bytes of JSON
+# A response uses the same framing as the request it answers.
+_CONTENT_LENGTH = b'content-length:'
+_STDIN_BUFFER_SIZE = 65536
+
+# Per-thread scratch buffer for outgoing messages; bigger ones are written
+# directly rather than keeping a large buffer alive
+_scratch = threading.local()
+_SCRATCH_MAX = 1 << 20
+
+# Keeps whole messages together when tool calls run on worker threads
+_stdout_lock = threading.Lock()
+
+
+def _send_response(obj, framed: bool = False):
+    """Write obj to stdout as JSON (one line, or Content-Length framed) and flush
+
+    obj may also be a message already encoded to ASCII JSON bytes.
+    """
+    out = sys.stdout
+    buffer = getattr(out, 'buffer', None)
+    if buffer is None:
+        text = (obj.decode('ascii') if isinstance(obj, bytes) else _json_dumps(obj)) + '\n'
+        with _stdout_lock:
+            out.write(text)
+            out.flush()
+        return
+    payload = obj if isinstance(obj, bytes) else _json_bytes(obj)
+    if framed:
+        head, tail = b'Content-Length: %d\r\n\r\n' % len(payload), b''
+    else:
+        head, tail = b'', b'\n'
+    size = len(head) + len(payload) + len(tail)
+    if size > _SCRATCH_MAX:
+        message = head + payload + tail
+        with _stdout_lock:
+            # Flush pending text-mode output first so nothing interleaves
+            out.flush()
+            buffer.write(message)
+            buffer.flush()
+    else:
+        # Assemble the message in this thread's reusable buffer: one write,
+        # no fresh concatenation per response
+        scratch = getattr(_scratch, 'buf', None)
+        if scratch is None or len(scratch) < size:
+            # Grows by doubling, but never past _SCRATCH_MAX (size is at most that)
+            capacity = max(size, 2 * len(scratch or b''), 4096)
+            scratch = _scratch.buf = bytearray(min(capacity, _SCRATCH_MAX))
+        end = len(head) + len(payload)
+        # Same-length slice assignments: the bytearray is never resized
+        scratch[:len(head)] = head
+        scratch[len(head):end] = payload
+        scratch[end:size] = tail
+        with memoryview(scratch) as view, _stdout_lock:
+            out.flush()
+            buffer.write(view[:size])
+            buffer.flush()
+
+
+def _iter_json_chunks(obj):
+    """Yield the JSON encoding of dict obj in pieces, one per element of
+    each top-level list value, so the whole document is never held at once"""
+    sep = b'{'
+    for key, value in obj.items():
+        yield sep + _json_bytes(str(key)) + b':'
+        sep = b','
+        if isinstance(value, list):
+            item_sep = b'['
+            for item in value:
+                yield item_sep + _json_bytes(item)
+                item_sep = b','
+            yield b'[]' if item_sep == b'[' else b']'
+        else:
+            yield _json_bytes(value)
+    yield b'{}' if sep == b'{' else b'}'
+
+
+def _send_streamed_response(obj, framed: bool = False):
+    """Like _send_response, but writes a dict's top-level lists item by item
+
+    Framed responses need their length up front, so they are assembled in
+    memory first; unframed ones go straight to stdout.
+    """
+    out = sys.stdout
+    buffer = getattr(out, 'buffer', None)
+    if buffer is None or not isinstance(obj, dict):
+        _send_response(obj, framed)
+        return
+    with _stdout_lock:
+        out.flush()
+        if framed:
+            payload = io.BytesIO()
+            for chunk in _iter_json_chunks(obj):
+                payload.write(chunk)
+            buffer.write(b'Content-Length: %d\r\n\r\n' % payload.tell())
+            buffer.write(payload.getbuffer())
+        else:
+            for chunk in _iter_json_chunks(obj):
+                buffer.write(chunk)
+            buffer.write(b'\n')
+        buffer.flush()
+
+
+def _open_stdin():
+    """Binary reader over stdin with a pipe-sized buffer
+
+    Must be called before anything else reads stdin: it reads the raw file
+    underneath sys.stdin, bypassing sys.stdin's own buffers.
+    """
+    buffer = getattr(sys.stdin, 'buffer', None)
+    if buffer is None:
+        # Text-only stream (e.g. a replaced sys.stdin); re-encode it
+        return io.BytesIO(sys.stdin.read().encode('utf-8'))
+    raw = getattr(buffer, 'raw', None)
+    if raw is None:
+        return buffer
+    return io.BufferedReader(raw, buffer_size=_STDIN_BUFFER_SIZE)
+
+
+def _read_messages(reader):
+    """Yield (payload_bytes, framed) for each message read from reader until EOF"""
+    while True:
+        line = reader.readline()
+        if not line:
+            return
+        if line[:15].lower() != _CONTENT_LENGTH:
+            yield line, False
+            continue
+
+        try:
+            length = int(line[15:].strip())
+        except ValueError:
+            length = -1
+        # Skip any further headers up to the blank separator line
+        while True:
+            header = reader.readline()
+            if not header or not header.strip():
+                break
+        if length < 0:
+            yield line, True  # reported as invalid JSON
+            continue
+        payload = reader.read(length)
+        if len(payload) < length:
+            return
+        yield payload, True
+
 # Log Python environment details
-logger.info(f"Python version: {sys.version}")
-logger.info(f"Python executable: {sys.executable}")
-logger.info(f"Platform: {sys.platform}")
-logger.info(f"Working directory: {os.getcwd()}")
+logger.info("Python version: %s", sys.version)
+logger.info("Python executable: %s", sys.executable)
+logger.info("Platform: %s", sys.platform)
+logger.info("Working directory: %s", os.getcwd())
+
+# Windows KiCAD install probe, cached between launches (stat calls are slow
+# on Windows). Delete the cache file or set KICAD_RESCAN=1 to force a rescan.
+_KICAD_PATHS_CACHE = os.path.join(KICAD_MCP_DIR, 'cache', 'paths.json')
+_KICAD_PATHS_TTL = 7 * 24 * 3600  # one week
+
+
+def _scan_kicad_paths():
+    """Probe the standard KiCAD install locations
+
+    Returns {base_path: {"versions": {version: python_path_exists}}}, with
+    {"error": message} instead of "versions" if a base could not be listed.
+    """
+    installs = {}
+    for base_path in (r"C:\Program Files\KiCad", r"C:\Program Files (x86)\KiCad"):
+        if not os.path.exists(base_path):
+            continue
+        try:
+            # DirEntry.is_dir() comes from the directory listing itself, no stat per child
+            with os.scandir(base_path) as entries:
+                versions = [e.name for e in entries if e.is_dir()]
+            installs[base_path] = {"versions": {
+                version: os.path.exists(os.path.join(base_path, version, 'lib', 'python3', 'dist-packages'))
+                for version in versions
+            }}
+        except Exception as e:
+            installs[base_path] = {"error": str(e)}
+    return installs
+
+
+def _detect_kicad_paths():
+    """Return the KiCAD install probe, from the cache when it is fresh"""
+    if os.environ.get("KICAD_RESCAN") != "1":
+        try:
+            with open(_KICAD_PATHS_CACHE, 'rb') as f:
+                cached = _json_loads(f.read())
+            if time.time() - cached["scanned_at"] < _KICAD_PATHS_TTL:
+                return cached["installs"]
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+
+    installs = _scan_kicad_paths()
+    if not installs:
+        # Nothing installed yet: rescanning is cheap, and a fresh install
+        # must not be hidden for a week
+        return installs
+    try:
+        os.makedirs(os.path.dirname(_KICAD_PATHS_CACHE), exist_ok=True)
+        tmp_path = _KICAD_PATHS_CACHE + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_bytes({"scanned_at": time.time(), "installs": installs}))
+        os.replace(tmp_path, _KICAD_PATHS_CACHE)
+    except OSError as e:
+        logger.debug("Could not write KiCAD path cache: %s", e)
+    return installs
+
 
 # Windows-specific diagnostics
 if sys.platform == 'win32':
     logger.info("=== Windows Environment Diagnostics ===")
-    logger.info(f"PYTHONPATH: {os.environ.get('PYTHONPATH', 'NOT SET')}")
-    logger.info(f"PATH: {os.environ.get('PATH', 'NOT SET')[:200]}...")  # Truncate PATH
+    logger.info("PYTHONPATH: %s", os.environ.get('PYTHONPATH', 'NOT SET'))
+    logger.info("PATH: %.200s...", os.environ.get('PATH', 'NOT SET'))  # Truncate PATH
 
     # Check for common KiCAD installations
-    common_kicad_paths = [
-        r"C:\Program Files\KiCad",
-        r"C:\Program Files (x86)\KiCad"
-    ]
-
+    log_details = logger.isEnabledFor(logging.INFO)
     found_kicad = False
-    for base_path in common_kicad_paths:
-        if os.path.exists(base_path):
-            logger.info(f"Found KiCAD installation at: {base_path}")
-            # List versions
-            try:
-                versions = [d for d in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, d))]
-                logger.info(f"  Versions found: {', '.join(versions)}")
-                for version in versions:
-                    python_path = os.path.join(base_path, version, 'lib', 'python3', 'dist-packages')
-                    if os.path.exists(python_path):
-                        logger.info(f"  ✓ Python path exists: {python_path}")
-                        found_kicad = True
-                    else:
-                        logger.warning(f"  ✗ Python path missing: {python_path}")
-            except Exception as e:
-                logger.warning(f"  Could not list versions: {e}")
+    for base_path, install in _detect_kicad_paths().items():
+        if log_details:
+            logger.info("Found KiCAD installation at: %s", base_path)
+        if "error" in install:
+            logger.warning("  Could not list versions: %s", install["error"])
+            continue
+        versions = install["versions"]
+        if log_details:
+            logger.info("  Versions found: %s", ', '.join(versions))
+        for version, exists in versions.items():
+            python_path = os.path.join(base_path, version, 'lib', 'python3', 'dist-packages')
+            if exists:
+                if log_details:
+                    logger.info("  ✓ Python path exists: %s", python_path)
+                found_kicad = True
+            else:
+                logger.warning("  ✗ Python path missing: %s", python_path)
 
     if not found_kicad:
         logger.warning("No KiCAD installations found in standard locations!")
@@ -84,7 +376,7 @@ if utils_dir not in sys.path:
 from utils.platform_helper import PlatformHelper
 from utils.kicad_process import check_and_launch_kicad, KiCADProcessManager
 
-logger.info(f"Detecting KiCAD Python paths for {PlatformHelper.get_platform_name()}...")
+logger.info("Detecting KiCAD Python paths for %s...", PlatformHelper.get_platform_name())
 paths_added = PlatformHelper.add_kicad_to_python_path()
 
 if paths_added:
@@ -92,22 +384,47 @@ if paths_added:
 else:
     logger.warning("No KiCAD Python paths found - attempting to import pcbnew from system path")
 
-logger.info(f"Current Python path: {sys.path}")
+logger.info("Current Python path: %s", sys.path)
 
 # Check if auto-launch is enabled
 AUTO_LAUNCH_KICAD = os.environ.get("KICAD_AUTO_LAUNCH", "false").lower() == "true"
 if AUTO_LAUNCH_KICAD:
     logger.info("KiCAD auto-launch enabled")
 
+# Last check_and_launch_kicad() call as (time, path, auto_launch, result);
+# clients poll launch_kicad_ui while KiCAD starts up, and each call looks
+# for the binary and walks the process table
+_LAUNCH_CACHE_TTL = 2.0
+_last_launch = (float('-inf'), None, None, None)
+
+# Last process table scan for check_kicad_ui as (time, running, processes)
+_CHECK_CACHE_TTL = 0.5
+_last_check = (float('-inf'), False, [])
+
+# Coalesce schematic saves: edits within this many milliseconds of each
+# other are written out together (0: save after every edit)
+try:
+    SAVE_DELAY = max(0.0, float(os.environ.get("KICAD_MCP_SAVE_DELAY_MS", "0"))) / 1000
+except ValueError:
+    logger.warning("Ignoring invalid KICAD_MCP_SAVE_DELAY_MS: %s", os.environ.get("KICAD_MCP_SAVE_DELAY_MS"))
+    SAVE_DELAY = 0.0
+
+# Worker threads for JSON-RPC tools/call (0: handle every message in order)
+try:
+    TOOL_WORKERS = max(0, int(os.environ.get("KICAD_MCP_WORKERS", "0")))
+except ValueError:
+    logger.warning("Ignoring invalid KICAD_MCP_WORKERS: %s", os.environ.get("KICAD_MCP_WORKERS"))
+    TOOL_WORKERS = 0
+
 # Import KiCAD's Python API
 try:
     logger.info("Attempting to import pcbnew module...")
     import pcbnew  # type: ignore
-    logger.info(f"Successfully imported pcbnew module from: {pcbnew.__file__}")
-    logger.info(f"pcbnew version: {pcbnew.GetBuildVersion()}")
+    logger.info("Successfully imported pcbnew module from: %s", pcbnew.__file__)
+    logger.info("pcbnew version: %s", pcbnew.GetBuildVersion())
 except ImportError as e:
-    logger.error(f"Failed to import pcbnew module: {e}")
-    logger.error(f"Current sys.path: {sys.path}")
+    logger.error("Failed to import pcbnew module: %s", e)
+    logger.error("Current sys.path: %s", sys.path)
 
     # Platform-specific help message
     help_message = ""
@@ -143,48 +460,617 @@ Linux Troubleshooting:
         "message": "Failed to import pcbnew module - KiCAD Python API not found",
         "errorDetails": f"Error: {str(e)}\n\n{help_message}\n\nPython sys.path:\n{chr(10).join(sys.path)}"
     }
-    print(json.dumps(error_response))
+    _send_response(error_response)
     sys.exit(1)
 except Exception as e:
-    logger.error(f"Unexpected error importing pcbnew: {e}")
+    logger.error("Unexpected error importing pcbnew: %s", e)
     logger.error(traceback.format_exc())
     error_response = {
         "success": False,
         "message": "Error importing pcbnew module",
         "errorDetails": str(e)
     }
-    print(json.dumps(error_response))
+    _send_response(error_response)
     sys.exit(1)
 
 # Import command handlers
 try:
     logger.info("Importing command handlers...")
-    from commands.project import ProjectCommands
-    from commands.board import BoardCommands
-    from commands.component import ComponentCommands
-    from commands.routing import RoutingCommands
-    from commands.design_rules import DesignRuleCommands
-    from commands.export import ExportCommands
+    # Board-side handlers are imported on first use, see KiCADInterface
     from commands.schematic import SchematicManager
     from commands.component_schematic import ComponentManager
     from commands.connection_schematic import ConnectionManager
     from commands.library_schematic import LibraryManager as SchematicLibraryManager
-    from commands.library import LibraryManager as FootprintLibraryManager, LibraryCommands
     from skip import Schematic  # Import Schematic class for wire operations
     logger.info("Successfully imported all command handlers")
 except ImportError as e:
-    logger.error(f"Failed to import command handlers: {e}")
+    logger.error("Failed to import command handlers: %s", e)
     error_response = {
         "success": False,
         "message": "Failed to import command handlers",
         "errorDetails": str(e)
     }
-    print(json.dumps(error_response))
+    _send_response(error_response)
     sys.exit(1)
 
+# Parsed schematics (skip.Schematic objects, whichever loader produced them)
+# keyed by absolute path. Each entry holds the (st_mtime_ns, st_size) it was
+# parsed at, so edits made by anything else (including the text-based delete
+# handlers) simply miss the cache.
+_SCHEMATIC_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_MAX_CACHED = 8
+
+
+def _load_cached(path, loader=None, take=False, fresh=True):
+    """Load a schematic, reusing a previous parse if the file is unchanged.
+
+    Handlers that modify the schematic pass take=True: the entry is removed
+    from the cache so a failed edit can never leak into later reads.
+
+    Inside a batch (see begin_batch) the batch's in-memory schematic is
+    returned instead. Callers that only append to the tree pass fresh=False;
+    anything else gets pending symbol additions written out and re-parsed
+    first, since kicad-skip's symbol views don't see spliced symbols.
+    """
+    if loader is None:
+        loader = SchematicManager.load_schematic
+    key = os.path.abspath(path)
+    batch = _OPEN_BATCHES.get(key)
+    if batch is not None:
+        if fresh and batch.stale:
+            _flush_batch(key, batch)
+        if batch.schematic is None:
+            batch.schematic = loader(path)
+        return batch.schematic
+    try:
+        st = os.stat(key)
+    except OSError:
+        _SCHEMATIC_CACHE.pop(key, None)
+        return loader(path)
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    entry = _SCHEMATIC_CACHE.get(key)
+    if entry is not None and entry[0] == stamp:
+        if take:
+            del _SCHEMATIC_CACHE[key]
+        else:
+            _SCHEMATIC_CACHE.move_to_end(key)
+        return entry[1]
+
+    schematic = loader(path)
+    if take or not schematic:
+        _SCHEMATIC_CACHE.pop(key, None)
+        return schematic
+    _put_cached(key, stamp, schematic)
+    return schematic
+
+
+def _put_cached(key, stamp, schematic):
+    _SCHEMATIC_CACHE[key] = (stamp, schematic)
+    _SCHEMATIC_CACHE.move_to_end(key)
+    while len(_SCHEMATIC_CACHE) > _MAX_CACHED:
+        _SCHEMATIC_CACHE.popitem(last=False)
+
+
+def _evict_cached(path):
+    """Drop the cached parse of path after it has been written"""
+    _SCHEMATIC_CACHE.pop(os.path.abspath(path), None)
+
+
+def _keep_cached(path, schematic):
+    """Cache schematic as the current parse of path, which it was just saved to
+
+    Only for edits made on the tree (wires, labels): kicad-skip's own
+    collections don't see spliced nodes, but its symbol views, which is
+    what the cached readers use, are unaffected by them.
+    """
+    key = os.path.abspath(path)
+    if key in _OPEN_BATCHES:
+        return
+    try:
+        st = os.stat(key)
+    except OSError:
+        _SCHEMATIC_CACHE.pop(key, None)
+        return
+    _put_cached(key, (st.st_mtime_ns, st.st_size), schematic)
+
+
+# Deferred-save batches opened with begin_batch, keyed by absolute path.
+# While one is open, the schematic edit handlers work on the batch's
+# in-memory schematic and leave it unsaved; end_batch writes it once
+# (commit_batch writes it and keeps the batch open).
+# With SAVE_DELAY set, an edit outside a batch opens an automatic one that
+# is written out once no further edit arrives for SAVE_DELAY seconds.
+_OPEN_BATCHES = {}
+
+# Held while running a command, and by the timer that writes automatic
+# batches: the handlers and caches are not thread-safe
+_COMMAND_LOCK = threading.Lock()
+
+# Commands that know about batches. Any other command naming a batched
+# file gets the pending edits written out first.
+_BATCHED_COMMANDS = frozenset((
+    "begin_batch", "commit_batch", "end_batch",
+    "get_all_symbols", "get_symbol_properties",
+    "update_symbol_property", "update_symbol_properties",
+    "add_schematic_wire", "add_schematic_label",
+    "add_symbol", "add_symbol_auto", "add_symbols_auto", "add_symbol_relative", "add_symbol_group",
+    "add_wire", "add_label", "get_net_connections", "create_circuit", "flush_schematics",
+))
+
+# circuit_type values create_circuit can build
+_SUPPORTED_CIRCUITS = frozenset(("voltage_divider",))
+
+
+class _SchematicBatch:
+    __slots__ = ('schematic', 'dirty', 'stale', 'auto', 'timer')
+
+    def __init__(self, auto=False):
+        self.schematic = None
+        self.dirty = False  # edits not written to the file yet
+        self.stale = False  # symbols spliced in since the last parse
+        self.auto = auto  # opened by SAVE_DELAY rather than begin_batch
+        self.timer = None  # pending write of an automatic batch
+
+
+def _flush_batch(key, batch):
+    """Write a batch's pending edits to its file, via a temp file and os.replace
+
+    A stale parse is dropped afterwards so the next load re-reads the file.
+    Returns False, with the edits still pending, if the write failed.
+    """
+    if batch.dirty:
+        tmp_path = key + '.tmp'
+        try:
+            if not ComponentManager.save_schematic_with_tree(batch.schematic, tmp_path):
+                raise OSError(f"could not write {tmp_path}")
+            os.replace(tmp_path, key)
+        except OSError as e:
+            logger.error("Failed to write batched edits to %s: %s", key, e)
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        batch.dirty = False
+        _SCHEMATIC_CACHE.pop(key, None)
+    if batch.stale:
+        batch.schematic = None
+        batch.stale = False
+    return True
+
+
+def _close_batch(key, batch):
+    """Write out a batch and remove it; False if the write failed"""
+    if batch.timer is not None:
+        batch.timer.cancel()
+        batch.timer = None
+    if not _flush_batch(key, batch):
+        return False
+    if _OPEN_BATCHES.get(key) is batch:
+        del _OPEN_BATCHES[key]
+    return True
+
+
+def _close_auto_batches(keys=None):
+    """Write out the automatic batches (for keys, or all of them) now
+
+    Returns False if any of the writes failed.
+    """
+    ok = True
+    for key, batch in list(_OPEN_BATCHES.items()):
+        if batch.auto and (keys is None or key in keys):
+            if not _close_batch(key, batch):
+                logger.error("Failed to save schematic %s", key)
+                ok = False
+    return ok
+
+
+def _write_when_idle(key, batch):
+    """Timer callback: write out an automatic batch"""
+    with _COMMAND_LOCK:
+        if _OPEN_BATCHES.get(key) is batch and batch.timer is not None:
+            logger.debug("Writing coalesced edits to %s", key)
+            batch.timer = None
+            if not _close_batch(key, batch):
+                logger.error("Failed to save schematic %s", key)
+
+
+def _schedule_write(key, batch):
+    """(Re)start the idle timer of an automatic batch"""
+    if batch.timer is not None:
+        batch.timer.cancel()
+    batch.timer = threading.Timer(SAVE_DELAY, _write_when_idle, (key, batch))
+    batch.timer.daemon = True
+    batch.timer.start()
+
+
+@atexit.register
+def _write_open_batches():
+    """Don't lose edits still held in batches when the process exits"""
+    for key, batch in list(_OPEN_BATCHES.items()):
+        if batch.dirty and not _close_batch(key, batch):
+            logger.error("Failed to save schematic %s", key)
+
+
+def _save_edited(schematic, path, splices_symbols=False):
+    """Save an edited schematic, or leave it pending if it belongs to an open batch"""
+    key = os.path.abspath(path)
+    batch = _OPEN_BATCHES.get(key)
+    if batch is not None and batch.schematic is schematic:
+        batch.dirty = True
+        batch.stale = batch.stale or splices_symbols
+        if batch.auto:
+            _schedule_write(key, batch)
+        return True
+    # A batch's schematic edited into some other file no longer matches its
+    # own file (whose pending edits _sync_batches wrote out); re-read it
+    for other in _OPEN_BATCHES.values():
+        if other.schematic is schematic:
+            other.schematic = None
+    if SAVE_DELAY and batch is None:
+        batch = _OPEN_BATCHES[key] = _SchematicBatch(auto=True)
+        batch.schematic = schematic
+        batch.dirty = True
+        batch.stale = splices_symbols
+        _schedule_write(key, batch)
+        return True
+    return ComponentManager.save_schematic_with_tree(schematic, path)
+
+
+_MISSING = object()
+
+# Fields reported per symbol by get_all_symbols
+_SYMBOL_FIELDS = attrgetter('property.Reference.value', 'property.Value.value',
+                            'lib_id.value', 'property.Footprint.value', 'at')
+
+# One match per string literal or parenthesis; strings are matched whole so
+# parentheses inside them (e.g. a label "NET (a)") don't count
+_SEXPR_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[()]', re.S)
+_SEXPR_TAG = re.compile(rb'\s*([^\s()"]+)')
+_RE_REFERENCE = re.compile(rb'\(\s*property\s+"Reference"\s+"([^"]*)"')
+# Top-level forms removed by delete_all_wires
+_WIRING_TAGS = frozenset((b'wire', b'junction', b'label'))
+
+
+def _iter_toplevel_blocks(buf):
+    """Yield (tag, start, end) for each form directly inside the root form
+
+    buf is the raw schematic file. The scan is a single pass over it,
+    tracking paren depth outside string literals; buf[start:end] is the
+    form's text, from its "(" to its matching ")".
+    """
+    depth = 0
+    start = 0
+    for m in _SEXPR_TOKEN.finditer(buf):
+        char = buf[m.start()]
+        if char == 0x28:  # (
+            depth += 1
+            if depth == 2:
+                start = m.start()
+        elif char == 0x29:  # )
+            depth -= 1
+            if depth == 1:
+                tag = _SEXPR_TAG.match(buf, start + 1)
+                yield (tag.group(1) if tag else b''), start, m.end()
+
+# Most buffers one os.writev call accepts
+try:
+    _IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+
+def _write_chunks(f, chunks):
+    """Write a list of bytes-like chunks to the binary file f without joining them
+
+    Where os.writev exists the chunks go straight to the file descriptor,
+    up to _IOV_MAX of them per system call.
+    """
+    if not hasattr(os, 'writev'):  # Windows
+        f.writelines(chunks)
+        return
+    f.flush()
+    fd = f.fileno()
+    i = 0
+    while i < len(chunks):
+        written = os.writev(fd, chunks[i:i + _IOV_MAX])
+        # Skip what was written; a partial write resumes mid-chunk
+        while i < len(chunks) and written >= len(chunks[i]):
+            written -= len(chunks[i])
+            i += 1
+        if written:
+            chunks[i] = chunks[i][written:]
+
+
+def _write_without_spans(buf, spans, f):
+    """Write buf to the file f without the (start, end) spans, which must be in order
+
+    A span that is alone on its lines takes those whole lines with it, so
+    no blank lines are left behind. Returns the (start, end) ranges actually
+    cut, widened that way.
+    """
+    cuts = []
+    chunks = []
+    with memoryview(buf) as view:
+        pos = 0
+        for start, end in spans:
+            line_start = buf.rfind(b'\n', 0, start) + 1
+            if line_start >= pos and not buf[line_start:start].strip():
+                start = line_start
+            line_end = buf.find(b'\n', end)
+            if line_end == -1:
+                line_end = len(buf)
+            if not buf[end:line_end].strip():
+                end = min(line_end + 1, len(buf))
+            chunks.append(view[pos:start])
+            cuts.append((start, end))
+            pos = end
+        chunks.append(view[pos:])
+        try:
+            _write_chunks(f, chunks)
+        finally:
+            # Drop the slices so the view (and an mmap behind it) can be released
+            chunks.clear()
+    return cuts
+
+
+def _rewrite_without(file_path, save_path, find_spans):
+    """Copy a schematic to save_path minus the spans find_spans(content) returns
+
+    The file is memory-mapped rather than read, and the kept ranges go to a
+    temp file that then replaces save_path. Returns the ranges cut, as
+    _write_without_spans does.
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file, which mmap can't map
+            content = b''
+    tmp_path = save_path + '.tmp'
+    try:
+        spans = find_spans(content)
+        with open(tmp_path, 'wb') as f:
+            cuts = _write_without_spans(content, spans, f)
+    finally:
+        if isinstance(content, mmap.mmap):
+            content.close()
+    # The map must be closed first: Windows won't replace a mapped file
+    os.replace(tmp_path, save_path)
+    return cuts
+
+
+# Placed-symbol spans by Reference, per schematic file:
+# abspath -> ((st_mtime_ns, st_size), {reference: [(start, end), ...]}).
+# Multi-unit parts have one span per unit under the same reference.
+# Built on the first delete from a file and carried over to the file each
+# delete writes, so a run of deletes scans the file only once.
+_SYMBOL_SPANS = {}
+
+
+def _symbol_span_index(content):
+    """Map each placed symbol's Reference to its (start, end) spans in content
+
+    lib_symbols definitions are never included.
+    """
+    index = {}
+    for tag, start, end in _iter_toplevel_blocks(content):
+        if tag != b'symbol':
+            continue
+        m = _RE_REFERENCE.search(content, start, end)
+        if m is not None:
+            index.setdefault(m.group(1), []).append((start, end))
+    return index
+
+
+def _shift_spans(index, cuts):
+    """Move the spans in index to where they are after the cuts were removed"""
+    ends = [end for _, end in cuts]
+    removed = [0]
+    for start, end in cuts:
+        removed.append(removed[-1] + end - start)
+    shifted = {}
+    for ref, spans in index.items():
+        moved = []
+        for start, end in spans:
+            offset = removed[bisect.bisect_right(ends, start)]
+            moved.append((start - offset, end - offset))
+        shifted[ref] = moved
+    return shifted
+
+
+def _remember_spans(key, index):
+    """Store a span index for the file at key under its current stat"""
+    st = os.stat(key)
+    _SYMBOL_SPANS.pop(key, None)
+    if len(_SYMBOL_SPANS) >= _MAX_CACHED:
+        del _SYMBOL_SPANS[next(iter(_SYMBOL_SPANS))]
+    _SYMBOL_SPANS[key] = ((st.st_mtime_ns, st.st_size), index)
+
+
+def _delete_symbol_refs(file_path, save_path, refs):
+    """Copy a schematic to save_path without the placed symbols whose Reference is in refs
+
+    Returns the number of symbols deleted.
+    """
+    key = os.path.abspath(file_path)
+    st = os.stat(key)
+    cached = _SYMBOL_SPANS.pop(key, None)
+    index = cached[1] if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size) else None
+    refs = {str(ref).encode('utf-8') for ref in refs}
+
+    def find_spans(content):
+        nonlocal index
+        if index is None:
+            index = _symbol_span_index(content)
+        return sorted(span for ref in refs for span in index.get(ref, ()))
+
+    cuts = _rewrite_without(file_path, save_path, find_spans)
+
+    save_key = os.path.abspath(save_path)
+    if save_key != key:
+        _remember_spans(key, index)
+    kept = {ref: spans for ref, spans in index.items() if ref not in refs}
+    _remember_spans(save_key, _shift_spans(kept, cuts))
+    return len(cuts)
+
+
+def _export_schematic_pdf(schematic_path, output_path):
+    """Run kicad-cli to export one schematic to PDF"""
+    # stdout is only progress chatter; stderr is decoded only on failure
+    result = subprocess.run(
+        ["kicad-cli", "sch", "export", "pdf", "--output", output_path, schematic_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+
+    success = result.returncode == 0
+    message = result.stderr.decode('utf-8', errors='replace') if not success else ""
+
+    return {"success": success, "message": message}
+
+
+def _wiring_spans(content):
+    """Return the (start, end) spans of wire, junction and label forms"""
+    return [(start, end) for tag, start, end in _iter_toplevel_blocks(content)
+            if tag in _WIRING_TAGS]
+
+
+# Command name -> handler, as an attribute path on KiCADInterface. Resolved
+# once per instance into KiCADInterface.command_routes; paths through a
+# handler object are looked up per call so the handler is only created (and
+# its module imported) when one of its commands is first used.
+_ROUTES = (
+    # Project commands
+    ("create_project", "project_commands.create_project"),
+    ("open_project", "project_commands.open_project"),
+    ("save_project", "project_commands.save_project"),
+    ("get_project_info", "project_commands.get_project_info"),
+
+    # Board commands
+    ("set_board_size", "board_commands.set_board_size"),
+    ("add_layer", "board_commands.add_layer"),
+    ("set_active_layer", "board_commands.set_active_layer"),
+    ("get_board_info", "board_commands.get_board_info"),
+    ("get_layer_list", "board_commands.get_layer_list"),
+    ("get_board_2d_view", "board_commands.get_board_2d_view"),
+    ("add_board_outline", "board_commands.add_board_outline"),
+    ("add_mounting_hole", "board_commands.add_mounting_hole"),
+    ("add_text", "board_commands.add_text"),
+    ("add_board_text", "board_commands.add_text"),  # Alias for TypeScript tool
+
+    # Component commands
+    ("place_component", "component_commands.place_component"),
+    ("move_component", "component_commands.move_component"),
+    ("rotate_component", "component_commands.rotate_component"),
+    ("delete_component", "component_commands.delete_component"),
+    ("edit_component", "component_commands.edit_component"),
+    ("get_component_properties", "component_commands.get_component_properties"),
+    ("get_component_list", "component_commands.get_component_list"),
+    ("place_component_array", "component_commands.place_component_array"),
+    ("align_components", "component_commands.align_components"),
+    ("duplicate_component", "component_commands.duplicate_component"),
+
+    # Routing commands
+    ("add_net", "routing_commands.add_net"),
+    ("route_trace", "routing_commands.route_trace"),
+    ("add_via", "routing_commands.add_via"),
+    ("delete_trace", "routing_commands.delete_trace"),
+    ("get_nets_list", "routing_commands.get_nets_list"),
+    ("create_netclass", "routing_commands.create_netclass"),
+    ("add_copper_pour", "routing_commands.add_copper_pour"),
+    ("route_differential_pair", "routing_commands.route_differential_pair"),
+
+    # Design rule commands
+    ("set_design_rules", "design_rule_commands.set_design_rules"),
+    ("get_design_rules", "design_rule_commands.get_design_rules"),
+    ("run_drc", "design_rule_commands.run_drc"),
+    ("get_drc_violations", "design_rule_commands.get_drc_violations"),
+
+    # Export commands
+    ("export_gerber", "export_commands.export_gerber"),
+    ("export_pdf", "export_commands.export_pdf"),
+    ("export_svg", "export_commands.export_svg"),
+    ("export_3d", "export_commands.export_3d"),
+    ("export_bom", "export_commands.export_bom"),
+
+    # Library commands (footprint management)
+    ("list_libraries", "library_commands.list_libraries"),
+    ("search_footprints", "library_commands.search_footprints"),
+    ("list_library_footprints", "library_commands.list_library_footprints"),
+    ("get_footprint_info", "library_commands.get_footprint_info"),
+
+    # Schematic commands
+    ("create_schematic", "_handle_create_schematic"),
+    ("load_schematic", "_handle_load_schematic"),
+    ("get_all_symbols", "_handle_get_all_symbols"),
+    ("get_symbol_properties", "_handle_get_symbol_properties"),
+    ("update_symbol_property", "_handle_update_symbol_property"),
+    ("update_symbol_properties", "_handle_update_symbol_properties"),
+    ("clear_schematic_cache", "_handle_clear_schematic_cache"),
+    ("begin_batch", "_handle_begin_batch"),
+    ("commit_batch", "_handle_commit_batch"),
+    ("end_batch", "_handle_end_batch"),
+    ("flush_schematics", "_handle_flush_schematics"),
+    ("add_schematic_component", "_handle_add_schematic_component"),
+    ("add_schematic_wire", "_handle_add_schematic_wire"),
+    ("add_schematic_label", "_handle_add_schematic_label"),
+    ("list_schematic_libraries", "_handle_list_schematic_libraries"),
+    ("export_schematic_pdf", "_handle_export_schematic_pdf"),
+    ("export_schematics_pdf", "_handle_export_schematics_pdf"),
+
+    # Symbol addition commands (S-expression based)
+    ("add_symbol", "_handle_add_symbol"),
+    ("add_symbol_auto", "_handle_add_symbol_auto"),
+    ("add_symbols_auto", "_handle_add_symbols_auto"),
+    ("add_symbol_relative", "_handle_add_symbol_relative"),
+    ("add_symbol_group", "_handle_add_symbol_group"),
+
+    # Symbol deletion commands
+    ("delete_symbol", "_handle_delete_symbol"),
+    ("delete_symbols", "_handle_delete_symbols"),
+    ("delete_all_wires", "_handle_delete_all_wires"),
+
+    # Wire and label commands
+    ("add_wire", "_handle_add_wire"),
+    ("add_label", "_handle_add_label"),
+    ("get_net_connections", "_handle_get_net_connections"),
+
+    # High-level circuit creation
+    ("create_circuit", "_handle_create_circuit"),
+
+    # UI/Process management commands
+    ("check_kicad_ui", "_handle_check_kicad_ui"),
+    ("launch_kicad_ui", "_handle_launch_kicad_ui"),
+)
+
+
+def require_params(*names):
+    """Make a _handle_* method fail fast unless params has all of names
+
+    A name counts as missing when it is absent, null or an empty string; 0 is
+    a valid coordinate. The failure response is
+    {"success": False, "message": "<name> is required"} for the first missing
+    name, as the handlers' own checks return.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, params):
+            for name in names:
+                value = params.get(name)
+                if value is None or value == "":
+                    return {"success": False, "message": f"{name} is required"}
+            return method(self, params)
+        return wrapper
+    return decorator
+
+
 class KiCADInterface:
     """Main interface class to handle KiCAD operations"""
 
+    # Stateless; one instance serves every check_kicad_ui call
+    _process_manager = KiCADProcessManager()
+
     def __init__(self):
         """Initialize the interface and command handlers"""
         self.board = None
@@ -192,144 +1078,143 @@ class KiCADInterface:
 
         logger.info("Initializing command handlers...")
 
-        # Initialize footprint library manager
-        self.footprint_library = FootprintLibraryManager()
-
-        # Initialize command handlers
-        self.project_commands = ProjectCommands(self.board)
-        self.board_commands = BoardCommands(self.board)
-        self.component_commands = ComponentCommands(self.board, self.footprint_library)
-        self.routing_commands = RoutingCommands(self.board)
-        self.design_rule_commands = DesignRuleCommands(self.board)
-        self.export_commands = ExportCommands(self.board)
-        self.library_commands = LibraryCommands(self.footprint_library)
-
-        # Schematic-related classes don't need board reference
+        # Command handlers are created on first use (see the properties
+        # below). Schematic-related classes don't need board reference
         # as they operate directly on schematic files
         
         # Command routing dictionary
-        self.command_routes = {
-            # Project commands
-            "create_project": self.project_commands.create_project,
-            "open_project": self.project_commands.open_project,
-            "save_project": self.project_commands.save_project,
-            "get_project_info": self.project_commands.get_project_info,
-            
-            # Board commands
-            "set_board_size": self.board_commands.set_board_size,
-            "add_layer": self.board_commands.add_layer,
-            "set_active_layer": self.board_commands.set_active_layer,
-            "get_board_info": self.board_commands.get_board_info,
-            "get_layer_list": self.board_commands.get_layer_list,
-            "get_board_2d_view": self.board_commands.get_board_2d_view,
-            "add_board_outline": self.board_commands.add_board_outline,
-            "add_mounting_hole": self.board_commands.add_mounting_hole,
-            "add_text": self.board_commands.add_text,
-            "add_board_text": self.board_commands.add_text,  # Alias for TypeScript tool
-            
-            # Component commands
-            "place_component": self.component_commands.place_component,
-            "move_component": self.component_commands.move_component,
-            "rotate_component": self.component_commands.rotate_component,
-            "delete_component": self.component_commands.delete_component,
-            "edit_component": self.component_commands.edit_component,
-            "get_component_properties": self.component_commands.get_component_properties,
-            "get_component_list": self.component_commands.get_component_list,
-            "place_component_array": self.component_commands.place_component_array,
-            "align_components": self.component_commands.align_components,
-            "duplicate_component": self.component_commands.duplicate_component,
-            
-            # Routing commands
-            "add_net": self.routing_commands.add_net,
-            "route_trace": self.routing_commands.route_trace,
-            "add_via": self.routing_commands.add_via,
-            "delete_trace": self.routing_commands.delete_trace,
-            "get_nets_list": self.routing_commands.get_nets_list,
-            "create_netclass": self.routing_commands.create_netclass,
-            "add_copper_pour": self.routing_commands.add_copper_pour,
-            "route_differential_pair": self.routing_commands.route_differential_pair,
-            
-            # Design rule commands
-            "set_design_rules": self.design_rule_commands.set_design_rules,
-            "get_design_rules": self.design_rule_commands.get_design_rules,
-            "run_drc": self.design_rule_commands.run_drc,
-            "get_drc_violations": self.design_rule_commands.get_drc_violations,
-            
-            # Export commands
-            "export_gerber": self.export_commands.export_gerber,
-            "export_pdf": self.export_commands.export_pdf,
-            "export_svg": self.export_commands.export_svg,
-            "export_3d": self.export_commands.export_3d,
-            "export_bom": self.export_commands.export_bom,
-
-            # Library commands (footprint management)
-            "list_libraries": self.library_commands.list_libraries,
-            "search_footprints": self.library_commands.search_footprints,
-            "list_library_footprints": self.library_commands.list_library_footprints,
-            "get_footprint_info": self.library_commands.get_footprint_info,
-
-            # Schematic commands
-            "create_schematic": self._handle_create_schematic,
-            "load_schematic": self._handle_load_schematic,
-            "get_all_symbols": self._handle_get_all_symbols,
-            "get_symbol_properties": self._handle_get_symbol_properties,
-            "update_symbol_property": self._handle_update_symbol_property,
-            "add_schematic_component": self._handle_add_schematic_component,
-            "add_schematic_wire": self._handle_add_schematic_wire,
-            "add_schematic_label": self._handle_add_schematic_label,
-            "list_schematic_libraries": self._handle_list_schematic_libraries,
-            "export_schematic_pdf": self._handle_export_schematic_pdf,
-
-            # Symbol addition commands (S-expression based)
-            "add_symbol": self._handle_add_symbol,
-            "add_symbol_auto": self._handle_add_symbol_auto,
-            "add_symbol_relative": self._handle_add_symbol_relative,
-            "add_symbol_group": self._handle_add_symbol_group,
-
-            # Symbol deletion commands
-            "delete_symbol": self._handle_delete_symbol,
-            "delete_symbols": self._handle_delete_symbols,
-            "delete_all_wires": self._handle_delete_all_wires,
-
-            # Wire and label commands
-            "add_wire": self._handle_add_wire,
-            "add_label": self._handle_add_label,
-
-            # High-level circuit creation
-            "create_circuit": self._handle_create_circuit,
-
-            # UI/Process management commands
-            "check_kicad_ui": self._handle_check_kicad_ui,
-            "launch_kicad_ui": self._handle_launch_kicad_ui
-        }
+        self.command_routes = {name: self._bind_route(path) for name, path in _ROUTES}
+        self._get_route = self.command_routes.get
         
         logger.info("KiCAD interface initialized")
 
+    def _bind_route(self, path):
+        """Callable for a _ROUTES attribute path"""
+        if '.' not in path:
+            return getattr(self, path)
+        get_method = attrgetter(path)
+        return lambda params: get_method(self)(params)
+
+    @cached_property
+    def tool_definitions(self):
+        """MCP tool definitions for every routed command, built once for tools/list"""
+        tools = []
+        for cmd_name in self.command_routes:
+            # Get schema from TOOL_SCHEMAS if available
+            if cmd_name in TOOL_SCHEMAS:
+                tools.append(TOOL_SCHEMAS[cmd_name])
+            else:
+                # Fallback for tools without schemas
+                logger.warning("No schema defined for tool: %s", cmd_name)
+                tools.append({
+                    'name': cmd_name,
+                    'description': f'KiCAD command: {cmd_name}',
+                    'inputSchema': {
+                        'type': 'object',
+                        'properties': {}
+                    }
+                })
+        return tools
+
+    @cached_property
+    def footprint_library(self):
+        from commands.library import LibraryManager as FootprintLibraryManager
+        return FootprintLibraryManager()
+
+    @cached_property
+    def project_commands(self):
+        from commands.project import ProjectCommands
+        return ProjectCommands(self.board)
+
+    @cached_property
+    def board_commands(self):
+        from commands.board import BoardCommands
+        return BoardCommands(self.board)
+
+    @cached_property
+    def component_commands(self):
+        from commands.component import ComponentCommands
+        return ComponentCommands(self.board, self.footprint_library)
+
+    @cached_property
+    def routing_commands(self):
+        from commands.routing import RoutingCommands
+        return RoutingCommands(self.board)
+
+    @cached_property
+    def design_rule_commands(self):
+        from commands.design_rules import DesignRuleCommands
+        return DesignRuleCommands(self.board)
+
+    @cached_property
+    def export_commands(self):
+        from commands.export import ExportCommands
+        return ExportCommands(self.board)
+
+    @cached_property
+    def library_commands(self):
+        from commands.library import LibraryCommands
+        return LibraryCommands(self.footprint_library)
+
     def handle_command(self, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Route command to appropriate handler"""
-        logger.info(f"Handling command: {command}")
-        logger.debug(f"Command parameters: {params}")
-        
+        logger.info("Handling command: %s", command)
+        logger.debug("Command parameters: %s", _SafeRepr(params))
+
+        # Only the shape is checked here. Parameter names are validated by
+        # each handler: TOOL_SCHEMAS describes the MCP-facing tools and does
+        # not match every handler (add_schematic_wire takes start/end
+        # points, not "points"), so it can't be enforced at this level.
+        if not isinstance(params, dict):
+            logger.error("Invalid parameters for %s: %s", command, type(params).__name__)
+            return {
+                "success": False,
+                "message": f"Invalid parameters for command: {command}",
+                "errorDetails": "params must be a JSON object"
+            }
+
         try:
+            if _OPEN_BATCHES:
+                failed = self._sync_batches(command, params)
+                if failed is not None:
+                    return {
+                        "success": False,
+                        "message": f"Failed to save pending edits to {failed}",
+                        "errorDetails": f"{command} was not run; the edits are still pending"
+                    }
+
             # Get the handler for the command
-            handler = self.command_routes.get(command)
+            handler = self._get_route(command)
             
             if handler:
                 # Execute the command
                 result = handler(params)
-                logger.debug(f"Command result: {result}")
+                logger.debug("Command result: %s", _SafeRepr(result))
+
+                # "flush": write coalesced edits to this command's files now,
+                # e.g. before KiCAD reloads them
+                if params.get("flush") and _OPEN_BATCHES:
+                    keys = {os.path.abspath(params[name])
+                            for name in ("file_path", "schematicPath", "output_path")
+                            if isinstance(params.get(name), str)}
+                    if not _close_auto_batches(keys):
+                        # The edit was made but is not on disk yet
+                        result["success"] = False
+                        result["flushError"] = "Failed to write changes to disk"
                 
                 # Update board reference if command was successful
                 if result.get("success", False):
                     if command == "create_project" or command == "open_project":
-                        logger.info("Updating board reference...")
                         # Get board from the project commands handler
-                        self.board = self.project_commands.board
-                        self._update_command_handlers()
+                        new_board = self.project_commands.board
+                        if new_board is not self.board:
+                            logger.info("Updating board reference...")
+                            self.board = new_board
+                            self._update_command_handlers()
                 
                 return result
             else:
-                logger.error(f"Unknown command: {command}")
+                logger.error("Unknown command: %s", command)
                 return {
                     "success": False,
                     "message": f"Unknown command: {command}",
@@ -337,24 +1222,56 @@ class KiCADInterface:
                 }
                 
         except Exception as e:
-            # Get the full traceback
-            traceback_str = traceback.format_exc()
-            logger.error(f"Error handling command {command}: {str(e)}\n{traceback_str}")
+            # The full traceback is only formatted with KICAD_MCP_DEBUG=1;
+            # it is then shared by the log record and the response
+            details = str(e)
+            if _DEBUG:
+                traceback_str = traceback.format_exc()
+                logger.error("Error handling command %s: %s\n%s", command, e, traceback_str)
+                details = f"{details}\n{traceback_str}"
+            else:
+                logger.error("Error handling command %s: %s", command, e)
             return {
                 "success": False,
                 "message": f"Error handling command: {command}",
-                "errorDetails": f"{str(e)}\n{traceback_str}"
+                "errorDetails": details
             }
 
+    def _sync_batches(self, command, params):
+        """Write out pending batch edits for files a command might read or write directly
+
+        Batch-aware commands are left alone unless they save to a different
+        output_path, which would otherwise carry the batch's unsaved edits
+        along with it. Returns the path whose edits could not be written, if
+        any, leaving that batch as it was.
+        """
+        if command in _BATCHED_COMMANDS:
+            output_path = params.get("output_path")
+            if not output_path or output_path == params.get("file_path"):
+                return
+        for name in ("file_path", "schematicPath", "filename", "output_path"):
+            path = params.get(name)
+            if not isinstance(path, str):
+                continue
+            key = os.path.abspath(path)
+            batch = _OPEN_BATCHES.get(key)
+            if batch is None:
+                continue
+            logger.debug("Flushing batch for %s before %s", path, command)
+            if not _flush_batch(key, batch):
+                return path
+            batch.schematic = None
+        return None
+
     def _update_command_handlers(self):
         """Update board reference in all command handlers"""
         logger.debug("Updating board reference in command handlers")
-        self.project_commands.board = self.board
-        self.board_commands.board = self.board
-        self.component_commands.board = self.board
-        self.routing_commands.board = self.board
-        self.design_rule_commands.board = self.board
-        self.export_commands.board = self.board
+        # Handlers not created yet pick up self.board when they are
+        for name in ("project_commands", "board_commands", "component_commands",
+                     "routing_commands", "design_rule_commands", "export_commands"):
+            handler = self.__dict__.get(name)
+            if handler is not None:
+                handler.board = self.board
         
     # Schematic command handlers
     def _handle_create_schematic(self, params):
@@ -369,12 +1286,12 @@ class KiCADInterface:
                 return {"success": False, "message": "Project name is required"}
             
             schematic = SchematicManager.create_schematic(project_name, metadata)
-            file_path = f"{path}/{project_name}.kicad_sch"
+            file_path = os.path.join(path, f"{project_name}.kicad_sch")
             success = SchematicManager.save_schematic(schematic, file_path)
             
             return {"success": success, "file_path": file_path}
         except Exception as e:
-            logger.error(f"Error creating schematic: {str(e)}")
+            logger.error("Error creating schematic: %s", e)
             return {"success": False, "message": str(e)}
     
     def _handle_load_schematic(self, params):
@@ -399,19 +1316,17 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": "Failed to load schematic"}
         except Exception as e:
-            logger.error(f"Error loading schematic: {str(e)}")
+            logger.error("Error loading schematic: %s", e)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path")
     def _handle_get_all_symbols(self, params):
         """Get all symbols from a schematic"""
         logger.info("Getting all symbols from schematic")
         try:
             file_path = params.get("file_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -421,20 +1336,30 @@ class KiCADInterface:
             symbols_data = []
             for sym in symbols:
                 try:
-                    sym_data = {
-                        "reference": sym.property.Reference.value if hasattr(sym.property, 'Reference') else "?",
-                        "value": sym.property.Value.value if hasattr(sym.property, 'Value') else "",
-                        "lib_id": sym.lib_id.value if hasattr(sym, 'lib_id') else "",
-                        "footprint": sym.property.Footprint.value if hasattr(sym.property, 'Footprint') else "",
+                    try:
+                        # Common case: every field present, one lookup pass
+                        ref, val, lib, fp, at = _SYMBOL_FIELDS(sym)
+                    except AttributeError:
+                        props = sym.property
+                        ref = props.Reference.value if hasattr(props, 'Reference') else "?"
+                        val = props.Value.value if hasattr(props, 'Value') else ""
+                        lib = sym.lib_id.value if hasattr(sym, 'lib_id') else ""
+                        fp = props.Footprint.value if hasattr(props, 'Footprint') else ""
+                        at = getattr(sym, 'at', ())
+                    at_len = len(at)
+                    symbols_data.append({
+                        "reference": ref,
+                        "value": val,
+                        "lib_id": lib,
+                        "footprint": fp,
                         "position": {
-                            "x": sym.at[0] if hasattr(sym, 'at') and len(sym.at) > 0 else 0,
-                            "y": sym.at[1] if hasattr(sym, 'at') and len(sym.at) > 1 else 0,
-                            "rotation": sym.at[2] if hasattr(sym, 'at') and len(sym.at) > 2 else 0
+                            "x": at[0] if at_len > 0 else 0,
+                            "y": at[1] if at_len > 1 else 0,
+                            "rotation": at[2] if at_len > 2 else 0
                         }
-                    }
-                    symbols_data.append(sym_data)
+                    })
                 except Exception as e:
-                    logger.warning(f"Error processing symbol: {str(e)}")
+                    logger.warning("Error processing symbol: %s", e)
                     continue
 
             return {
@@ -443,9 +1368,10 @@ class KiCADInterface:
                 "symbols": symbols_data
             }
         except Exception as e:
-            logger.error(f"Error getting symbols: {str(e)}")
+            logger.error("Error getting symbols: %s", e)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "reference")
     def _handle_get_symbol_properties(self, params):
         """Get properties of a specific symbol"""
         logger.info("Getting symbol properties")
@@ -453,12 +1379,7 @@ class KiCADInterface:
             file_path = params.get("file_path")
             reference = params.get("reference")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -469,14 +1390,18 @@ class KiCADInterface:
             # Extract all properties
             properties = {}
             if hasattr(symbol, 'property'):
-                prop_names = [p for p in dir(symbol.property) if not p.startswith('_')]
-                for prop_name in prop_names:
-                    try:
-                        prop = getattr(symbol.property, prop_name)
-                        if hasattr(prop, 'value'):
-                            properties[prop_name] = prop.value
-                    except:
-                        pass
+                # kicad-skip keeps a symbol's properties in the collection's
+                # name -> element dict; dir() on it lists just those keys
+                named = getattr(symbol.property, '_named', None)
+                if named is None:
+                    named = {name: getattr(symbol.property, name, None)
+                             for name in dir(symbol.property)}
+                for prop_name, prop in sorted(named.items()):
+                    if prop_name.startswith('_'):
+                        continue
+                    value = getattr(prop, 'value', _MISSING)
+                    if value is not _MISSING:
+                        properties[prop_name] = value
 
             return {
                 "success": True,
@@ -490,9 +1415,10 @@ class KiCADInterface:
                 }
             }
         except Exception as e:
-            logger.error(f"Error getting symbol properties: {str(e)}")
+            logger.error("Error getting symbol properties: %s", e)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "reference")
     def _handle_update_symbol_property(self, params):
         """Update a property of a specific symbol"""
         logger.info("Updating symbol property")
@@ -503,39 +1429,101 @@ class KiCADInterface:
             value = params.get("value")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
             if not property_name:
                 return {"success": False, "message": "property name is required"}
             if value is None:
                 return {"success": False, "message": "value is required"}
 
-            schematic = SchematicManager.load_schematic(file_path)
+            result = self._handle_update_symbol_properties({
+                "file_path": file_path,
+                "reference": reference,
+                "properties": {property_name: value},
+                "output_path": output_path
+            })
+            if result.get("success"):
+                result["message"] = f"Updated {property_name} of {reference} to {value}"
+            return result
+        except Exception as e:
+            logger.error("Error updating symbol property: %s", e)
+            return {"success": False, "message": str(e)}
+
+    @require_params("file_path")
+    def _handle_update_symbol_properties(self, params):
+        """Update several properties, of one or more symbols, with a single load and save
+
+        Accepts either {"reference", "properties": {name: value}} or
+        {"updates": [{"reference", "properties"}, ...]}. Every reference is
+        looked up before anything is changed, so an unknown one leaves the
+        schematic untouched; that matters inside a batch, whose in-memory
+        schematic is written later by commit_batch, end_batch or the timer.
+        """
+        logger.info("Updating symbol properties")
+        try:
+            file_path = params.get("file_path")
+            output_path = params.get("output_path")
+            updates = params.get("updates")
+            if updates is None:
+                updates = [{"reference": params.get("reference"),
+                            "properties": params.get("properties")}]
+            if not updates or not isinstance(updates, list):
+                return {"success": False, "message": "updates must be a non-empty array"}
+
+            for update in updates:
+                if not isinstance(update, dict):
+                    return {"success": False, "message": "each update must be an object"}
+                if not update.get("reference"):
+                    return {"success": False, "message": "reference is required"}
+                if not update.get("properties") or not isinstance(update["properties"], dict):
+                    return {"success": False, "message": "properties are required"}
+
+            schematic = _load_cached(file_path, take=True)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
-            # Update the property
-            success = ComponentManager.update_component(schematic, reference, {property_name: value})
+            # Earlier updates may rename a symbol that later ones refer to
+            renamed = set()
+            for update in updates:
+                reference = update["reference"]
+                if (reference not in renamed
+                        and ComponentManager._find_symbol_by_ref(schematic, reference) is None):
+                    return {"success": False, "message": f"Failed to update {reference}"}
+                new_reference = update["properties"].get("Reference")
+                if new_reference:
+                    renamed.add(new_reference)
+
+            changed = False
+            for update in updates:
+                reference = update["reference"]
+                if not changed:
+                    props = ComponentManager._find_symbol_by_ref(schematic, reference).property
+                    changed = any(hasattr(props, name) and getattr(props, name).value != value
+                                  for name, value in update["properties"].items())
+                if not ComponentManager.update_component(schematic, reference, update["properties"]):
+                    return {"success": False, "message": f"Failed to update {reference}"}
+
+            save_path = output_path or file_path
+            if not changed and save_path == file_path:
+                # Every value was already set; leave the file alone
+                return {
+                    "success": True,
+                    "message": "No properties changed",
+                    "file_path": save_path
+                }
 
-            if success:
-                # Save the schematic
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+            # Save the schematic once for all updates
+            save_success = _save_edited(schematic, save_path)
+            _evict_cached(save_path)
 
-                if save_success:
-                    return {
-                        "success": True,
-                        "message": f"Updated {property_name} of {reference} to {value}",
-                        "file_path": save_path
-                    }
-                else:
-                    return {"success": False, "message": "Failed to save schematic"}
+            if save_success:
+                return {
+                    "success": True,
+                    "message": f"Updated {len(updates)} symbol(s)",
+                    "file_path": save_path
+                }
             else:
-                return {"success": False, "message": f"Failed to update {reference}"}
+                return {"success": False, "message": "Failed to save schematic"}
         except Exception as e:
-            logger.error(f"Error updating symbol property: {str(e)}")
+            logger.error("Error updating symbol properties: %s", e)
             return {"success": False, "message": str(e)}
 
     def _handle_add_schematic_component(self, params):
@@ -563,7 +1551,7 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": "Failed to add component"}
         except Exception as e:
-            logger.error(f"Error adding component to schematic: {str(e)}")
+            logger.error("Error adding component to schematic: %s", e)
             return {"success": False, "message": str(e)}
     
     def _handle_add_schematic_wire(self, params):
@@ -580,8 +1568,8 @@ class KiCADInterface:
             if not start_point or not end_point:
                 return {"success": False, "message": "Start and end points are required"}
 
-            logger.debug(f"Will read {schematic_path}")
-            schematic = Schematic(schematic_path)
+            logger.debug("Will read %s", schematic_path)
+            schematic = _load_cached(schematic_path, Schematic, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -590,17 +1578,17 @@ class KiCADInterface:
 
             if success:
                 # Save using tree-based save (same as component addition)
-                if ComponentManager.save_schematic_with_tree(schematic, schematic_path):
-                    logger.info(f"Saved wire to {schematic_path}")
+                if _save_edited(schematic, schematic_path):
+                    # Keep the edited parse for the next wire/label on this sheet
+                    _keep_cached(schematic_path, schematic)
+                    logger.info("Saved wire to %s", schematic_path)
                     return {"success": True, "message": f"Added wire from {start_point} to {end_point}", "file_path": schematic_path}
                 else:
                     return {"success": False, "message": "Failed to save schematic"}
             else:
                 return {"success": False, "message": "Failed to add wire"}
         except Exception as e:
-            logger.error(f"Error adding wire to schematic: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding wire to schematic: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
     
     def _handle_add_schematic_label(self, params):
@@ -621,8 +1609,8 @@ class KiCADInterface:
             if x is None or y is None:
                 return {"success": False, "message": "X and Y coordinates are required"}
 
-            logger.debug(f"Will read {schematic_path}")
-            schematic = Schematic(schematic_path)
+            logger.debug("Will read %s", schematic_path)
+            schematic = _load_cached(schematic_path, Schematic, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -631,19 +1619,82 @@ class KiCADInterface:
 
             if success:
                 # Save using tree-based save (same as component addition)
-                if ComponentManager.save_schematic_with_tree(schematic, schematic_path):
-                    logger.info(f"Saved label to {schematic_path}")
+                if _save_edited(schematic, schematic_path):
+                    # Keep the edited parse for the next wire/label on this sheet
+                    _keep_cached(schematic_path, schematic)
+                    logger.info("Saved label to %s", schematic_path)
                     return {"success": True, "message": f"Added {label_type} '{text}' at ({x}, {y})", "file_path": schematic_path}
                 else:
                     return {"success": False, "message": "Failed to save schematic"}
             else:
                 return {"success": False, "message": "Failed to add label"}
         except Exception as e:
-            logger.error(f"Error adding label to schematic: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding label to schematic: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path")
+    def _handle_begin_batch(self, params):
+        """Defer saves of a schematic until end_batch"""
+        logger.info("Beginning schematic batch")
+        file_path = params.get("file_path")
+        if not os.path.exists(file_path):
+            return {"success": False, "message": f"Schematic not found: {file_path}"}
+
+        batch = _OPEN_BATCHES.setdefault(os.path.abspath(file_path), _SchematicBatch())
+        if batch.auto:
+            # Take over the pending automatic write
+            if batch.timer is not None:
+                batch.timer.cancel()
+                batch.timer = None
+            batch.auto = False
+        return {"success": True, "message": "Batch started", "file_path": file_path}
+
+    @require_params("file_path")
+    def _handle_commit_batch(self, params):
+        """Write a batched schematic's edits so far and keep the batch open"""
+        logger.info("Committing schematic batch")
+        file_path = params.get("file_path")
+
+        key = os.path.abspath(file_path)
+        batch = _OPEN_BATCHES.get(key)
+        if batch is None or batch.auto:
+            return {"success": False, "message": f"No batch open for {file_path}"}
+        if not _flush_batch(key, batch):
+            return {"success": False, "message": "Failed to save schematic"}
+        return {"success": True, "message": "Batch saved", "file_path": file_path}
+
+    @require_params("file_path")
+    def _handle_end_batch(self, params):
+        """Write a batched schematic once and leave batch mode"""
+        logger.info("Ending schematic batch")
+        file_path = params.get("file_path")
+
+        key = os.path.abspath(file_path)
+        batch = _OPEN_BATCHES.get(key)
+        if batch is None:
+            return {"success": False, "message": f"No batch open for {file_path}"}
+        if not _close_batch(key, batch):
+            return {"success": False, "message": "Failed to save schematic"}
+        return {"success": True, "message": "Batch saved", "file_path": file_path}
+
+    def _handle_flush_schematics(self, params):
+        """Write out coalesced schematic edits now (see KICAD_MCP_SAVE_DELAY_MS)"""
+        logger.info("Flushing pending schematic saves")
+        file_path = params.get("file_path")
+        keys = {os.path.abspath(file_path)} if file_path else None
+        if not _close_auto_batches(keys):
+            return {"success": False, "message": "Failed to save schematic"}
+        return {"success": True, "message": "Pending schematic saves written"}
+
+    def _handle_clear_schematic_cache(self, params):
+        """Forget cached schematic parses, for one file or all of them"""
+        file_path = params.get("file_path")
+        if file_path:
+            _evict_cached(file_path)
+        else:
+            _SCHEMATIC_CACHE.clear()
+        return {"success": True, "message": "Schematic cache cleared"}
+
     def _handle_list_schematic_libraries(self, params):
         """List available symbol libraries"""
         logger.info("Listing schematic libraries")
@@ -653,7 +1704,7 @@ class KiCADInterface:
             libraries = LibraryManager.list_available_libraries(search_paths)
             return {"success": True, "libraries": libraries}
         except Exception as e:
-            logger.error(f"Error listing schematic libraries: {str(e)}")
+            logger.error("Error listing schematic libraries: %s", e)
             return {"success": False, "message": str(e)}
     
     def _handle_export_schematic_pdf(self, params):
@@ -668,21 +1719,49 @@ class KiCADInterface:
             if not output_path:
                 return {"success": False, "message": "Output path is required"}
 
-            import subprocess
-            result = subprocess.run(
-                ["kicad-cli", "sch", "export", "pdf", "--output", output_path, schematic_path],
-                capture_output=True,
-                text=True
-            )
+            return _export_schematic_pdf(schematic_path, output_path)
+        except Exception as e:
+            logger.error("Error exporting schematic to PDF: %s", e)
+            return {"success": False, "message": str(e)}
 
-            success = result.returncode == 0
-            message = result.stderr if not success else ""
+    def _handle_export_schematics_pdf(self, params):
+        """Export several schematics to PDF, running kicad-cli for each in parallel"""
+        logger.info("Exporting schematics to PDF")
+        try:
+            jobs = params.get("jobs")
+            if not jobs or not isinstance(jobs, list):
+                return {"success": False, "message": "jobs array is required"}
+            for job in jobs:
+                if not isinstance(job, dict) or not job.get("schematicPath") or not job.get("outputPath"):
+                    return {"success": False,
+                            "message": "Each job needs a schematicPath and an outputPath"}
+
+            # Each export is its own kicad-cli process; the threads only wait on them
+            with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+                futures = [executor.submit(_export_schematic_pdf, job["schematicPath"], job["outputPath"])
+                           for job in jobs]
+            results = []
+            for job, future in zip(jobs, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Error exporting %s to PDF: %s", job["schematicPath"], e)
+                    result = {"success": False, "message": str(e)}
+                result["schematicPath"] = job["schematicPath"]
+                result["outputPath"] = job["outputPath"]
+                results.append(result)
 
-            return {"success": success, "message": message}
+            exported = sum(1 for result in results if result["success"])
+            return {
+                "success": exported == len(results),
+                "message": f"Exported {exported} of {len(results)} schematics",
+                "results": results
+            }
         except Exception as e:
-            logger.error(f"Error exporting schematic to PDF: {str(e)}")
+            logger.error("Error exporting schematics to PDF: %s", e)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "lib_id", "reference", "value", "x", "y")
     def _handle_add_symbol(self, params):
         """Add symbol at exact coordinates (Method 1)"""
         logger.info("Adding symbol with exact coordinates")
@@ -700,24 +1779,8 @@ class KiCADInterface:
             auto_rotate = params.get("auto_rotate", False)
             desired_orientation = params.get("desired_orientation")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not lib_id:
-                return {"success": False, "message": "lib_id is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
-            if not value:
-                return {"success": False, "message": "value is required"}
-            if x is None:
-                return {"success": False, "message": "x coordinate is required"}
-            if y is None:
-                return {"success": False, "message": "y coordinate is required"}
-
             # Load schematic
-            from commands.schematic import SchematicManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -729,8 +1792,9 @@ class KiCADInterface:
 
             if success:
                 # Save schematic using tree-based save
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
 
                 if save_success:
                     # Get final rotation from schematic
@@ -749,11 +1813,10 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": f"Failed to add component {reference}"}
         except Exception as e:
-            logger.error(f"Error adding symbol: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding symbol: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "lib_id", "reference", "value")
     def _handle_add_symbol_auto(self, params):
         """Add symbol with automatic grid positioning (Method 2)"""
         logger.info("Adding symbol with auto grid positioning")
@@ -770,37 +1833,23 @@ class KiCADInterface:
             datasheet = params.get("datasheet", "")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not lib_id:
-                return {"success": False, "message": "lib_id is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
-            if not value:
-                return {"success": False, "message": "value is required"}
-
             # Load schematic
-            from commands.schematic import SchematicManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
             # Add component with auto positioning
-            success = ComponentManager.add_component_auto(
+            position = ComponentManager.add_component_auto(
                 schematic, lib_id, reference, value, grid_x, grid_y, grid_size, rotation, footprint, datasheet
             )
 
-            if success:
-                # Get actual position
-                added_symbol = ComponentManager.get_component(schematic, reference)
-                actual_x = added_symbol.at[0] if added_symbol else 0
-                actual_y = added_symbol.at[1] if added_symbol else 0
+            if position is not None:
+                actual_x, actual_y = position
 
                 # Save schematic
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
 
                 if save_success:
                     return {
@@ -815,11 +1864,60 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": f"Failed to add component {reference}"}
         except Exception as e:
-            logger.error(f"Error adding symbol with auto positioning: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding symbol with auto positioning: %s", e, exc_info=_DEBUG)
+            return {"success": False, "message": str(e)}
+
+    @require_params("file_path")
+    def _handle_add_symbols_auto(self, params):
+        """Add multiple symbols at successive free grid positions (Method 2)"""
+        logger.info("Adding symbols with auto grid positioning")
+        try:
+            file_path = params.get("file_path")
+            components = params.get("components")
+            grid_x = params.get("grid_x", 0)
+            grid_y = params.get("grid_y", 0)
+            grid_size = params.get("grid_size", 50.8)
+            output_path = params.get("output_path")
+
+            if not components or not isinstance(components, list):
+                return {"success": False, "message": "components array is required"}
+
+            # Load schematic
+            schematic = _load_cached(file_path, take=True, fresh=False)
+            if not schematic:
+                return {"success": False, "message": "Failed to load schematic"}
+
+            # Free cells are found in one pass so the components don't all land on the same slot
+            placed = ComponentManager.add_components_auto(
+                schematic, components, grid_x, grid_y, grid_size
+            )
+
+            if placed:
+                # Save schematic
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
+
+                if save_success:
+                    return {
+                        "success": len(placed) == len(components),
+                        "message": f"Added {len(placed)}/{len(components)} components with auto positioning",
+                        "file_path": save_path,
+                        "count": len(placed),
+                        "components": [
+                            {"reference": ref, "position": {"x": x, "y": y}}
+                            for ref, x, y in placed
+                        ]
+                    }
+                else:
+                    return {"success": False, "message": "Failed to save schematic"}
+            else:
+                return {"success": False, "message": "Failed to add components"}
+        except Exception as e:
+            logger.error("Error adding symbols with auto positioning: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "lib_id", "reference", "value", "anchor_ref")
     def _handle_add_symbol_relative(self, params):
         """Add symbol relative to another component (Method 3)"""
         logger.info("Adding symbol with relative positioning")
@@ -836,39 +1934,23 @@ class KiCADInterface:
             datasheet = params.get("datasheet", "")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not lib_id:
-                return {"success": False, "message": "lib_id is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
-            if not value:
-                return {"success": False, "message": "value is required"}
-            if not anchor_ref:
-                return {"success": False, "message": "anchor_ref is required"}
-
             # Load schematic
-            from commands.schematic import SchematicManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
             # Add component with relative positioning
-            success = ComponentManager.add_component_relative(
+            position = ComponentManager.add_component_relative(
                 schematic, lib_id, reference, value, anchor_ref, direction, distance, rotation, footprint, datasheet
             )
 
-            if success:
-                # Get actual position
-                added_symbol = ComponentManager.get_component(schematic, reference)
-                actual_x = added_symbol.at[0] if added_symbol else 0
-                actual_y = added_symbol.at[1] if added_symbol else 0
+            if position is not None:
+                actual_x, actual_y = position
 
                 # Save schematic
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
 
                 if save_success:
                     return {
@@ -885,11 +1967,10 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": f"Failed to add component {reference}"}
         except Exception as e:
-            logger.error(f"Error adding symbol with relative positioning: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding symbol with relative positioning: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path")
     def _handle_add_symbol_group(self, params):
         """Add multiple symbols in a group layout (Method 4)"""
         logger.info("Adding symbol group")
@@ -902,16 +1983,11 @@ class KiCADInterface:
             columns = params.get("columns", 5)
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
             if not components or not isinstance(components, list):
                 return {"success": False, "message": "components array is required"}
 
             # Load schematic
-            from commands.schematic import SchematicManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
@@ -922,8 +1998,9 @@ class KiCADInterface:
 
             if success:
                 # Save schematic using tree-based save
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
 
                 if save_success:
                     return {
@@ -938,11 +2015,10 @@ class KiCADInterface:
             else:
                 return {"success": False, "message": "Failed to add component group"}
         except Exception as e:
-            logger.error(f"Error adding symbol group: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding symbol group: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "reference")
     def _handle_delete_symbol(self, params):
         """Delete a single symbol from schematic"""
         logger.info("Deleting symbol from schematic")
@@ -951,142 +2027,9 @@ class KiCADInterface:
             reference = params.get("reference")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not reference:
-                return {"success": False, "message": "reference is required"}
-
-            # Load schematic file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            lines = content.split('\n')
-            output_lines = []
-
-            in_lib_symbols = False
-            in_instance_symbol = False
-            skip_current_block = False
-            symbol_start_line = 0
-
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                stripped = line.strip()
-
-                # Detect lib_symbols block
-                # New format: "lib_symbols" on its own line, old format: "(lib_symbols ..."
-                if stripped.startswith('(lib_symbols') or stripped == 'lib_symbols':
-                    in_lib_symbols = True
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # End of lib_symbols block (one closing paren at same indent level)
-                if in_lib_symbols and stripped == ')':
-                    in_lib_symbols = False
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # Keep all lib_symbols content
-                if in_lib_symbols:
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # Detect instance symbol (outside lib_symbols)
-                # KiCAD 9.0 format: "(" on one line, then "symbol" on next line
-                # Old format: "(symbol ..." on single line
-                if not in_lib_symbols and stripped == '(':
-                    # Check if next line is 'symbol'
-                    if i + 1 < len(lines) and lines[i + 1].strip() == 'symbol':
-                        temp_lines = []
-                        temp_i = i
-                        paren_count = 0
-                        symbol_reference = None
-                        found_property = False
-                        found_reference_key = False
-
-                        # Read entire symbol block
-                        while temp_i < len(lines):
-                            temp_line = lines[temp_i]
-                            temp_lines.append(temp_line)
-                            temp_stripped = temp_line.strip()
-                            paren_count += temp_line.count('(') - temp_line.count(')')
-
-                            # Find reference - handle both old and new formats
-                            # Old format: property "Reference" "R4" on single line
-                            # New format: property on line 1, "Reference" on line 2, "R4" on line 3
-                            if 'property "Reference"' in temp_line and symbol_reference is None:
-                                parts = temp_line.split('"')
-                                if len(parts) >= 4:
-                                    symbol_reference = parts[3]
-                            elif temp_stripped == 'property':
-                                found_property = True
-                            elif found_property and temp_stripped == '"Reference"':
-                                found_reference_key = True
-                            elif found_reference_key and temp_stripped.startswith('"') and temp_stripped.endswith('"'):
-                                # Extract reference value from quoted string
-                                symbol_reference = temp_stripped.strip('"')
-                                found_property = False
-                                found_reference_key = False
-
-                            if paren_count == 0:
-                                break
-                            temp_i += 1
-
-                        # Check if this is the symbol to delete
-                        if symbol_reference == reference:
-                            # Skip this symbol
-                            i = temp_i + 1
-                            continue
-                        else:
-                            # Keep this symbol
-                            output_lines.extend(temp_lines)
-                            i = temp_i + 1
-                            continue
-                elif not in_lib_symbols and stripped.startswith('(symbol'):
-                    # Old format: "(symbol ..." on single line
-                    temp_lines = []
-                    temp_i = i
-                    paren_count = 0
-                    symbol_reference = None
-
-                    # Read entire symbol block
-                    while temp_i < len(lines):
-                        temp_line = lines[temp_i]
-                        temp_lines.append(temp_line)
-                        paren_count += temp_line.count('(') - temp_line.count(')')
-
-                        # Find reference
-                        if 'property "Reference"' in temp_line and symbol_reference is None:
-                            parts = temp_line.split('"')
-                            if len(parts) >= 4:
-                                symbol_reference = parts[3]
-
-                        if paren_count == 0:
-                            break
-                        temp_i += 1
-
-                    # Check if this is the symbol to delete
-                    if symbol_reference == reference:
-                        # Skip this symbol
-                        i = temp_i + 1
-                        continue
-                    else:
-                        # Keep this symbol
-                        output_lines.extend(temp_lines)
-                        i = temp_i + 1
-                        continue
-
-                # Keep all other lines
-                output_lines.append(line)
-                i += 1
-
-            # Write output
-            save_path = output_path if output_path else file_path
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output_lines))
+            save_path = output_path or file_path
+            if not _delete_symbol_refs(file_path, save_path, (reference,)):
+                return {"success": False, "message": f"Symbol {reference} not found"}
 
             return {
                 "success": True,
@@ -1095,11 +2038,10 @@ class KiCADInterface:
                 "reference": reference
             }
         except Exception as e:
-            logger.error(f"Error deleting symbol: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error deleting symbol: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path")
     def _handle_delete_symbols(self, params):
         """Delete multiple symbols from schematic"""
         logger.info("Deleting multiple symbols from schematic")
@@ -1108,142 +2050,18 @@ class KiCADInterface:
             references = params.get("references")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
             if not references or not isinstance(references, list):
                 return {"success": False, "message": "references array is required"}
 
-            # Load schematic file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            lines = content.split('\n')
-            output_lines = []
-
-            in_lib_symbols = False
-            deleted_count = 0
-
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                stripped = line.strip()
-
-                # Detect lib_symbols block
-                # New format: "lib_symbols" on its own line, old format: "(lib_symbols ..."
-                if stripped.startswith('(lib_symbols') or stripped == 'lib_symbols':
-                    in_lib_symbols = True
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # End of lib_symbols block (one closing paren at same indent level)
-                if in_lib_symbols and stripped == ')':
-                    in_lib_symbols = False
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # Keep all lib_symbols content
-                if in_lib_symbols:
-                    output_lines.append(line)
-                    i += 1
-                    continue
-
-                # Detect instance symbol (outside lib_symbols)
-                # KiCAD 9.0 format: "(" on one line, then "symbol" on next line
-                # Old format: "(symbol ..." on single line
-                if not in_lib_symbols and stripped == '(':
-                    # Check if next line is 'symbol'
-                    if i + 1 < len(lines) and lines[i + 1].strip() == 'symbol':
-                        temp_lines = []
-                        temp_i = i
-                        paren_count = 0
-                        symbol_reference = None
-                        found_property = False
-                        found_reference_key = False
-
-                        # Read entire symbol block
-                        while temp_i < len(lines):
-                            temp_line = lines[temp_i]
-                            temp_lines.append(temp_line)
-                            temp_stripped = temp_line.strip()
-                            paren_count += temp_line.count('(') - temp_line.count(')')
-
-                            # Find reference - handle both old and new formats
-                            # Old format: property "Reference" "R4" on single line
-                            # New format: property on line 1, "Reference" on line 2, "R4" on line 3
-                            if 'property "Reference"' in temp_line and symbol_reference is None:
-                                parts = temp_line.split('"')
-                                if len(parts) >= 4:
-                                    symbol_reference = parts[3]
-                            elif temp_stripped == 'property':
-                                found_property = True
-                            elif found_property and temp_stripped == '"Reference"':
-                                found_reference_key = True
-                            elif found_reference_key and temp_stripped.startswith('"') and temp_stripped.endswith('"'):
-                                # Extract reference value from quoted string
-                                symbol_reference = temp_stripped.strip('"')
-                                found_property = False
-                                found_reference_key = False
-
-                            if paren_count == 0:
-                                break
-                            temp_i += 1
-
-                        # Check if this symbol should be deleted
-                        if symbol_reference in references:
-                            # Skip this symbol
-                            deleted_count += 1
-                            i = temp_i + 1
-                            continue
-                        else:
-                            # Keep this symbol
-                            output_lines.extend(temp_lines)
-                            i = temp_i + 1
-                            continue
-                elif not in_lib_symbols and stripped.startswith('(symbol'):
-                    # Old format: "(symbol ..." on single line
-                    temp_lines = []
-                    temp_i = i
-                    paren_count = 0
-                    symbol_reference = None
-
-                    # Read entire symbol block
-                    while temp_i < len(lines):
-                        temp_line = lines[temp_i]
-                        temp_lines.append(temp_line)
-                        paren_count += temp_line.count('(') - temp_line.count(')')
-
-                        # Find reference
-                        if 'property "Reference"' in temp_line and symbol_reference is None:
-                            parts = temp_line.split('"')
-                            if len(parts) >= 4:
-                                symbol_reference = parts[3]
-
-                        if paren_count == 0:
-                            break
-                        temp_i += 1
-
-                    # Check if this symbol should be deleted
-                    if symbol_reference in references:
-                        # Skip this symbol
-                        deleted_count += 1
-                        i = temp_i + 1
-                        continue
-                    else:
-                        # Keep this symbol
-                        output_lines.extend(temp_lines)
-                        i = temp_i + 1
-                        continue
-
-                # Keep all other lines
-                output_lines.append(line)
-                i += 1
-
-            # Write output
-            save_path = output_path if output_path else file_path
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output_lines))
+            save_path = output_path or file_path
+            deleted_count = _delete_symbol_refs(file_path, save_path, references)
+            if not deleted_count:
+                return {
+                    "success": False,
+                    "message": "None of the symbols were found",
+                    "deleted_count": 0,
+                    "references": references
+                }
 
             return {
                 "success": True,
@@ -1253,11 +2071,10 @@ class KiCADInterface:
                 "references": references
             }
         except Exception as e:
-            logger.error(f"Error deleting symbols: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error deleting symbols: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path")
     def _handle_delete_all_wires(self, params):
         """Delete all wires, junctions, and labels from schematic"""
         logger.info("Deleting all wires from schematic")
@@ -1265,42 +2082,9 @@ class KiCADInterface:
             file_path = params.get("file_path")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-
-            # Load schematic file content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            lines = content.split('\n')
-            output_lines = []
-
-            i = 0
-            while i < len(lines):
-                line = lines[i]
-                stripped = line.strip()
-
-                # Skip wire, junction, and label blocks
-                if stripped.startswith('(wire') or stripped.startswith('(junction') or stripped.startswith('(label'):
-                    temp_i = i
-                    paren_count = 0
-                    while temp_i < len(lines):
-                        temp_line = lines[temp_i]
-                        paren_count += temp_line.count('(') - temp_line.count(')')
-                        if paren_count == 0:
-                            break
-                        temp_i += 1
-                    i = temp_i + 1
-                    continue
-
-                # Keep all other lines
-                output_lines.append(line)
-                i += 1
-
-            # Write output
-            save_path = output_path if output_path else file_path
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output_lines))
+            # Skip wire, junction, and label blocks
+            save_path = output_path or file_path
+            _rewrite_without(file_path, save_path, _wiring_spans)
 
             return {
                 "success": True,
@@ -1308,11 +2092,10 @@ class KiCADInterface:
                 "file_path": save_path
             }
         except Exception as e:
-            logger.error(f"Error deleting wires: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error deleting wires: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "start_x", "start_y", "end_x", "end_y")
     def _handle_add_wire(self, params):
         """Add wire connection to schematic"""
         logger.info("Adding wire to schematic")
@@ -1324,28 +2107,18 @@ class KiCADInterface:
             end_y = params.get("end_y")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if start_x is None or start_y is None:
-                return {"success": False, "message": "start_x and start_y are required"}
-            if end_x is None or end_y is None:
-                return {"success": False, "message": "end_x and end_y are required"}
-
-            from commands.schematic import SchematicManager
-            from commands.connection_schematic import ConnectionManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
-            wire = ConnectionManager.add_wire(schematic, [start_x, start_y], [end_x, end_y])
+            wire = ConnectionManager.add_wire(schematic, (start_x, start_y), (end_x, end_y))
 
             if wire:
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path)
 
                 if save_success:
+                    _keep_cached(save_path, schematic)
                     return {
                         "success": True,
                         "message": f"Added wire from ({start_x}, {start_y}) to ({end_x}, {end_y})",
@@ -1357,11 +2130,10 @@ class KiCADInterface:
                 return {"success": False, "message": "Failed to add wire"}
 
         except Exception as e:
-            logger.error(f"Error adding wire: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding wire: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "text", "x", "y")
     def _handle_add_label(self, params):
         """Add label to schematic"""
         logger.info("Adding label to schematic")
@@ -1373,28 +2145,18 @@ class KiCADInterface:
             label_type = params.get("label_type", "label")
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not text:
-                return {"success": False, "message": "text is required"}
-            if x is None or y is None:
-                return {"success": False, "message": "x and y coordinates are required"}
-
-            from commands.schematic import SchematicManager
-            from commands.connection_schematic import ConnectionManager
-            from commands.component_schematic import ComponentManager
-
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True, fresh=False)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
             label = ConnectionManager.add_label(schematic, text, x, y, label_type)
 
             if label:
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path)
 
                 if save_success:
+                    _keep_cached(save_path, schematic)
                     return {
                         "success": True,
                         "message": f"Added {label_type} '{text}' at ({x}, {y})",
@@ -1407,11 +2169,33 @@ class KiCADInterface:
                 return {"success": False, "message": "Failed to add label"}
 
         except Exception as e:
-            logger.error(f"Error adding label: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error adding label: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
+    @require_params("file_path", "net_name")
+    def _handle_get_net_connections(self, params):
+        """Get the labels and wires that make up a named net"""
+        logger.info("Getting net connections")
+        try:
+            file_path = params.get("file_path")
+            net_name = params.get("net_name")
+
+            schematic = _load_cached(file_path, fresh=False)
+            if not schematic:
+                return {"success": False, "message": "Failed to load schematic"}
+
+            connections = ConnectionManager.get_net_connections(schematic, net_name)
+            return {
+                "success": True,
+                "net_name": net_name,
+                "count": len(connections),
+                "connections": connections
+            }
+        except Exception as e:
+            logger.error("Error getting net connections: %s", e, exc_info=_DEBUG)
+            return {"success": False, "message": str(e)}
+
+    @require_params("file_path", "circuit_type")
     def _handle_create_circuit(self, params):
         """Create complete circuit (high-level function)"""
         logger.info("Creating circuit")
@@ -1421,32 +2205,26 @@ class KiCADInterface:
             parameters = params.get("parameters", {})
             output_path = params.get("output_path")
 
-            if not file_path:
-                return {"success": False, "message": "file_path is required"}
-            if not circuit_type:
-                return {"success": False, "message": "circuit_type is required"}
-
-            from commands.schematic import SchematicManager
-            from commands.connection_schematic import ConnectionManager
-            from commands.component_schematic import ComponentManager
+            # Reject unknown types before paying for the load
+            if circuit_type not in _SUPPORTED_CIRCUITS:
+                return {
+                    "success": False,
+                    "message": f"Unknown circuit type: {circuit_type}",
+                    "supported_types": sorted(_SUPPORTED_CIRCUITS)
+                }
 
-            schematic = SchematicManager.load_schematic(file_path)
+            schematic = _load_cached(file_path, take=True)
             if not schematic:
                 return {"success": False, "message": "Failed to load schematic"}
 
             # Route to specific circuit creation function
             if circuit_type == "voltage_divider":
                 result = ConnectionManager.create_voltage_divider_circuit(schematic, parameters)
-            else:
-                return {
-                    "success": False,
-                    "message": f"Unknown circuit type: {circuit_type}",
-                    "supported_types": ["voltage_divider"]
-                }
 
             if result.get("success"):
-                save_path = output_path if output_path else file_path
-                save_success = ComponentManager.save_schematic_with_tree(schematic, save_path)
+                save_path = output_path or file_path
+                save_success = _save_edited(schematic, save_path, splices_symbols=True)
+                _evict_cached(save_path)
 
                 if save_success:
                     result["file_path"] = save_path
@@ -1458,18 +2236,21 @@ class KiCADInterface:
                 return result
 
         except Exception as e:
-            logger.error(f"Error creating circuit: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Error creating circuit: %s", e, exc_info=_DEBUG)
             return {"success": False, "message": str(e)}
 
     def _handle_check_kicad_ui(self, params):
         """Check if KiCAD UI is running"""
         logger.info("Checking if KiCAD UI is running")
         try:
-            manager = KiCADProcessManager()
-            is_running = manager.is_running()
-            processes = manager.get_process_info() if is_running else []
+            global _last_check
+            checked_at, is_running, processes = _last_check
+            now = time.monotonic()
+            if now - checked_at >= _CHECK_CACHE_TTL:
+                manager = self._process_manager
+                is_running = manager.is_running()
+                processes = manager.get_process_info() if is_running else []
+                _last_check = (now, is_running, processes)
 
             return {
                 "success": True,
@@ -1478,7 +2259,7 @@ class KiCADInterface:
                 "message": "KiCAD is running" if is_running else "KiCAD is not running"
             }
         except Exception as e:
-            logger.error(f"Error checking KiCAD UI status: {str(e)}")
+            logger.error("Error checking KiCAD UI status: %s", e)
             return {"success": False, "message": str(e)}
 
     def _handle_launch_kicad_ui(self, params):
@@ -1489,194 +2270,296 @@ class KiCADInterface:
             auto_launch = params.get("autoLaunch", AUTO_LAUNCH_KICAD)
 
             # Convert project path to Path object if provided
-            from pathlib import Path
             path_obj = Path(project_path) if project_path else None
 
-            result = check_and_launch_kicad(path_obj, auto_launch)
+            global _last_launch, _last_check
+            checked_at, last_path, last_auto_launch, result = _last_launch
+            now = time.monotonic()
+            if (now - checked_at >= _LAUNCH_CACHE_TTL or last_path != path_obj
+                    or last_auto_launch != auto_launch):
+                result = check_and_launch_kicad(path_obj, auto_launch)
+                _last_launch = (now, path_obj, auto_launch, result)
+                _last_check = (now, result["running"], result["processes"])
 
             return {
                 "success": True,
                 **result
             }
         except Exception as e:
-            logger.error(f"Error launching KiCAD UI: {str(e)}")
+            logger.error("Error launching KiCAD UI: %s", e)
             return {"success": False, "message": str(e)}
 
+def _handle_legacy_message(interface, command_data):
+    """Run one message in the legacy {"command", "params"} format"""
+    command = command_data.get("command") if isinstance(command_data, dict) else None
+    if not command:
+        logger.error("Missing command field")
+        return {
+            "success": False,
+            "message": "Missing command",
+            "errorDetails": "The command field is required"
+        }
+    with _COMMAND_LOCK:
+        return interface.handle_command(command, command_data.get("params", {}))
+
+
+# The initialize result never changes; only the response id does
+_INITIALIZE_RESULT = {
+    'protocolVersion': '2025-06-18',
+    'capabilities': {
+        'tools': {
+            'listChanged': True
+        },
+        'resources': {
+            'subscribe': False,
+            'listChanged': True
+        }
+    },
+    'serverInfo': {
+        'name': 'kicad-mcp-server',
+        'title': 'KiCAD PCB Design Assistant',
+        'version': '2.1.0-alpha'
+    },
+    'instructions': 'AI-assisted PCB design with KiCAD. Use tools to create projects, design boards, place components, route traces, and export manufacturing files.'
+}
+
+
+def _rpc_initialize(interface, params, request_id):
+    """MCP initialize: server info and capabilities"""
+    logger.info("Handling MCP initialize")
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'result': _INITIALIZE_RESULT
+    }
+
+
+def _rpc_tools_list(interface, params, request_id):
+    """MCP tools/list: a definition for every routed command"""
+    logger.info("Handling MCP tools/list")
+    # Return list of available tools with proper schemas
+    tools = interface.tool_definitions
+    logger.info("Returning %d tools", len(tools))
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'result': {
+            'tools': tools
+        }
+    }
+
+
+def _rpc_tools_call(interface, params, request_id):
+    """MCP tools/call: run a command, returning its result as text content
+
+    The response is returned already encoded. The result's JSON is ASCII
+    without raw control characters, so quoting it as the text string only
+    means escaping backslashes and quotes; there is no need to decode it
+    and have the encoder scan it a second time.
+    """
+    logger.info("Handling MCP tools/call")
+    tool_name = params.get('name')
+    tool_params = params.get('arguments', {})
+
+    # Execute the command
+    result = interface.handle_command(tool_name, tool_params)
+
+    text = _json_bytes(result).replace(b'\\', b'\\\\').replace(b'"', b'\\"')
+    return b''.join((
+        b'{"jsonrpc":"2.0","id":', _json_bytes(request_id),
+        b',"result":{"content":[{"type":"text","text":"', text, b'"}]}}',
+    ))
+
+
+def _rpc_resources_list(interface, params, request_id):
+    """MCP resources/list"""
+    logger.info("Handling MCP resources/list")
+    # Return list of available resources
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'result': {
+            'resources': RESOURCE_DEFINITIONS
+        }
+    }
+
+
+def _rpc_resources_read(interface, params, request_id):
+    """MCP resources/read"""
+    logger.info("Handling MCP resources/read")
+    resource_uri = params.get('uri')
+
+    if not resource_uri:
+        return {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'error': {
+                'code': -32602,
+                'message': 'Missing required parameter: uri'
+            }
+        }
+    else:
+        # Read the resource
+        resource_data = handle_resource_read(resource_uri, interface)
+
+        return {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'result': resource_data
+        }
+
+
+def _rpc_method_not_found(method, request_id):
+    """Error response for an unknown JSON-RPC method"""
+    logger.error("Unknown JSON-RPC method: %s", method)
+    return {
+        'jsonrpc': '2.0',
+        'id': request_id,
+        'error': {
+            'code': -32601,
+            'message': f'Method not found: {method}'
+        }
+    }
+
+
+# With KICAD_MCP_WORKERS set, tools/call requests run on worker threads and
+# their responses may go out of order (clients match them up by id). The
+# handlers share the board, pcbnew and the schematic caches, none of which
+# are thread-safe, so commands take _COMMAND_LOCK one at a time, except
+# these, which only run external processes or check process state.
+_CONCURRENT_COMMANDS = frozenset(("check_kicad_ui", "export_schematic_pdf", "export_schematics_pdf"))
+
+
+def _serve_tools_call(interface, params, request_id, framed):
+    """Run a tools/call on a worker thread and send its response"""
+    try:
+        # Batches are flushed by handle_command, which needs the lock
+        if params.get('name') in _CONCURRENT_COMMANDS and not _OPEN_BATCHES:
+            response = _rpc_tools_call(interface, params, request_id)
+        else:
+            with _COMMAND_LOCK:
+                response = _rpc_tools_call(interface, params, request_id)
+    except Exception as e:
+        logger.exception("Error handling tools/call: %s", e)
+        response = {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'error': {
+                'code': -32603,
+                'message': str(e)
+            }
+        }
+    _send_response(response, framed)
+
+
+# JSON-RPC (MCP) method -> handler(interface, params, request_id)
+_RPC_METHODS = {
+    'initialize': _rpc_initialize,
+    'tools/list': _rpc_tools_list,
+    'tools/call': _rpc_tools_call,
+    'resources/list': _rpc_resources_list,
+    'resources/read': _rpc_resources_read,
+}
+
+
 def main():
     """Main entry point"""
     logger.info("Starting KiCAD interface...")
     interface = KiCADInterface()
+    pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS) if TOOL_WORKERS else None
+    in_flight = []
 
     try:
         logger.info("Processing commands from stdin...")
+        if pool is not None:
+            logger.info("Running tool calls on %d worker threads", TOOL_WORKERS)
+        # Bound once; the loop below runs for every message
+        loads = _json_loads
+        debug = logger.debug
+        debug_enabled = logger.isEnabledFor
+        info = logger.info
+        send_response = _send_response
+        handle_legacy_message = _handle_legacy_message
+        rpc_method = _RPC_METHODS.get
         # Process commands from stdin
-        for line in sys.stdin:
+        for line, framed in _read_messages(_open_stdin()):
             try:
                 # Parse command
-                logger.debug(f"Received input: {line.strip()}")
-                command_data = json.loads(line)
-
-                # Check if this is JSON-RPC 2.0 format
-                if 'jsonrpc' in command_data and command_data['jsonrpc'] == '2.0':
-                    logger.info("Detected JSON-RPC 2.0 format message")
-                    method = command_data.get('method')
-                    params = command_data.get('params', {})
-                    request_id = command_data.get('id')
-
-                    # Handle MCP protocol methods
-                    if method == 'initialize':
-                        logger.info("Handling MCP initialize")
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request_id,
-                            'result': {
-                                'protocolVersion': '2025-06-18',
-                                'capabilities': {
-                                    'tools': {
-                                        'listChanged': True
-                                    },
-                                    'resources': {
-                                        'subscribe': False,
-                                        'listChanged': True
-                                    }
-                                },
-                                'serverInfo': {
-                                    'name': 'kicad-mcp-server',
-                                    'title': 'KiCAD PCB Design Assistant',
-                                    'version': '2.1.0-alpha'
-                                },
-                                'instructions': 'AI-assisted PCB design with KiCAD. Use tools to create projects, design boards, place components, route traces, and export manufacturing files.'
-                            }
-                        }
-                    elif method == 'tools/list':
-                        logger.info("Handling MCP tools/list")
-                        # Return list of available tools with proper schemas
-                        tools = []
-                        for cmd_name in interface.command_routes.keys():
-                            # Get schema from TOOL_SCHEMAS if available
-                            if cmd_name in TOOL_SCHEMAS:
-                                tool_def = TOOL_SCHEMAS[cmd_name].copy()
-                                tools.append(tool_def)
-                            else:
-                                # Fallback for tools without schemas
-                                logger.warning(f"No schema defined for tool: {cmd_name}")
-                                tools.append({
-                                    'name': cmd_name,
-                                    'description': f'KiCAD command: {cmd_name}',
-                                    'inputSchema': {
-                                        'type': 'object',
-                                        'properties': {}
-                                    }
-                                })
-
-                        logger.info(f"Returning {len(tools)} tools")
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request_id,
-                            'result': {
-                                'tools': tools
-                            }
-                        }
-                    elif method == 'tools/call':
-                        logger.info("Handling MCP tools/call")
-                        tool_name = params.get('name')
-                        tool_params = params.get('arguments', {})
-
-                        # Execute the command
-                        result = interface.handle_command(tool_name, tool_params)
-
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request_id,
-                            'result': {
-                                'content': [
-                                    {
-                                        'type': 'text',
-                                        'text': json.dumps(result)
-                                    }
-                                ]
-                            }
-                        }
-                    elif method == 'resources/list':
-                        logger.info("Handling MCP resources/list")
-                        # Return list of available resources
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request_id,
-                            'result': {
-                                'resources': RESOURCE_DEFINITIONS
-                            }
-                        }
-                    elif method == 'resources/read':
-                        logger.info("Handling MCP resources/read")
-                        resource_uri = params.get('uri')
-
-                        if not resource_uri:
-                            response = {
-                                'jsonrpc': '2.0',
-                                'id': request_id,
-                                'error': {
-                                    'code': -32602,
-                                    'message': 'Missing required parameter: uri'
-                                }
-                            }
+                if debug_enabled(logging.DEBUG):
+                    debug("Received input: %s", _SafeRepr(line.strip()))
+                command_data = loads(line)
+
+                if pool is not None:
+                    match command_data:
+                        case {'jsonrpc': '2.0', 'method': 'tools/call'}:
+                            in_flight = [future for future in in_flight if not future.done()]
+                            in_flight.append(pool.submit(
+                                _serve_tools_call, interface, command_data.get('params', {}),
+                                command_data.get('id'), framed))
+                            continue
+                    # Anything else runs once the calls before it are done
+                    for future in in_flight:
+                        future.result()
+                    in_flight.clear()
+
+                match command_data:
+                    # A top-level array is a batch of legacy commands
+                    case list():
+                        info("Detected batch of %d commands", len(command_data))
+                        response = [handle_legacy_message(interface, item) for item in command_data]
+
+                    # JSON-RPC 2.0 (MCP)
+                    case {'jsonrpc': '2.0'}:
+                        info("Detected JSON-RPC 2.0 format message")
+                        method = command_data.get('method')
+                        params = command_data.get('params', {})
+                        request_id = command_data.get('id')
+
+                        # Handle MCP protocol methods
+                        rpc_handler = rpc_method(method)
+                        if rpc_handler is not None:
+                            with _COMMAND_LOCK:
+                                response = rpc_handler(interface, params, request_id)
                         else:
-                            # Read the resource
-                            resource_data = handle_resource_read(resource_uri, interface)
-
-                            response = {
-                                'jsonrpc': '2.0',
-                                'id': request_id,
-                                'result': resource_data
-                            }
-                    else:
-                        logger.error(f"Unknown JSON-RPC method: {method}")
-                        response = {
-                            'jsonrpc': '2.0',
-                            'id': request_id,
-                            'error': {
-                                'code': -32601,
-                                'message': f'Method not found: {method}'
-                            }
-                        }
-                else:
-                    # Handle legacy custom format
-                    logger.info("Detected custom format message")
-                    command = command_data.get("command")
-                    params = command_data.get("params", {})
-
-                    if not command:
-                        logger.error("Missing command field")
-                        response = {
-                            "success": False,
-                            "message": "Missing command",
-                            "errorDetails": "The command field is required"
-                        }
-                    else:
-                        # Handle command
-                        response = interface.handle_command(command, params)
+                            response = _rpc_method_not_found(method, request_id)
+
+                    # Legacy custom format
+                    case {'params': {'stream': stream}} if stream:
+                        # Large list results (symbols, components, nets) can
+                        # be written out element by element on request
+                        info("Detected custom format message")
+                        response = handle_legacy_message(interface, command_data)
+                        debug("Streaming response")
+                        _send_streamed_response(response, framed)
+                        continue
+                    case _:
+                        info("Detected custom format message")
+                        response = handle_legacy_message(interface, command_data)
 
                 # Send response
-                logger.debug(f"Sending response: {response}")
-                print(json.dumps(response))
-                sys.stdout.flush()
+                debug("Sending response: %s", _SafeRepr(response))
+                send_response(response, framed)
 
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON input: {str(e)}")
+            except ValueError as e:
+                # JSONDecodeError (orjson's subclasses json's), or bad UTF-8
+                # with the stdlib fallback
+                logger.error("Invalid JSON input: %s", e)
                 response = {
                     "success": False,
                     "message": "Invalid JSON input",
                     "errorDetails": str(e)
                 }
-                print(json.dumps(response))
-                sys.stdout.flush()
+                send_response(response, framed)
+
+        if pool is not None:
+            pool.shutdown(wait=True)
 
     except KeyboardInterrupt:
         logger.info("KiCAD interface stopped")
         sys.exit(0)
 
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Unexpected error: %s\n%s", e, traceback.format_exc())
         sys.exit(1)
 
 if __name__ == "__main__":
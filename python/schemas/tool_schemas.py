@@ -1164,6 +1164,25 @@ SCHEMATIC_TOOLS = [
             "required": ["points"]
         }
     },
+    {
+        "name": "get_net_connections",
+        "title": "Get Net Connections",
+        "description": "Lists the labels and wires that make up a named net, following wires that share an endpoint with the net's labels.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to schematic file (.kicad_sch)"
+                },
+                "net_name": {
+                    "type": "string",
+                    "description": "Net label text (e.g., VCC, GND, VOUT)"
+                }
+            },
+            "required": ["file_path", "net_name"]
+        }
+    },
     {
         "name": "list_schematic_libraries",
         "title": "List Symbol Libraries",
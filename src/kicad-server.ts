@@ -278,6 +278,28 @@ class KiCADServer {
             },
             required: ['schematicPath', 'outputPath']
           }
+        },
+        {
+          name: 'export_schematics_pdf',
+          description: 'Export several KiCAD schematics to PDF in parallel',
+          inputSchema: {
+            type: 'object',
+            properties: {
+              jobs: {
+                type: 'array',
+                description: 'Schematics to export',
+                items: {
+                  type: 'object',
+                  properties: {
+                    schematicPath: { type: 'string', description: 'Path to the schematic file' },
+                    outputPath: { type: 'string', description: 'Path for the output PDF file' }
+                  },
+                  required: ['schematicPath', 'outputPath']
+                }
+              }
+            },
+            required: ['jobs']
+          }
         }
       ]
     }));
@@ -151,6 +151,85 @@ export function registerSchematicTools(server: McpServer, callKicadScript: Funct
     }
   );
 
+  // Update several symbol properties in one load/save
+  server.tool(
+    "update_symbol_properties",
+    "Update several properties of one or more symbols, saving the schematic once",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+      reference: z.string().optional().describe("Component reference, when updating a single symbol"),
+      properties: z.record(z.string()).optional().describe("Property name -> new value for that symbol"),
+      updates: z.array(z.object({
+        reference: z.string().describe("Component reference (e.g., R1, U1)"),
+        properties: z.record(z.string()).describe("Property name -> new value"),
+      })).optional().describe("Updates for several symbols (instead of reference/properties)"),
+      output_path: z.string().optional().describe("Optional output path (defaults to overwriting input)"),
+    },
+    async (args: { file_path: string; reference?: string; properties?: Record<string, string>; updates?: { reference: string; properties: Record<string, string> }[]; output_path?: string }) => {
+      const result = await callKicadScript("update_symbol_properties", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
+  // Defer schematic saves until end_batch
+  server.tool(
+    "begin_batch",
+    "Start a batch of edits to a schematic; edits are kept in memory until end_batch",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+    },
+    async (args: { file_path: string }) => {
+      const result = await callKicadScript("begin_batch", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
+  // Write a batched schematic's edits so far, keeping the batch open
+  server.tool(
+    "commit_batch",
+    "Save the edits made since begin_batch (or the last commit_batch) and keep batching further edits",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+    },
+    async (args: { file_path: string }) => {
+      const result = await callKicadScript("commit_batch", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
+  // Write a batched schematic once
+  server.tool(
+    "end_batch",
+    "Save all edits made since begin_batch to the schematic in one write",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+    },
+    async (args: { file_path: string }) => {
+      const result = await callKicadScript("end_batch", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
   // Add symbol with exact coordinates (Method 1)
   server.tool(
     "add_symbol",
@@ -208,6 +287,38 @@ export function registerSchematicTools(server: McpServer, callKicadScript: Funct
     }
   );
 
+  // Add several symbols with automatic grid positioning (Method 2)
+  server.tool(
+    "add_symbols_auto",
+    "Add several symbols/components at successive free grid positions in one call",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+      components: z.array(
+        z.object({
+          lib_id: z.string().describe("Library ID (e.g., Device:R)"),
+          reference: z.string().describe("Component reference (e.g., R1)"),
+          value: z.string().describe("Component value (e.g., 10k)"),
+          rotation: z.number().optional().describe("Rotation angle in degrees (default: 0)"),
+          footprint: z.string().optional().describe("Footprint library ID"),
+          datasheet: z.string().optional().describe("Datasheet URL or path"),
+        })
+      ).describe("Array of components to add"),
+      grid_x: z.number().optional().describe("Starting grid X position (default: 0)"),
+      grid_y: z.number().optional().describe("Starting grid Y position (default: 0)"),
+      grid_size: z.number().optional().describe("Grid size in mm (default: 50.8 = 2 inches)"),
+      output_path: z.string().optional().describe("Optional output path (defaults to overwriting input)"),
+    },
+    async (args: { file_path: string; components: Array<{lib_id: string; reference: string; value: string; rotation?: number; footprint?: string; datasheet?: string}>; grid_x?: number; grid_y?: number; grid_size?: number; output_path?: string }) => {
+      const result = await callKicadScript("add_symbols_auto", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
   // Add symbol relative to another component (Method 3)
   server.tool(
     "add_symbol_relative",
@@ -373,6 +484,25 @@ export function registerSchematicTools(server: McpServer, callKicadScript: Funct
     }
   );
 
+  // Labels and wires of a named net
+  server.tool(
+    "get_net_connections",
+    "Get the labels and wires that make up a named net, following wires connected end to end from its labels",
+    {
+      file_path: z.string().describe("Path to the .kicad_sch file"),
+      net_name: z.string().describe("Net label text (e.g., 'VCC', 'GND', 'VOUT')"),
+    },
+    async (args: { file_path: string; net_name: string }) => {
+      const result = await callKicadScript("get_net_connections", args);
+      return {
+        content: [{
+          type: "text",
+          text: JSON.stringify(result, null, 2)
+        }]
+      };
+    }
+  );
+
   // Create complete circuit (high-level function)
   server.tool(
     "create_circuit",
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for tests that drive kicad_interface
+
+kicad_interface imports pcbnew at module level, but the schematic commands
+and the stdio protocol layer never use it. Where KiCAD isn't installed a
+bare pcbnew module is registered so those tests can still run.
+"""
+import importlib.util
+import shutil
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path to import kicad_interface and commands
+sys.path.insert(0, str(Path(__file__).parent.parent / "python"))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def ki():
+    """The kicad_interface module"""
+    stand_in = None
+    if "pcbnew" not in sys.modules and importlib.util.find_spec("pcbnew") is None:
+        stand_in = types.ModuleType("pcbnew")
+        stand_in.__file__ = "<not installed>"
+        stand_in.GetBuildVersion = lambda: "not installed"
+        sys.modules["pcbnew"] = stand_in
+    import kicad_interface
+    if stand_in is not None and sys.modules.get("pcbnew") is stand_in:
+        # Only kicad_interface's import needs it; tests that check for a
+        # real KiCAD install must still see that there is none
+        del sys.modules["pcbnew"]
+    return kicad_interface
+
+
+@pytest.fixture
+def interface(ki):
+    """A KiCADInterface, with the module-level schematic state reset afterwards"""
+    yield ki.KiCADInterface()
+    for batch in ki._OPEN_BATCHES.values():
+        if batch.timer is not None:
+            batch.timer.cancel()
+    ki._OPEN_BATCHES.clear()
+    ki._SCHEMATIC_CACHE.clear()
+    ki._SYMBOL_SPANS.clear()
+
+
+@pytest.fixture
+def schematic_file(tmp_path):
+    """A scratch copy of fixtures/basic.kicad_sch: R1, one wire and a "NET (a)" label"""
+    path = tmp_path / "basic.kicad_sch"
+    shutil.copyfile(FIXTURES_DIR / "basic.kicad_sch", path)
+    return str(path)
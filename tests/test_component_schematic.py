@@ -0,0 +1,226 @@
+"""
+Tests for symbol library loading in ComponentManager
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+from skip import Schematic
+
+import commands.component_schematic as component_schematic
+from commands.component_schematic import ComponentManager
+
+LIBRARIES = {
+    "Device": '''(kicad_symbol_lib (version 20231120) (generator "test")
+  (symbol "R" (pin_numbers hide)
+    (property "Reference" "R" (at 2.032 0 90) (effects (font (size 1.27 1.27))))
+    (property "Description" "Resistor \\"(any)\\"" (at 0 0 0))
+    (symbol "R_1_1"
+      (pin passive line (at 0 3.81 270) (length 1.27) (name "~") (number "1"))
+      (pin passive line (at 0 -3.81 90) (length 1.27) (name "~") (number "2"))))
+  (symbol "C" (property "Reference" "C" (at 0.635 2.54 0)))
+)
+''',
+    "power": '''(kicad_symbol_lib (version 20231120) (generator "test")
+  (symbol "GND" (power) (property "Reference" "#PWR" (at 0 -6.35 0)))
+  (symbol "+5V" (power) (property "Value" "+5V" (at 0 3.556 0)))
+)
+''',
+}
+
+
+@pytest.fixture
+def libraries(tmp_path, monkeypatch):
+    """Two symbol libraries in a scratch directory, with empty caches"""
+    lib_dir = tmp_path / "symbols"
+    lib_dir.mkdir()
+    for name, content in LIBRARIES.items():
+        (lib_dir / f"{name}.kicad_sym").write_text(content, encoding="utf-8")
+    monkeypatch.setattr(ComponentManager, "KICAD_SYMBOL_LIB_PATH", str(lib_dir))
+    monkeypatch.setattr(component_schematic, "_INDEX_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(component_schematic, "_LIB_CACHE", {})
+    return {name: str(lib_dir / f"{name}.kicad_sym") for name in LIBRARIES}
+
+
+class TestPrewarmLibraries:
+    """prewarm_libraries parses libraries in worker processes"""
+
+    def test_off_by_default(self, libraries, monkeypatch):
+        """Without KICAD_MCP_PARSE_WORKERS nothing is parsed up front"""
+        monkeypatch.setattr(component_schematic, "PARSE_WORKERS", 0)
+        ComponentManager.prewarm_libraries(["Device:R", "power:GND"])
+        assert component_schematic._LIB_CACHE == {}
+
+    def test_matches_serial_parse(self, libraries, monkeypatch):
+        """The indexes parsed by the workers equal the in-process parse"""
+        monkeypatch.setattr(component_schematic, "PARSE_WORKERS", 2)
+        ComponentManager.prewarm_libraries(["Device:R", "power:GND"])
+        for lib_file in libraries.values():
+            cached = component_schematic._LIB_CACHE[lib_file]
+            assert cached[0] == os.stat(lib_file).st_mtime
+            assert cached[1] == component_schematic._parse_kicad_sym_file(lib_file)
+        assert sorted(component_schematic._LIB_CACHE[libraries["Device"]][1]) == ["C", "R"]
+
+
+class TestLibraryIndexCache:
+    """Pickled name indexes live in the per-user cache directory"""
+
+    def test_round_trip(self, libraries, tmp_path):
+        """An index written for a library is read back for it, and only for it"""
+        lib_file = libraries["Device"]
+        lib_stat = os.stat(lib_file)
+        name_index = component_schematic._parse_kicad_sym_file(lib_file)
+        component_schematic._write_library_index(lib_file, lib_stat, name_index)
+
+        # Nothing is written next to the libraries
+        assert sorted(os.listdir(os.path.dirname(lib_file))) == ["Device.kicad_sym", "power.kicad_sym"]
+        assert len(os.listdir(tmp_path / "cache")) == 1
+        assert component_schematic._read_library_index(lib_file, lib_stat) == name_index
+        assert component_schematic._read_library_index(libraries["power"], os.stat(libraries["power"])) is None
+
+    def test_unreadable_cache_is_discarded(self, libraries):
+        """A pickle that no longer loads is a miss, and the file is removed"""
+        lib_file = libraries["Device"]
+        cache_path = component_schematic._index_cache_path(lib_file)
+        os.makedirs(os.path.dirname(cache_path))
+        # Pickled reference to a class in a module that no longer exists
+        with open(cache_path, "wb") as f:
+            f.write(b"cmoved_index\nIndex\n.")
+        assert component_schematic._read_library_index(lib_file, os.stat(lib_file)) is None
+        assert not os.path.exists(cache_path)
+
+        # The library still resolves, and a fresh index is written
+        assert ComponentManager._load_library(lib_file, os.stat(lib_file).st_mtime)
+        assert component_schematic._read_library_index(lib_file, os.stat(lib_file)) is not None
+
+    def test_other_format_ignored(self, libraries, monkeypatch):
+        """An index written by a different format version is not used"""
+        lib_file = libraries["Device"]
+        lib_stat = os.stat(lib_file)
+        component_schematic._write_library_index(lib_file, lib_stat, {"R": []})
+        monkeypatch.setattr(component_schematic, "_INDEX_FORMAT", component_schematic._INDEX_FORMAT + 1)
+        assert component_schematic._read_library_index(lib_file, lib_stat) is None
+
+
+class TestAddSymbolsAuto:
+    """add_symbols_auto places several components in one pass"""
+
+    def test_distinct_free_positions(self, interface, schematic_file):
+        """Each component gets its own cell, clear of the existing R1"""
+        result = interface.handle_command("add_symbols_auto", {
+            "file_path": schematic_file,
+            "components": [
+                {"lib_id": "Device:R", "reference": f"R{n}", "value": "1k"} for n in (2, 3, 4)
+            ],
+        })
+        assert result["success"], result
+        assert [c["reference"] for c in result["components"]] == ["R2", "R3", "R4"]
+        positions = [(c["position"]["x"], c["position"]["y"]) for c in result["components"]]
+        assert len(set(positions)) == 3
+        assert (50.8, 50.8) not in positions
+
+        with open(schematic_file, encoding="utf-8") as f:
+            content = f.read()
+        assert all(f'"R{n}"' in content for n in (2, 3, 4))
+
+    def test_requires_components(self, interface, schematic_file):
+        """An empty components list is rejected"""
+        result = interface.handle_command("add_symbols_auto", {
+            "file_path": schematic_file, "components": []
+        })
+        assert not result["success"]
+
+
+class TestFindSymbolByRef:
+    """The cached reference index is checked against the live Reference property"""
+
+    def test_rename_outside_component_manager(self, schematic_file):
+        """A reference changed directly on the symbol is picked up on the next lookup"""
+        schematic = Schematic(schematic_file)
+        symbol = ComponentManager._find_symbol_by_ref(schematic, "R1")
+        assert symbol is not None
+
+        symbol.property.Reference.value = "R9"
+        assert ComponentManager._find_symbol_by_ref(schematic, "R1") is None
+        assert ComponentManager._find_symbol_by_ref(schematic, "R9") is symbol
+
+    def test_rename_through_update_component(self, schematic_file):
+        """update_component re-keys the index under the new designator"""
+        schematic = Schematic(schematic_file)
+        symbol = ComponentManager._find_symbol_by_ref(schematic, "R1")
+        assert ComponentManager.update_component(schematic, "R1", {"Reference": "R5"})
+        assert ComponentManager._find_symbol_by_ref(schematic, "R1") is None
+        assert ComponentManager._find_symbol_by_ref(schematic, "R5") is symbol
+
+
+class TestUpdateSymbolProperties:
+    """update_symbol_properties applies all of its updates or none of them"""
+
+    @staticmethod
+    def snapshot(path):
+        with open(path, "rb") as f:
+            return f.read(), os.stat(path).st_mtime_ns
+
+    def update(self, interface, path, updates):
+        return interface.handle_command("update_symbol_properties", {"file_path": path, "updates": updates})
+
+    def test_applies_all(self, interface, schematic_file):
+        """A rename and a later update of the renamed symbol land in one save"""
+        result = self.update(interface, schematic_file, [
+            {"reference": "R1", "properties": {"Reference": "R7"}},
+            {"reference": "R7", "properties": {"Value": "22k"}},
+        ])
+        assert result["success"], result
+        symbol = Schematic(schematic_file).symbol[0]
+        assert symbol.property.Reference.value == "R7"
+        assert symbol.property.Value.value == "22k"
+
+    def test_unknown_reference_leaves_file_untouched(self, interface, schematic_file):
+        """An unknown reference later in the list fails before anything is written"""
+        before = self.snapshot(schematic_file)
+        result = self.update(interface, schematic_file, [
+            {"reference": "R1", "properties": {"Value": "22k"}},
+            {"reference": "R99", "properties": {"Value": "1k"}},
+        ])
+        assert not result["success"]
+        assert "R99" in result["message"]
+        assert self.snapshot(schematic_file) == before
+
+    @pytest.mark.parametrize("updates", [[], "R1", ["R1"], [{"reference": "R1", "properties": ["Value"]}]])
+    def test_malformed_updates(self, interface, schematic_file, updates):
+        """updates must be a non-empty list of {reference, properties} objects"""
+        before = self.snapshot(schematic_file)
+        assert not self.update(interface, schematic_file, updates)["success"]
+        assert self.snapshot(schematic_file) == before
+
+    def test_no_change_skips_save(self, interface, schematic_file):
+        """Setting values a symbol already has doesn't rewrite the file"""
+        before = self.snapshot(schematic_file)
+        result = self.update(interface, schematic_file, [{"reference": "R1", "properties": {"Value": "10k"}}])
+        assert result["success"], result
+        assert result["message"] == "No properties changed"
+        assert self.snapshot(schematic_file) == before
+
+
+class TestSearchCache:
+    """search_components reads symbol fields once per schematic"""
+
+    class Unreadable:
+        """A symbol whose properties raise on access"""
+
+        @property
+        def property(self):
+            raise RuntimeError("malformed symbol")
+
+    def test_unreadable_symbol_keeps_cache(self):
+        """A symbol left out of the cache doesn't force a rebuild on every search"""
+        resistor = SimpleNamespace(
+            property=SimpleNamespace(Reference=SimpleNamespace(value="R1"), Value=SimpleNamespace(value="10k")),
+            lib_id=SimpleNamespace(value="Device:R"),
+        )
+        schematic = SimpleNamespace(symbol=[resistor, self.Unreadable()])
+
+        cache = ComponentManager._get_search_cache(schematic)
+        assert [entry[0] for entry in cache] == ["r1"]
+        assert ComponentManager._get_search_cache(schematic) is cache
+        assert ComponentManager.search_components(schematic, "10K") == [resistor]
@@ -0,0 +1,129 @@
+"""
+Tests for the net walker in ConnectionManager (get_net_connections, wires_at)
+"""
+import pytest
+
+from skip import Schematic
+
+import commands.connection_schematic as connection_schematic
+from commands.connection_schematic import ConnectionManager, _tree_changed
+
+
+@pytest.fixture
+def schematic(schematic_file):
+    """The fixture schematic: wire (10,10)-(20,10) with label "NET (a)" at its end"""
+    return Schematic(schematic_file)
+
+
+def wire_ends(connections):
+    return sorted((tuple(c["start"]), tuple(c["end"])) for c in connections if c["type"] == "wire")
+
+
+class TestGetNetConnections:
+    """get_net_connections follows wires end to end from a net's labels"""
+
+    def test_label_and_wire(self, schematic):
+        """The fixture's label and the wire ending at it form the net"""
+        connections = ConnectionManager.get_net_connections(schematic, "NET (a)")
+        assert [c["type"] for c in connections] == ["label", "wire"]
+        assert connections[0]["position"] == [20, 10]
+        assert wire_ends(connections) == [((10, 10), (20, 10))]
+
+    def test_follows_chained_wires(self, schematic):
+        """Wires sharing endpoints are followed transitively; others are not"""
+        ConnectionManager.add_wire(schematic, (20, 10), (30, 10))
+        ConnectionManager.add_wire(schematic, (30, 10), (30, 20))
+        ConnectionManager.add_wire(schematic, (50, 50), (60, 60))
+        connections = ConnectionManager.get_net_connections(schematic, "NET (a)")
+        assert wire_ends(connections) == [((10, 10), (20, 10)), ((20, 10), (30, 10)), ((30, 10), (30, 20))]
+
+    def test_unknown_net(self, schematic):
+        """A net without labels has no connections"""
+        assert ConnectionManager.get_net_connections(schematic, "NOPE") == []
+
+    def test_sees_nodes_added_after_first_query(self, schematic):
+        """Wires and labels added after the index was built are included"""
+        ConnectionManager.get_net_connections(schematic, "NET (a)")
+        ConnectionManager.add_label(schematic, "NET (a)", 100, 100)
+        ConnectionManager.add_wire(schematic, (100, 100), (110, 100))
+        connections = ConnectionManager.get_net_connections(schematic, "NET (a)")
+        assert [c["type"] for c in connections].count("label") == 2
+        assert ((100, 100), (110, 100)) in wire_ends(connections)
+
+    def test_in_place_replacement(self, schematic):
+        """Replacing a wire without changing the tree length is seen after _tree_changed"""
+        ConnectionManager.get_net_connections(schematic, "NET (a)")
+        old_wire = ConnectionManager.wires_at(schematic, 10, 10)[0]
+        new_wire = ConnectionManager.add_wire(schematic, (0, 10), (20, 10), insert=False)
+        tree = schematic.tree
+        tree[tree.index(old_wire)] = new_wire
+        _tree_changed(schematic)
+
+        connections = ConnectionManager.get_net_connections(schematic, "NET (a)")
+        assert wire_ends(connections) == [((0, 10), (20, 10))]
+        assert ConnectionManager.wires_at(schematic, 10, 10) == []
+
+
+class TestWiresAt:
+    """wires_at looks up wires by endpoint"""
+
+    def test_matches_either_end(self, schematic):
+        """Both endpoints find the wire, to within 0.01 units"""
+        assert len(ConnectionManager.wires_at(schematic, 10, 10)) == 1
+        assert len(ConnectionManager.wires_at(schematic, 20.001, 10)) == 1
+        assert ConnectionManager.wires_at(schematic, 15, 10) == []
+
+
+class TestGetNetConnectionsCommand:
+    """The get_net_connections command"""
+
+    def test_command(self, interface, schematic_file):
+        """The command returns the connections as JSON-friendly dicts"""
+        interface.handle_command("add_wire", {
+            "file_path": schematic_file, "start_x": 20, "start_y": 10, "end_x": 20, "end_y": 30
+        })
+        result = interface.handle_command("get_net_connections", {
+            "file_path": schematic_file, "net_name": "NET (a)"
+        })
+        assert result["success"], result
+        assert result["count"] == 3
+        assert wire_ends(result["connections"]) == [((10, 10), (20, 10)), ((20, 10), (20, 30))]
+
+    def test_requires_net_name(self, interface, schematic_file):
+        """net_name is required"""
+        result = interface.handle_command("get_net_connections", {"file_path": schematic_file})
+        assert result == {"success": False, "message": "net_name is required"}
+
+
+class TestVoltageDivider:
+    """create_voltage_divider_circuit reports success from the symbol placements"""
+
+    def test_all_steps_succeed(self, schematic, monkeypatch):
+        """With every symbol placed, the circuit and each step report success"""
+        monkeypatch.setattr(connection_schematic.ComponentManager, "add_component_sexpr",
+                            lambda *args, **kwargs: True)
+        result = ConnectionManager.create_voltage_divider_circuit(schematic, {})
+        assert result["success"], result
+        assert len(result["results"]) == 4 + len(connection_schematic._VDIV_WIRES + connection_schematic._VDIV_LABELS)
+        assert all(step["success"] for step in result["results"])
+
+    def test_failed_symbol(self, schematic, monkeypatch):
+        """A symbol that can't be placed fails the circuit and its own step only"""
+        monkeypatch.setattr(connection_schematic.ComponentManager, "add_component_sexpr",
+                            lambda schematic, lib_id, *args, **kwargs: lib_id != "power:GND")
+        result = ConnectionManager.create_voltage_divider_circuit(schematic, {})
+        assert not result["success"]
+        failed = [step["component"] for step in result["results"] if not step["success"]]
+        assert failed == ["GND power symbol"]
+
+    def test_failed_wire(self, schematic, monkeypatch):
+        """A wire that can't be built surfaces as an error response"""
+        def broken_wire(*args, **kwargs):
+            raise ValueError("bad wire")
+
+        monkeypatch.setattr(connection_schematic.ComponentManager, "add_component_sexpr",
+                            lambda *args, **kwargs: True)
+        monkeypatch.setattr(ConnectionManager, "add_wire", broken_wire)
+        result = ConnectionManager.create_voltage_divider_circuit(schematic, {})
+        assert not result["success"]
+        assert result["error"] == "bad wire"
@@ -0,0 +1,120 @@
+"""
+Tests for delete_symbol/delete_symbols, which cut placed symbols out of the file text
+"""
+import pytest
+from skip import Schematic
+
+# Extra placed symbols: R2's Description quotes another symbol's Reference
+# form and has unbalanced parens, both inside its string value
+EXTRA_SYMBOLS = '''	(symbol
+		(lib_id "Device:R")
+		(at 76.2 50.8 0)
+		(unit 1)
+		(uuid "aaaaaaaa-0000-4d5e-8f90-000000000002")
+		(property "Reference" "R2" (at 78 50 0) (effects (font (size 1.27 1.27))))
+		(property "Value" "4k7" (at 78 52 0) (effects (font (size 1.27 1.27))))
+		(property "Description" "copy of (property \\"Reference\\" \\"R3\\") ((( ) (" (at 76.2 50.8 0) (effects (font (size 1.27 1.27)) (hide yes)))
+	)
+	(symbol
+		(lib_id "Device:R")
+		(at 101.6 50.8 0)
+		(unit 1)
+		(uuid "aaaaaaaa-0000-4d5e-8f90-000000000003")
+		(property "Reference" "R3" (at 103 50 0) (effects (font (size 1.27 1.27))))
+		(property "Value" "1k" (at 103 52 0) (effects (font (size 1.27 1.27))))
+	)
+'''
+
+
+@pytest.fixture
+def three_resistors(schematic_file):
+    """fixtures/basic.kicad_sch with R2 and R3 placed after R1"""
+    with open(schematic_file, encoding="utf-8") as f:
+        content = f.read()
+    content = content.replace("\t(wire ", EXTRA_SYMBOLS + "\t(wire ", 1)
+    with open(schematic_file, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    return schematic_file
+
+
+def references(path):
+    """Placed-symbol references, as kicad-skip parses them"""
+    return sorted(symbol.property.Reference.value for symbol in Schematic(path).symbol)
+
+
+def delete(interface, path, reference, **params):
+    return interface.handle_command("delete_symbol", {"file_path": path, "reference": reference, **params})
+
+
+class TestDeleteSymbol:
+    """Symbols are cut out by Reference, leaving the rest of the file intact"""
+
+    def test_reference_quoted_in_property_value(self, interface, three_resistors):
+        """A Reference form quoted inside another symbol's property doesn't match"""
+        result = delete(interface, three_resistors, "R3")
+        assert result["success"], result
+        assert references(three_resistors) == ["R1", "R2"]
+        with open(three_resistors, encoding="utf-8") as f:
+            content = f.read()
+        assert '(property \\"Reference\\" \\"R3\\")' in content
+        assert '"1k"' not in content
+
+    def test_parens_in_strings(self, interface, three_resistors):
+        """Unbalanced parens inside a string don't throw off the form boundaries"""
+        result = delete(interface, three_resistors, "R2")
+        assert result["success"], result
+        assert references(three_resistors) == ["R1", "R3"]
+        with open(three_resistors, encoding="utf-8") as f:
+            content = f.read()
+        assert "((( ) (" not in content
+        assert '(label "NET (a)"' in content
+        assert content.rstrip().endswith(")")
+
+    def test_consecutive_deletes_use_cached_spans(self, ki, interface, three_resistors):
+        """A second delete reuses the shifted span index and still cuts the right text"""
+        assert delete(interface, three_resistors, "R1")["success"]
+        key = ki.os.path.abspath(three_resistors)
+        assert sorted(ki._SYMBOL_SPANS[key][1]) == [b"R2", b"R3"]
+
+        assert delete(interface, three_resistors, "R3")["success"]
+        assert references(three_resistors) == ["R2"]
+        with open(three_resistors, "rb") as f:
+            content = f.read()
+        assert ki._SYMBOL_SPANS[key][1] == ki._symbol_span_index(content)
+
+    def test_consecutive_deletes_to_output_path(self, interface, three_resistors, tmp_path):
+        """Deleting into a copy, then from that copy, leaves the original alone"""
+        copy = str(tmp_path / "copy.kicad_sch")
+        assert delete(interface, three_resistors, "R2", output_path=copy)["success"]
+        assert delete(interface, copy, "R1")["success"]
+        assert references(copy) == ["R3"]
+        assert references(three_resistors) == ["R1", "R2", "R3"]
+
+    def test_missing_reference(self, interface, three_resistors):
+        """Deleting a reference that isn't placed reports failure"""
+        result = delete(interface, three_resistors, "R99")
+        assert not result["success"]
+        assert "R99" in result["message"]
+        assert references(three_resistors) == ["R1", "R2", "R3"]
+
+
+class TestDeleteSymbols:
+    """delete_symbols removes several references in one rewrite"""
+
+    def test_counts_only_found(self, interface, three_resistors):
+        """Missing references are skipped and not counted"""
+        result = interface.handle_command("delete_symbols", {
+            "file_path": three_resistors, "references": ["R1", "R3", "R99"]
+        })
+        assert result["success"], result
+        assert result["deleted_count"] == 2
+        assert references(three_resistors) == ["R2"]
+
+    def test_none_found(self, interface, three_resistors):
+        """A call that matches nothing reports failure with a zero count"""
+        result = interface.handle_command("delete_symbols", {
+            "file_path": three_resistors, "references": ["R98", "R99"]
+        })
+        assert not result["success"]
+        assert result["deleted_count"] == 0
+        assert references(three_resistors) == ["R1", "R2", "R3"]
@@ -0,0 +1,60 @@
+"""
+Tests for command dispatch and parameter checks in KiCADInterface
+"""
+
+
+class TestRequireParams:
+    """Handlers decorated with require_params reject missing arguments up front"""
+
+    def test_missing_and_empty(self, interface):
+        """Absent, null and empty-string values all count as missing"""
+        for params in ({}, {"file_path": None}, {"file_path": ""}):
+            result = interface.handle_command("get_all_symbols", params)
+            assert result == {"success": False, "message": "file_path is required"}
+
+    def test_first_missing_name_reported(self, interface, schematic_file):
+        """The message names the first missing parameter"""
+        result = interface.handle_command("get_symbol_properties", {"file_path": schematic_file})
+        assert result == {"success": False, "message": "reference is required"}
+
+
+class TestLoadSchematic:
+    """load_schematic accepts the path as file_path or filename"""
+
+    def test_filename(self, interface, schematic_file):
+        """The filename form sent by the TypeScript server is still accepted"""
+        result = interface.handle_command("load_schematic", {"filename": schematic_file})
+        assert result["success"], result
+        assert result["file_path"] == schematic_file
+
+    def test_file_path(self, interface, schematic_file):
+        """file_path works as well"""
+        assert interface.handle_command("load_schematic", {"file_path": schematic_file})["success"]
+
+    def test_neither(self, interface):
+        """With no path at all the usual message is returned"""
+        result = interface.handle_command("load_schematic", {})
+        assert result == {"success": False, "message": "file_path is required"}
+
+
+class TestCommandErrors:
+    """Exceptions raised by a handler become failed responses"""
+
+    @staticmethod
+    def fail(params):
+        raise RuntimeError("handler blew up")
+
+    def test_no_traceback_by_default(self, ki, interface, monkeypatch):
+        """Without KICAD_MCP_DEBUG only the message is returned"""
+        monkeypatch.setattr(ki, "_DEBUG", False)
+        monkeypatch.setitem(interface.command_routes, "get_all_symbols", self.fail)
+        result = interface.handle_command("get_all_symbols", {"file_path": "x.kicad_sch"})
+        assert not result["success"]
+        assert result["errorDetails"] == "handler blew up"
+
+    def test_traceback_when_debugging(self, ki, interface, monkeypatch):
+        """With KICAD_MCP_DEBUG=1 the traceback is appended"""
+        monkeypatch.setattr(ki, "_DEBUG", True)
+        monkeypatch.setitem(interface.command_routes, "get_all_symbols", self.fail)
+        result = interface.handle_command("get_all_symbols", {"file_path": "x.kicad_sch"})
+        assert result["errorDetails"].startswith("handler blew up\nTraceback")
@@ -0,0 +1,196 @@
+"""
+Tests for deferred schematic saves: begin_batch/commit_batch/end_batch and
+the automatic batches opened by KICAD_MCP_SAVE_DELAY_MS
+"""
+import time
+
+import pytest
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def add_wire(interface, path, x):
+    return interface.handle_command("add_wire", {
+        "file_path": path, "start_x": x, "start_y": 30, "end_x": x + 5, "end_y": 30
+    })
+
+
+class TestExplicitBatch:
+    """begin_batch -> edits -> commit_batch -> end_batch"""
+
+    def test_round_trip(self, ki, interface, schematic_file):
+        """Edits stay in memory until commit_batch/end_batch write them"""
+        original = read(schematic_file)
+        assert interface.handle_command("begin_batch", {"file_path": schematic_file})["success"]
+
+        assert add_wire(interface, schematic_file, 100)["success"]
+        assert interface.handle_command("add_label", {
+            "file_path": schematic_file, "text": "BATCHED", "x": 100, "y": 30
+        })["success"]
+        assert read(schematic_file) == original
+
+        assert interface.handle_command("commit_batch", {"file_path": schematic_file})["success"]
+        committed = read(schematic_file)
+        assert "BATCHED" in committed
+        assert committed.count("(xy 100 30)") == 1
+
+        # The batch is still open after a commit
+        assert add_wire(interface, schematic_file, 200)["success"]
+        assert read(schematic_file) == committed
+
+        assert interface.handle_command("end_batch", {"file_path": schematic_file})["success"]
+        final = read(schematic_file)
+        assert "BATCHED" in final
+        assert final.count("(xy 200 30)") == 1
+        assert not ki._OPEN_BATCHES
+
+    def test_commit_without_batch_fails(self, interface, schematic_file):
+        """commit_batch needs a batch opened by begin_batch"""
+        result = interface.handle_command("commit_batch", {"file_path": schematic_file})
+        assert not result["success"]
+
+    def test_other_commands_see_pending_edits_on_disk(self, ki, interface, schematic_file, tmp_path):
+        """A command outside the batch protocol gets pending edits written first"""
+        interface.handle_command("begin_batch", {"file_path": schematic_file})
+        add_wire(interface, schematic_file, 100)
+        assert "(xy 100 30)" not in read(schematic_file)
+
+        interface.handle_command("delete_all_wires", {
+            "file_path": schematic_file, "output_path": str(tmp_path / "copy.kicad_sch")
+        })
+        assert "(xy 100 30)" in read(schematic_file)
+
+
+class TestFailedFlush:
+    """A pending write that fails keeps the edits and stops the command"""
+
+    def test_failed_save_keeps_edits(self, ki, interface, schematic_file, tmp_path, monkeypatch):
+        """The command is refused and end_batch writes the edits once saving works again"""
+        interface.handle_command("begin_batch", {"file_path": schematic_file})
+        add_wire(interface, schematic_file, 100)
+
+        save = ki.ComponentManager.save_schematic_with_tree
+        monkeypatch.setattr(ki.ComponentManager, "save_schematic_with_tree", lambda schematic, path: False)
+        copy = tmp_path / "copy.kicad_sch"
+        result = interface.handle_command("delete_all_wires", {
+            "file_path": schematic_file, "output_path": str(copy)
+        })
+        assert not result["success"]
+        assert not copy.exists()
+        batch = ki._OPEN_BATCHES[ki.os.path.abspath(schematic_file)]
+        assert batch.dirty and batch.schematic is not None
+
+        monkeypatch.setattr(ki.ComponentManager, "save_schematic_with_tree", save)
+        assert interface.handle_command("end_batch", {"file_path": schematic_file})["success"]
+        assert "(xy 100 30)" in read(schematic_file)
+
+    def test_replace_error_is_reported(self, ki, interface, schematic_file, monkeypatch):
+        """An OSError from os.replace becomes a failed response, not an exception"""
+        interface.handle_command("begin_batch", {"file_path": schematic_file})
+        add_wire(interface, schematic_file, 100)
+
+        def locked(src, dst):
+            raise PermissionError(13, "Permission denied", dst)
+
+        monkeypatch.setattr(ki.os, "replace", locked)
+        result = interface.handle_command("delete_symbol", {"file_path": schematic_file, "reference": "R1"})
+        assert not result["success"]
+        assert not ki.os.path.exists(schematic_file + ".tmp")
+        monkeypatch.undo()
+
+        assert interface.handle_command("end_batch", {"file_path": schematic_file})["success"]
+        final = read(schematic_file)
+        assert "(xy 100 30)" in final and '"R1"' in final
+
+
+class TestStaleBatch:
+    """Symbols spliced into a batch's tree are only visible after a re-parse"""
+
+    def test_read_after_spliced_add(self, ki, interface, schematic_file):
+        """get_all_symbols and get_symbol_properties see a symbol added in the batch"""
+        interface.handle_command("begin_batch", {"file_path": schematic_file})
+        result = interface.handle_command("add_symbol", {
+            "file_path": schematic_file, "lib_id": "Device:R", "reference": "R2",
+            "value": "4k7", "x": 80, "y": 50
+        })
+        assert result["success"], result
+
+        symbols = interface.handle_command("get_all_symbols", {"file_path": schematic_file})
+        assert sorted(s["reference"] for s in symbols["symbols"]) == ["R1", "R2"]
+
+        properties = interface.handle_command("get_symbol_properties", {
+            "file_path": schematic_file, "reference": "R2"
+        })
+        assert properties["success"], properties
+        assert properties["properties"]["Value"] == "4k7"
+
+        # Further edits after the re-parse still land in the batch
+        add_wire(interface, schematic_file, 100)
+        assert interface.handle_command("end_batch", {"file_path": schematic_file})["success"]
+        final = read(schematic_file)
+        assert '"R2"' in final and '"4k7"' in final
+        assert "(xy 100 30)" in final
+
+
+class TestAutomaticBatch:
+    """Coalesced saves with a SAVE_DELAY"""
+
+    @pytest.fixture
+    def save_delay(self, ki, monkeypatch):
+        monkeypatch.setattr(ki, "SAVE_DELAY", 0.05)
+
+    def test_edits_coalesce_until_idle(self, ki, interface, schematic_file, save_delay):
+        """Consecutive edits are written once, after the delay"""
+        original = read(schematic_file)
+        assert add_wire(interface, schematic_file, 100)["success"]
+        assert add_wire(interface, schematic_file, 200)["success"]
+        assert read(schematic_file) == original
+        batch = ki._OPEN_BATCHES[ki.os.path.abspath(schematic_file)]
+        assert batch.auto and batch.dirty
+
+        deadline = time.monotonic() + 5
+        while ki._OPEN_BATCHES and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not ki._OPEN_BATCHES
+        final = read(schematic_file)
+        assert "(xy 100 30)" in final and "(xy 200 30)" in final
+
+    def test_flush_schematics(self, ki, interface, schematic_file, save_delay):
+        """flush_schematics writes pending edits without waiting for the timer"""
+        add_wire(interface, schematic_file, 100)
+        assert interface.handle_command("flush_schematics", {})["success"]
+        assert not ki._OPEN_BATCHES
+        assert "(xy 100 30)" in read(schematic_file)
+
+    def test_flush_param(self, ki, interface, schematic_file, save_delay):
+        """"flush": true writes the command's file before returning"""
+        result = interface.handle_command("add_wire", {
+            "file_path": schematic_file, "start_x": 100, "start_y": 30, "end_x": 105, "end_y": 30,
+            "flush": True
+        })
+        assert result["success"], result
+        assert not ki._OPEN_BATCHES
+        assert "(xy 100 30)" in read(schematic_file)
+
+    def test_failed_flush_param(self, ki, interface, schematic_file, save_delay, monkeypatch):
+        """A forced write that fails turns the result into a failure"""
+        monkeypatch.setattr(ki.ComponentManager, "save_schematic_with_tree", lambda schematic, path: False)
+        result = interface.handle_command("add_wire", {
+            "file_path": schematic_file, "start_x": 100, "start_y": 30, "end_x": 105, "end_y": 30,
+            "flush": True
+        })
+        assert not result["success"]
+        assert "flushError" in result
+        assert ki._OPEN_BATCHES[ki.os.path.abspath(schematic_file)].dirty
+
+    def test_begin_batch_takes_over(self, ki, interface, schematic_file, save_delay):
+        """begin_batch on a file with a pending write keeps the edits for end_batch"""
+        add_wire(interface, schematic_file, 100)
+        interface.handle_command("begin_batch", {"file_path": schematic_file})
+        time.sleep(0.2)
+        assert "(xy 100 30)" not in read(schematic_file)
+        assert interface.handle_command("end_batch", {"file_path": schematic_file})["success"]
+        assert "(xy 100 30)" in read(schematic_file)
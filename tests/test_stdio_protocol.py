@@ -0,0 +1,134 @@
+"""
+Tests for the stdin/stdout message loop in kicad_interface.main
+"""
+import io
+import json
+
+import pytest
+
+RESULTS = [
+    {"success": True, "message": "Placed R1 at 50.8, 50.8"},
+    {"success": True, "message": "Widerstand 4,7 kΩ ± 1 % — 日本"},
+    {"success": False, "message": "bad\x00input\x1f\ttab\nline \"quoted\" \\path"},
+    {"success": True, "value": "µF\x07 ", "nested": {"list": ["\x7f", "\U0001f600"]}},
+]
+
+
+@pytest.fixture
+def run_main(ki, monkeypatch):
+    """Feed bytes to main() on stdin; returns what it wrote to stdout"""
+    monkeypatch.setattr(ki, "TOOL_WORKERS", 0)
+    results = iter(RESULTS * 2)
+    monkeypatch.setattr(ki.KiCADInterface, "handle_command", lambda self, command, params: next(results))
+
+    def run(data):
+        stdin = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+        monkeypatch.setattr(ki.sys, "stdin", stdin)
+        monkeypatch.setattr(ki.sys, "stdout", stdout)
+        ki.main()
+        stdout.flush()
+        return stdout.buffer.getvalue()
+
+    return run
+
+
+def tools_call(request_id):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": "get_schematic_info", "arguments": {}}}
+
+
+def frame(message):
+    payload = json.dumps(message).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(payload) + payload
+
+
+def read_framed(output):
+    """Split Content-Length framed output into its decoded messages"""
+    messages = []
+    while output:
+        head, _, rest = output.partition(b"\r\n\r\n")
+        name, _, length = head.decode("ascii").partition(":")
+        assert name == "Content-Length"
+        length = int(length)
+        messages.append(json.loads(rest[:length]))
+        output = rest[length:]
+    return messages
+
+
+def check_envelopes(responses):
+    """Each tools/call response carries json.dumps(result) as its text"""
+    assert [r["id"] for r in responses] == list(range(len(RESULTS)))
+    for response, result in zip(responses, RESULTS):
+        assert response["jsonrpc"] == "2.0"
+        text = response["result"]["content"][0]["text"]
+        assert response["result"]["content"] == [{"type": "text", "text": text}]
+        assert json.loads(text) == result
+        if not json.dumps(result, ensure_ascii=False).isascii():
+            # Non-ASCII results fall back to the stdlib encoder, byte for byte
+            assert text == json.dumps(result)
+
+
+class TestLineDelimited:
+    """One JSON document per line in, one per line out"""
+
+    def test_tools_call_envelopes(self, run_main):
+        """Every response is one line of ASCII JSON matching its result"""
+        data = b"".join(json.dumps(tools_call(n)).encode("utf-8") + b"\n" for n in range(len(RESULTS)))
+        output = run_main(data)
+        assert output.isascii()
+        lines = output.split(b"\n")
+        assert lines.pop() == b""
+        check_envelopes([json.loads(line) for line in lines])
+
+    def test_invalid_json(self, run_main):
+        """A malformed line gets an error response and the loop carries on"""
+        data = b"{not json\n" + json.dumps(tools_call(7)).encode("utf-8") + b"\n"
+        first, second, end = run_main(data).split(b"\n")
+        assert json.loads(first)["message"] == "Invalid JSON input"
+        assert json.loads(second)["id"] == 7
+        assert end == b""
+
+
+class TestFramed:
+    """Content-Length framed requests get framed responses"""
+
+    def test_tools_call_envelopes(self, run_main):
+        """Framed output parses and each envelope matches its result"""
+        data = b"".join(frame(tools_call(n)) for n in range(len(RESULTS)))
+        output = run_main(data)
+        assert output.isascii()
+        check_envelopes(read_framed(output))
+
+    def test_extra_headers(self, run_main):
+        """Headers after Content-Length are skipped"""
+        payload = json.dumps(tools_call(0)).encode("utf-8")
+        data = (b"Content-Length: %d\r\nContent-Type: application/json\r\n\r\n" % len(payload)) + payload
+        responses = read_framed(run_main(data))
+        assert len(responses) == 1
+        assert json.loads(responses[0]["result"]["content"][0]["text"]) == RESULTS[0]
+
+    def test_mixed_framing(self, run_main):
+        """Each response uses the framing of the request it answers"""
+        data = frame(tools_call(0)) + json.dumps(tools_call(1)).encode("utf-8") + b"\n" + frame(tools_call(2))
+        output = run_main(data)
+        framed_first, _, rest = output.partition(b"\r\n\r\n")
+        length = int(framed_first.split(b":")[1])
+        assert json.loads(rest[:length])["id"] == 0
+        line, _, rest = rest[length:].partition(b"\n")
+        assert json.loads(line)["id"] == 1
+        assert [r["id"] for r in read_framed(rest)] == [2]
+
+
+class TestScratchBuffer:
+    """Responses are assembled in a per-thread buffer of bounded size"""
+
+    def test_growth_is_capped(self, ki, monkeypatch):
+        """Doubling past _SCRATCH_MAX is clamped to it"""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+        monkeypatch.setattr(ki.sys, "stdout", stdout)
+        monkeypatch.setattr(ki._scratch, "buf", bytearray(ki._SCRATCH_MAX * 3 // 4), raising=False)
+        message = {"text": "x" * (ki._SCRATCH_MAX - 64)}
+        ki._send_response(message)
+        assert len(ki._scratch.buf) == ki._SCRATCH_MAX
+        assert json.loads(stdout.buffer.getvalue()) == message